@@ -1,7 +1,12 @@
-from typing import List, Dict, Tuple
+from typing import Callable, Hashable, Iterable, List, Dict, Optional, Sequence, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
-import copy
+from functools import lru_cache
+import gc
+import operator
+import random
+import time
 
 
 class AllocationStatus(Enum):
@@ -39,6 +44,242 @@ class Process:
         return released
 
 
+class RequestCache:
+    """Bounded LRU/TTL cache of request outcomes keyed by client request id"""
+    
+    def __init__(self, max_size: int = 10000, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            max_size: Outcomes kept before the least recently used is dropped
+            ttl: Seconds an outcome is remembered
+            clock: Time source (seconds)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.entries: "OrderedDict[Hashable, Tuple[float, AllocationStatus, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def get(self, request_id: Hashable) -> Optional[Tuple[AllocationStatus, str]]:
+        """Return the remembered (status, message) for an id, or None"""
+        entry = self.entries.get(request_id)
+        if entry is not None and entry[0] > self.clock():
+            self.entries.move_to_end(request_id)
+            self.hits += 1
+            return entry[1], entry[2]
+        if entry is not None:
+            del self.entries[request_id]
+        self.misses += 1
+        return None
+    
+    def put(self, request_id: Hashable, status: AllocationStatus, message: str):
+        self.entries[request_id] = (self.clock() + self.ttl, status, message)
+        self.entries.move_to_end(request_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions
+        }
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(x: int) -> int:
+    """splitmix64 finalizer"""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+@lru_cache(maxsize=1 << 16)
+def _second_key(cell: Tuple, value: int) -> int:
+    """Key for StateCache.h2, drawn from a stream seeded by the cell's repr rather than hash()"""
+    return random.Random(repr((cell, value))).getrandbits(64)
+
+
+class StateCache:
+    """
+    Bounded LRU of safety verdicts keyed by a Zobrist hash of the state
+    
+    The state is the available vector plus each process's presence, max
+    claim and allocation. Every (cell, value) pair has a pseudo-random 64-bit
+    key and the hash is the XOR of the keys of all non-zero cells, so
+    changing one cell costs two XORs. Two hashes are kept: h1 keys come from
+    hash() and h2 keys from a random.Random stream seeded by the cell, so
+    cells that collide under hash() still differ in h2 and a false hit
+    needs both to collide.
+    """
+    
+    def __init__(self, max_size: int = 65536):
+        self.max_size = max_size
+        self.h1 = 0
+        self.h2 = 0
+        self.verdicts: "OrderedDict[Tuple[int, int], Tuple[bool, Tuple[int, ...]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self.verdicts)
+    
+    @property
+    def key(self) -> Tuple[int, int]:
+        return self.h1, self.h2
+    
+    def update(self, cell: Tuple, old: int, new: int):
+        """Account for one cell changing from `old` to `new`"""
+        for value in (old, new):
+            if value:
+                self.h1 ^= _mix64(hash((cell, value)) & _MASK64)
+                self.h2 ^= _second_key(cell, value)
+    
+    def move(self, pid: int, resource: str, allocated: int, available: int, amount: int):
+        """Account for `amount` of a resource moving from available to a process"""
+        self.update(('allocated', pid, resource), allocated, allocated + amount)
+        self.update(('available', resource), available, available - amount)
+    
+    def add_process(self, process: 'Process'):
+        self.update(('process', process.pid), 0, 1)
+        for resource, amount in process.max_claim.items():
+            self.update(('max_claim', process.pid, resource), 0, amount)
+        for resource, amount in process.allocated.items():
+            self.update(('allocated', process.pid, resource), 0, amount)
+    
+    def remove_process(self, process: 'Process'):
+        # XOR is its own inverse
+        self.add_process(process)
+    
+    def lookup(self) -> Optional[Tuple[bool, Tuple[int, ...]]]:
+        """Return the cached (is_safe, safe_sequence) for the current state, or None"""
+        verdict = self.verdicts.get(self.key)
+        if verdict is None:
+            self.misses += 1
+            return None
+        self.verdicts.move_to_end(self.key)
+        self.hits += 1
+        return verdict
+    
+    def store(self, safe: bool, sequence: List[int]):
+        self.verdicts[self.key] = (safe, tuple(sequence))
+        while len(self.verdicts) > self.max_size:
+            self.verdicts.popitem(last=False)
+            self.evictions += 1
+    
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.verdicts),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions
+        }
+
+
+ALLOCATED_PREFIX = 'allocated.'
+
+
+def read_process_file(path: str, resources: Optional[List[str]] = None):
+    """
+    Read a process table for BankersAlgorithm.add_processes
+    
+    CSV files have a header naming a `pid` column, one max-claim column per
+    resource and optionally `allocated.<resource>` columns; rows are streamed
+    straight into columns. .npy files hold an integer matrix whose columns
+    are pid, the max claims in `resources` order and optionally the
+    allocations in the same order; they are memory-mapped (needs numpy).
+    
+    Returns:
+        Tuple of (pids, resources, max_claim_matrix, allocated_matrix or None)
+    """
+    if path.endswith('.npy'):
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Reading .npy process files requires numpy") from None
+        if resources is None:
+            raise ValueError("A .npy process file needs the resource order")
+        matrix = numpy.load(path, mmap_mode='r')
+        m = len(resources)
+        if matrix.ndim != 2 or matrix.shape[1] not in (1 + m, 1 + 2 * m):
+            raise ValueError(f"Expected 1 + {m} or 1 + {2 * m} columns, got shape {matrix.shape}")
+        allocated = matrix[:, 1 + m:] if matrix.shape[1] == 1 + 2 * m else None
+        return matrix[:, 0], list(resources), matrix[:, 1:1 + m], allocated
+    
+    import csv
+    
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader)]
+        if 'pid' not in header:
+            raise ValueError("Process file needs a 'pid' column")
+        claim_names = [name for name in header if name != 'pid' and not name.startswith(ALLOCATED_PREFIX)]
+        if resources is None:
+            resources = claim_names
+        elif set(resources) != set(claim_names):
+            raise ValueError("Process file columns do not match the resources")
+        pid_column = header.index('pid')
+        claim_columns = [header.index(r) for r in resources]
+        alloc_columns = [header.index(ALLOCATED_PREFIX + r) for r in resources
+                         if ALLOCATED_PREFIX + r in header]
+        if alloc_columns and len(alloc_columns) != len(resources):
+            raise ValueError("Process file must have an allocated column for every resource or none")
+        
+        pids: List[int] = []
+        claims: List[Tuple[int, ...]] = []
+        allocated: List[Tuple[int, ...]] = []
+        for row in reader:
+            if not row:
+                continue
+            values = list(map(int, row))
+            pids.append(values[pid_column])
+            claims.append(tuple(values[i] for i in claim_columns))
+            if alloc_columns:
+                allocated.append(tuple(values[i] for i in alloc_columns))
+    return pids, list(resources), claims, allocated if alloc_columns else None
+
+
+def _as_rows(values) -> list:
+    # NumPy arrays (and array.array) convert to plain Python values in C
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
+
+def _as_columns(values, m: int) -> Tuple[int, List[Sequence[int]]]:
+    """Row count and the m columns of a matrix given as rows or a 2-D NumPy array"""
+    if getattr(values, 'ndim', None) == 2:
+        if values.shape[1] != m:
+            raise ValueError(f"Every row must have {m} columns")
+        # NumPy transposes and converts in C
+        return values.shape[0], values.T.tolist()
+    rows = _as_rows(values)
+    if rows and set(map(len, rows)) != {m}:
+        raise ValueError(f"Every row must have {m} columns")
+    # One itemgetter pass per column; zip(*rows) would make an iterator per row
+    return len(rows), [list(map(operator.itemgetter(r), rows)) for r in range(m)]
+
+
+def _dicts(keys: List[str], columns: List[Sequence[int]], n: int) -> List[Dict[str, int]]:
+    """One dict per row of the columns (zip reuses its row tuple, so no rows are kept)"""
+    if not columns:
+        return [{} for _ in range(n)]
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
 class BankersAlgorithm:
     """Implementation of Banker's Algorithm for deadlock avoidance"""
     
@@ -54,6 +295,53 @@ class BankersAlgorithm:
         self.processes: Dict[int, Process] = {}
         self.history: List[Dict] = []
         self.safe_sequence: List[int] = []
+        self.version = 0
+        self._listeners: List[Callable[[Dict], None]] = []
+        self.pending: List[Tuple[int, Dict[str, int]]] = []
+        self.pending_capacity: List[Tuple[str, int]] = []
+        # Retries `pending` in its own order when set (see scheduler.GrantScheduler)
+        self.scheduler = None
+        self.request_cache = RequestCache()
+        self.state_cache: Optional[StateCache] = None
+    
+    def subscribe(self, listener: Callable[[Dict], None]):
+        """Register a callback invoked with each committed history entry"""
+        self._listeners.append(listener)
+    
+    def unsubscribe(self, listener: Callable[[Dict], None]):
+        """Remove a previously registered callback"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def enable_state_cache(self, max_size: int = 65536) -> StateCache:
+        """
+        Cache safety verdicts by state hash so is_safe() answers repeated
+        states immediately (useful for simulations and what-if sweeps)
+        
+        The hash is kept up to date by the banker's own methods; code that
+        edits `available` or process rows directly must call rehash().
+        """
+        self.state_cache = StateCache(max_size)
+        self.rehash()
+        return self.state_cache
+    
+    def rehash(self):
+        """Recompute the state hash from scratch"""
+        cache = self.state_cache
+        if cache is None:
+            return
+        cache.h1 = cache.h2 = 0
+        for resource, amount in self.available.items():
+            cache.update(('available', resource), 0, amount)
+        for process in self.processes.values():
+            cache.add_process(process)
+    
+    def _record(self, entry: Dict):
+        """Append a committed mutation to the history and notify listeners"""
+        self.history.append(entry)
+        self.version += 1
+        for listener in self._listeners:
+            listener(entry)
     
     def add_process(self, pid: int, max_claim: Dict[str, int]):
         """Add a new process to the system"""
@@ -67,6 +355,123 @@ class BankersAlgorithm:
             needed=max_claim.copy()
         )
         self.processes[pid] = process
+        if self.state_cache is not None:
+            self.state_cache.add_process(process)
+        
+        self._record({
+            'action': 'add',
+            'pid': pid,
+            'max_claim': max_claim.copy()
+        })
+    
+    def add_processes(self, pids: Sequence[int], max_claim_matrix: Iterable[Sequence[int]],
+                      allocated_matrix: Optional[Iterable[Sequence[int]]] = None,
+                      resources: Optional[List[str]] = None) -> int:
+        """
+        Add many processes in one step
+        
+        Row i of each matrix belongs to pids[i] and its columns follow
+        `resources` (the system's resource order by default); NumPy arrays
+        are accepted as well as lists of rows. The matrices are transposed
+        once, everything is validated column by column before any state
+        changes, and the Process dicts are then built from the columns. The
+        whole load is recorded as one 'add_many' history entry (matrices
+        stored by column). Loaded allocations are not safety-checked; call
+        is_safe() if they do not come from a safe state.
+        
+        Args:
+            pids: Process IDs
+            max_claim_matrix: Max claims, one row per process
+            allocated_matrix: Current allocations, one row per process
+            resources: Column order of the matrices
+        
+        Returns:
+            Number of processes added
+        """
+        resources = list(self.total_resources) if resources is None else list(resources)
+        unknown = set(resources) - set(self.total_resources)
+        if unknown:
+            raise ValueError(f"Unknown resources: {', '.join(sorted(unknown))}")
+        m = len(resources)
+        pids = _as_rows(pids)
+        n = len(pids)
+        claim_count, claim_columns = _as_columns(max_claim_matrix, m)
+        alloc_columns = None
+        if allocated_matrix is not None:
+            alloc_count, alloc_columns = _as_columns(allocated_matrix, m)
+        if claim_count != n or (alloc_columns is not None and alloc_count != n):
+            raise ValueError("Matrices must have one row per process")
+        unique = set(pids)
+        if len(unique) != n:
+            raise ValueError("Duplicate process IDs")
+        if not self.processes.keys().isdisjoint(unique):
+            raise ValueError(f"Process {min(unique & self.processes.keys())} already exists")
+        if not n:
+            return 0
+        
+        # One pass over each column; the need columns double as the
+        # allocation <= claim check
+        for resource, column in zip(resources, claim_columns):
+            if min(column) < 0:
+                raise ValueError(f"Negative max claim for {resource}")
+            if max(column) > self.total_resources[resource]:
+                raise ValueError(f"Max claim for {resource} exceeds total resources")
+        used = [0] * m
+        need_columns = claim_columns
+        if alloc_columns is not None:
+            need_columns = []
+            for r, (resource, claim, held) in enumerate(zip(resources, claim_columns, alloc_columns)):
+                if min(held) < 0:
+                    raise ValueError(f"Negative allocation of {resource}")
+                need = list(map(operator.sub, claim, held))
+                if min(need) < 0:
+                    raise ValueError(f"Allocation of {resource} exceeds max claim")
+                need_columns.append(need)
+                used[r] = sum(held)
+                if used[r] > self.available[resource]:
+                    raise ValueError(f"Allocations of {resource} exceed available")
+        
+        # Only dicts of ints are built here, so there are no cycles for the
+        # collector to find while millions of containers are allocated
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            max_claims = _dicts(resources, claim_columns, n)
+            if alloc_columns is None:
+                zero = dict.fromkeys(resources, 0)
+                held = [zero.copy() for _ in range(n)]
+                needed = [claim.copy() for claim in max_claims]
+            else:
+                held = _dicts(resources, alloc_columns, n)
+                needed = _dicts(resources, need_columns, n)
+            added = list(map(Process, pids, max_claims, held, needed))
+        finally:
+            if collecting:
+                gc.enable()
+        
+        self.processes.update(zip(pids, added))
+        if self.state_cache is not None:
+            for process in added:
+                self.state_cache.add_process(process)
+        for resource, amount in zip(resources, used):
+            if amount:
+                self._set_available(resource, self.available[resource] - amount)
+        
+        self._record({
+            'action': 'add_many',
+            'pids': pids,
+            'resources': resources,
+            'max_claim': claim_columns,
+            'allocated': alloc_columns
+        })
+        return n
+    
+    def add_processes_from_file(self, path: str, resources: Optional[List[str]] = None) -> int:
+        """Bulk-add the processes in a CSV or .npy file (see read_process_file)"""
+        if resources is None and path.endswith('.npy'):
+            resources = list(self.total_resources)
+        pids, resources, claims, allocated = read_process_file(path, resources)
+        return self.add_processes(pids, claims, allocated, resources)
     
     def remove_process(self, pid: int):
         """Remove a process and release its resources"""
@@ -74,60 +479,244 @@ class BankersAlgorithm:
             raise ValueError(f"Process {pid} not found")
         
         process = self.processes[pid]
-        released = process.release_resources()
-        
-        for resource, amount in released.items():
-            self.available[resource] = self.available.get(resource, 0) + amount
+        released = dict(process.allocated)
+        self._deallocate(process, released)
+        if self.state_cache is not None:
+            self.state_cache.remove_process(process)
         
         del self.processes[pid]
+        self.pending = [item for item in self.pending if item[0] != pid]
+        
+        self._record({
+            'action': 'remove',
+            'pid': pid,
+            'released': released
+        })
+        self._wake_pending()
     
-    def request_resources(self, pid: int, request: Dict[str, int]) -> Tuple[AllocationStatus, str]:
+    def request_resources(self, pid: int, request: Dict[str, int],
+                          request_id: Optional[Hashable] = None) -> Tuple[AllocationStatus, str]:
         """
         Handle a resource request using Banker's Algorithm
         
         Args:
             pid: Process ID
             request: Dictionary of requested resources
+            request_id: Optional client-supplied id; a retry with the same id
+                returns the first outcome instead of being decided again
+        
+        Returns:
+            Tuple of (status, message)
+        """
+        if request_id is not None:
+            cached = self.request_cache.get(request_id)
+            if cached is not None:
+                return cached
+        
+        status, message = self._try_request(pid, request)
+        if request_id is not None:
+            self.request_cache.put(request_id, status, message)
+        
+        if status == AllocationStatus.GRANTED:
+            self._record({
+                'action': 'allocate',
+                'pid': pid,
+                'request': request.copy(),
+                'status': 'granted'
+            })
+        
+        return status, message
+    
+    def request_resources_batch(self, requests: List[Tuple[int, Dict[str, int]]]) -> List[Tuple[AllocationStatus, str]]:
+        """
+        Decide several requests in order with as few safety checks as possible
+        
+        The results are the same as calling request_resources on each request
+        in turn. Every request that passes validation is applied and the
+        combined state is checked once. Granting less never makes a safe state
+        unsafe, so if the combined state is unsafe the first offending request
+        is found by bisection, denied, and the rest are decided again.
+        
+        Args:
+            requests: List of (pid, request) pairs
+        
+        Returns:
+            List of (status, message), one per request
+        """
+        results: List[Tuple[AllocationStatus, str]] = []
+        queue = list(requests)
+        
+        while queue:
+            decided: Dict[int, Tuple[AllocationStatus, str]] = {}
+            applied: List[int] = []
+            
+            for i, (pid, request) in enumerate(queue):
+                error = self._validate_request(pid, request)
+                if error:
+                    decided[i] = (AllocationStatus.DENIED, error)
+                else:
+                    self._allocate(self.processes[pid], request)
+                    applied.append(i)
+            
+            # Nothing applied means every request was already denied
+            if not applied or self.is_safe():
+                stop = len(queue)
+            else:
+                # Smallest unsafe prefix of the applied requests
+                count = len(applied)
+                lo, hi = 1, len(applied)
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    count = self._move_prefix(queue, applied, count, mid)
+                    if self.is_safe():
+                        lo = mid + 1
+                    else:
+                        hi = mid
+                self._move_prefix(queue, applied, count, lo - 1)
+                stop = applied[lo - 1]
+                decided[stop] = (AllocationStatus.DENIED, "Request denied - would lead to unsafe state")
+                applied = applied[:lo - 1]
+            
+            granted = set(applied)
+            for i in range(min(stop + 1, len(queue))):
+                if i in granted:
+                    results.append((AllocationStatus.GRANTED, "Request granted - system remains safe"))
+                else:
+                    results.append(decided[i])
+            self._record_grants([queue[i] for i in applied])
+            
+            queue = queue[stop + 1:]
+        
+        return results
+    
+    def request_group(self, requests: Dict[int, Dict[str, int]]) -> Tuple[AllocationStatus, str]:
+        """
+        Grant requests for several processes together or not at all
+        
+        All requests are applied tentatively and the combined state is checked
+        once; if any request is invalid or the result is unsafe, nothing is
+        allocated.
+        
+        Args:
+            requests: Dictionary of pid -> requested resources
         
         Returns:
             Tuple of (status, message)
         """
+        applied: List[int] = []
+        
+        def rollback():
+            for pid in reversed(applied):
+                self._deallocate(self.processes[pid], requests[pid])
+        
+        for pid, request in requests.items():
+            # Validating against the running available vector also catches
+            # requests that only fit one at a time
+            error = self._validate_request(pid, request)
+            if error:
+                rollback()
+                return AllocationStatus.DENIED, f"Group denied - process {pid}: {error}"
+            self._allocate(self.processes[pid], request)
+            applied.append(pid)
+        
+        if not self.is_safe():
+            rollback()
+            return AllocationStatus.DENIED, "Group denied - would lead to unsafe state"
+        
+        self._record_grants([(pid, requests[pid]) for pid in applied])
+        return AllocationStatus.GRANTED, "Group granted - system remains safe"
+    
+    def _record_grants(self, grants: List[Tuple[int, Dict[str, int]]]):
+        """
+        Record grants that are already applied, one 'allocate' entry each
+        
+        Listeners read the live state when an entry arrives, so the grants
+        are undone and re-applied one at a time, each right before its entry.
+        """
+        for pid, request in reversed(grants):
+            self._deallocate(self.processes[pid], request)
+        for pid, request in grants:
+            self._allocate(self.processes[pid], request)
+            self._record({
+                'action': 'allocate',
+                'pid': pid,
+                'request': request.copy(),
+                'status': 'granted'
+            })
+    
+    def _move_prefix(self, queue: List, applied: List[int], current: int, target: int) -> int:
+        """Apply or undo applied requests so exactly `target` of them are in effect"""
+        while current < target:
+            pid, request = queue[applied[current]]
+            self._allocate(self.processes[pid], request)
+            current += 1
+        while current > target:
+            current -= 1
+            pid, request = queue[applied[current]]
+            self._deallocate(self.processes[pid], request)
+        return current
+    
+    def _validate_request(self, pid: int, request: Dict[str, int]) -> str:
+        """Return the reason a request must be denied before the safety check, or ''"""
         if pid not in self.processes:
-            return AllocationStatus.DENIED, f"Process {pid} not found"
+            return f"Process {pid} not found"
         
         process = self.processes[pid]
         
+        # A negative amount would hand resources back that were never held
+        for resource, amount in request.items():
+            if amount < 0:
+                return f"Negative request for {resource}"
+        
         # Check if request exceeds need
         for resource, amount in request.items():
             if amount > process.needed.get(resource, 0):
-                return AllocationStatus.DENIED, f"Request exceeds need for {resource}"
+                return f"Request exceeds need for {resource}"
         
         # Check if request exceeds available
         for resource, amount in request.items():
             if amount > self.available.get(resource, 0):
-                return AllocationStatus.DENIED, f"Insufficient {resource} available"
-        
-        # Tentatively allocate
-        old_state = self._save_state()
+                return f"Insufficient {resource} available"
         
+        return ''
+    
+    def _allocate(self, process: Process, request: Dict[str, int]):
+        """Move resources from available to a process"""
+        cache = self.state_cache
         for resource, amount in request.items():
-            process.allocated[resource] = process.allocated.get(resource, 0) + amount
-            self.available[resource] = self.available.get(resource, 0) - amount
-        
+            allocated = process.allocated.get(resource, 0)
+            available = self.available.get(resource, 0)
+            process.allocated[resource] = allocated + amount
+            self.available[resource] = available - amount
+            if cache is not None:
+                cache.move(process.pid, resource, allocated, available, amount)
         process.calculate_needed()
+    
+    def _deallocate(self, process: Process, amounts: Dict[str, int]):
+        """Move resources from a process back to available"""
+        self._allocate(process, {resource: -amount for resource, amount in amounts.items()})
+    
+    def _set_available(self, resource: str, amount: int):
+        if self.state_cache is not None:
+            self.state_cache.update(('available', resource), self.available.get(resource, 0), amount)
+        self.available[resource] = amount
+    
+    def _try_request(self, pid: int, request: Dict[str, int]) -> Tuple[AllocationStatus, str]:
+        """Validate and apply a request, rolling back if unsafe (not recorded)"""
+        error = self._validate_request(pid, request)
+        if error:
+            return AllocationStatus.DENIED, error
+        
+        # Tentatively allocate
+        process = self.processes[pid]
+        self._allocate(process, request)
         
         # Check if system remains in safe state
         if self.is_safe():
-            self.history.append({
-                'action': 'allocate',
-                'pid': pid,
-                'request': request,
-                'status': 'granted'
-            })
             return AllocationStatus.GRANTED, "Request granted - system remains safe"
         else:
-            # Restore previous state
-            self._restore_state(old_state)
+            # Undo the tentative allocation
+            self._deallocate(process, request)
             return AllocationStatus.DENIED, "Request denied - would lead to unsafe state"
     
     def is_safe(self) -> bool:
@@ -137,6 +726,29 @@ class BankersAlgorithm:
         Returns:
             True if safe, False otherwise
         """
+        cache = self.state_cache
+        if cache is None:
+            return self._check_safe()
+        verdict = cache.lookup()
+        if verdict is not None:
+            self.safe_sequence = list(verdict[1])
+            return verdict[0]
+        safe = self._check_safe()
+        cache.store(safe, self.safe_sequence)
+        return safe
+    
+    def _check_safe(self) -> bool:
+        """Run the safety algorithm, setting safe_sequence"""
+        safe_sequence, _ = self._safety_pass()
+        if len(safe_sequence) < len(self.processes):
+            self.safe_sequence = []
+            return False
+        
+        self.safe_sequence = safe_sequence
+        return True
+    
+    def _safety_pass(self) -> Tuple[List[int], Dict[str, int]]:
+        """Finish processes while any can; returns (finish order, work when the search stopped)"""
         available = self.available.copy()
         work = available.copy()
         finish = {pid: False for pid in self.processes}
@@ -163,11 +775,39 @@ class BankersAlgorithm:
                     break
             
             if not found:
-                self.safe_sequence = []
-                return False
+                break
         
-        self.safe_sequence = safe_sequence
-        return True
+        return safe_sequence, work
+    
+    def diagnose(self) -> Dict:
+        """
+        Explain the safety verdict
+        
+        Read off the state the safety search stopped in, so an unsafe verdict
+        costs no second search.
+        
+        Returns:
+            Dictionary with 'safe', 'finished' (processes that can still
+            complete, in order), 'blocked' (pid -> per-resource shortfall when
+            the search stopped) and 'work'
+        """
+        finished, work = self._safety_pass()
+        done = set(finished)
+        blocked = {
+            pid: {
+                resource: need - work.get(resource, 0)
+                for resource, need in process.needed.items()
+                if need > work.get(resource, 0)
+            }
+            for pid, process in self.processes.items()
+            if pid not in done
+        }
+        return {
+            'safe': not blocked,
+            'finished': finished,
+            'blocked': blocked,
+            'work': work
+        }
     
     def get_safe_sequence(self) -> List[int]:
         """Get the safe sequence if system is safe"""
@@ -192,7 +832,7 @@ class BankersAlgorithm:
         old_state = self._save_state()
         
         try:
-            status, message = self.request_resources(pid, request)
+            status, message = self._try_request(pid, request)
             feasible = status == AllocationStatus.GRANTED
             
             if feasible:
@@ -217,19 +857,275 @@ class BankersAlgorithm:
             return False
         
         process = self.processes[pid]
-        released = process.release_resources()
-        
-        for resource, amount in released.items():
-            self.available[resource] = self.available.get(resource, 0) + amount
+        released = dict(process.allocated)
+        self._deallocate(process, released)
         
-        self.history.append({
+        self._record({
             'action': 'release',
             'pid': pid,
             'released': released
         })
+        self._wake_pending()
         
         return True
     
+    def release(self, pid: int, amounts: Dict[str, int]) -> List[Tuple[int, Dict[str, int]]]:
+        """
+        Release part of what a process holds
+        
+        Updates available, the allocation and the need in O(m), then retries
+        pending requests that might now fit.
+        
+        Args:
+            pid: Process ID
+            amounts: Resources to give back
+        
+        Returns:
+            Pending (pid, request) pairs granted as a result
+        """
+        if pid not in self.processes:
+            raise ValueError(f"Process {pid} not found")
+        
+        process = self.processes[pid]
+        for resource, amount in amounts.items():
+            if amount < 0 or amount > process.allocated.get(resource, 0):
+                raise ValueError(f"Process {pid} cannot release {amount} {resource}")
+        
+        self._deallocate(process, amounts)
+        self._record({
+            'action': 'release',
+            'pid': pid,
+            'released': dict(amounts)
+        })
+        return self._wake_pending()
+    
+    def release_many(self, releases: Dict[int, Dict[str, int]]) -> List[Tuple[int, Dict[str, int]]]:
+        """
+        Release parts of several allocations at once
+        
+        Like release() for each process, but pending requests are retried
+        only once, after everything has been returned.
+        
+        Args:
+            releases: Resources to give back keyed by process ID
+        
+        Returns:
+            Pending (pid, request) pairs granted as a result
+        """
+        for pid, amounts in releases.items():
+            if pid not in self.processes:
+                raise ValueError(f"Process {pid} not found")
+            process = self.processes[pid]
+            for resource, amount in amounts.items():
+                if amount < 0 or amount > process.allocated.get(resource, 0):
+                    raise ValueError(f"Process {pid} cannot release {amount} {resource}")
+        
+        for pid, amounts in releases.items():
+            self._deallocate(self.processes[pid], amounts)
+            self._record({
+                'action': 'release',
+                'pid': pid,
+                'released': dict(amounts)
+            })
+        return self._wake_pending()
+    
+    def submit_request(self, pid: int, request: Dict[str, int]) -> Tuple[AllocationStatus, str]:
+        """
+        Request resources, queueing the request if it has to wait
+        
+        Requests denied only because resources are short or the state would be
+        unsafe are kept in `pending` and granted by a later release.
+        """
+        status, message = self.request_resources(pid, request)
+        if status == AllocationStatus.GRANTED:
+            return status, message
+        if self.can_wait(message):
+            self.pending.append((pid, request.copy()))
+            return status, f"{message} - queued"
+        return status, message
+    
+    def _wake_pending(self) -> List[Tuple[int, Dict[str, int]]]:
+        """Retry pending requests in FIFO (or the scheduler's) order; returns the ones granted"""
+        if self.pending_capacity:
+            self._drain_capacity()
+        if not self.pending:
+            return []
+        if self.scheduler is not None:
+            return [(item.pid, item.request) for item in self.scheduler.dispatch()]
+        
+        # Only requests that fit what is available now can be granted
+        available = self.available
+        candidates = [
+            item for item in self.pending
+            if all(amount <= available.get(r, 0) for r, amount in item[1].items())
+        ]
+        if not candidates:
+            return []
+        
+        results = self.request_resources_batch(candidates)
+        granted = []
+        done = set()
+        for item, (status, message) in zip(candidates, results):
+            if status == AllocationStatus.GRANTED:
+                granted.append(item)
+                done.add(id(item))
+            elif not self.can_wait(message):
+                # No longer valid (e.g. exceeds the remaining need)
+                done.add(id(item))
+        if done:
+            self.pending = [item for item in self.pending if id(item) not in done]
+        return granted
+    
+    @staticmethod
+    def can_wait(message: str) -> bool:
+        """Whether a denial could turn into a grant after resources are released"""
+        return message.startswith("Insufficient") or message.endswith("unsafe state")
+    
+    def add_capacity(self, resource: str, amount: int) -> List[Tuple[int, Dict[str, int]]]:
+        """
+        Add instances of an existing resource type
+        
+        More available capacity never makes a safe state unsafe, so no safety
+        check is needed.
+        
+        Returns:
+            Pending (pid, request) pairs granted as a result
+        """
+        if resource not in self.total_resources:
+            raise ValueError(f"Resource {resource} not found")
+        if amount < 0:
+            raise ValueError(f"Cannot add {amount} {resource}")
+        
+        self.total_resources[resource] += amount
+        self._set_available(resource, self.available.get(resource, 0) + amount)
+        self._record({
+            'action': 'capacity',
+            'resource': resource,
+            'delta': amount
+        })
+        return self._wake_pending()
+    
+    def remove_capacity(self, resource: str, amount: int, queue: bool = False) -> Tuple[AllocationStatus, str]:
+        """
+        Take instances of a resource type out of the system
+        
+        Only free instances can be removed, and the state must stay safe with
+        less available, which takes a single safety check.
+        
+        Args:
+            resource: Resource type
+            amount: Instances to remove
+            queue: Keep a refused removal in `pending_capacity` and retry it
+                after later releases
+        
+        Returns:
+            Tuple of (status, message)
+        """
+        if resource not in self.total_resources:
+            raise ValueError(f"Resource {resource} not found")
+        if amount < 0:
+            raise ValueError(f"Cannot remove {amount} {resource}")
+        
+        status, message = self._try_remove_capacity(resource, amount)
+        if status != AllocationStatus.GRANTED and queue and self.can_wait(message):
+            self.pending_capacity.append((resource, amount))
+            return status, f"{message} - queued"
+        return status, message
+    
+    def _try_remove_capacity(self, resource: str, amount: int) -> Tuple[AllocationStatus, str]:
+        """Remove capacity if the state stays safe, recording the change"""
+        if amount > self.available.get(resource, 0):
+            return AllocationStatus.DENIED, f"Insufficient {resource} available"
+        
+        self._set_available(resource, self.available[resource] - amount)
+        if not self.is_safe():
+            self._set_available(resource, self.available[resource] + amount)
+            return AllocationStatus.DENIED, "Capacity removal denied - would lead to unsafe state"
+        
+        self.total_resources[resource] -= amount
+        self._record({
+            'action': 'capacity',
+            'resource': resource,
+            'delta': -amount
+        })
+        return AllocationStatus.GRANTED, "Capacity removed - system remains safe"
+    
+    def _drain_capacity(self):
+        """Retry queued capacity removals in FIFO order, stopping at the first refusal"""
+        while self.pending_capacity:
+            resource, amount = self.pending_capacity[0]
+            if resource in self.total_resources:
+                status, message = self._try_remove_capacity(resource, amount)
+                if status != AllocationStatus.GRANTED:
+                    return
+            self.pending_capacity.pop(0)
+    
+    def add_resource_type(self, resource: str, amount: int):
+        """
+        Add a new resource type at runtime
+        
+        Existing processes keep their claims and simply claim none of the new
+        type, so no process state is rebuilt.
+        """
+        if resource in self.total_resources:
+            raise ValueError(f"Resource {resource} already exists")
+        if amount < 0:
+            raise ValueError(f"Cannot add {amount} {resource}")
+        
+        self.total_resources[resource] = amount
+        self._set_available(resource, amount)
+        self._record({
+            'action': 'add_resource',
+            'resource': resource,
+            'total': amount
+        })
+        self._wake_pending()
+    
+    def remove_resource_type(self, resource: str):
+        """
+        Remove a resource type at runtime
+        
+        Refused while any process holds it. Claims on it are dropped, and a
+        smaller need never makes a safe state unsafe. Queued requests lose
+        their share of it too; ones that asked for nothing else are dropped.
+        """
+        if resource not in self.total_resources:
+            raise ValueError(f"Resource {resource} not found")
+        holders = [pid for pid, p in self.processes.items() if p.allocated.get(resource, 0)]
+        if holders:
+            raise ValueError(f"Resource {resource} is held by processes {holders}")
+        
+        del self.total_resources[resource]
+        self._set_available(resource, 0)
+        del self.available[resource]
+        for process in self.processes.values():
+            if self.state_cache is not None:
+                self.state_cache.update(('max_claim', process.pid, resource), process.max_claim.get(resource, 0), 0)
+            process.max_claim.pop(resource, None)
+            process.allocated.pop(resource, None)
+            process.needed.pop(resource, None)
+        self.pending_capacity = [item for item in self.pending_capacity if item[0] != resource]
+        # Edited in place: the scheduler tracks entries by identity
+        for _, request in self.pending:
+            request.pop(resource, None)
+        self.pending = [item for item in self.pending if item[1]]
+        self._record({
+            'action': 'remove_resource',
+            'resource': resource
+        })
+        self._wake_pending()
+    
+    def save(self, path: str):
+        """Write the state to a binary snapshot file (see binary_snapshot)"""
+        from binary_snapshot import save_snapshot
+        save_snapshot(self, path)
+    
+    @classmethod
+    def load(cls, path: str) -> 'BankersAlgorithm':
+        """Load a banker saved with save(); binary_snapshot.open_snapshot maps it read-only instead"""
+        from binary_snapshot import load_snapshot
+        return load_snapshot(path)
+    
     def get_system_state(self) -> Dict:
         """Get current system state"""
         return {
@@ -251,10 +1147,21 @@ class BankersAlgorithm:
         """Save current system state"""
         return {
             'available': self.available.copy(),
-            'processes': copy.deepcopy(self.processes)
+            'processes': self._copy_processes(self.processes),
+            'hash': self.state_cache.key if self.state_cache is not None else None
         }
     
     def _restore_state(self, state: Dict):
         """Restore system to a previous state"""
         self.available = state['available'].copy()
-        self.processes = copy.deepcopy(state['processes'])
+        self.processes = self._copy_processes(state['processes'])
+        if self.state_cache is not None:
+            self.state_cache.h1, self.state_cache.h2 = state['hash']
+    
+    @staticmethod
+    def _copy_processes(processes: Dict[int, Process]) -> Dict[int, Process]:
+        # Processes only hold flat int dicts, so this matches a deepcopy
+        return {
+            pid: Process(pid, p.max_claim.copy(), p.allocated.copy(), p.needed.copy())
+            for pid, p in processes.items()
+        }
@@ -0,0 +1,196 @@
+"""
+Command line entry point for Banker's Algorithm
+Headless check/replay/report/benchmark commands for shell pipelines and
+hooks. Only argparse is imported up front; each command imports what it
+needs, so PyQt5, NumPy and the visualization module load only for the
+commands that use them.
+
+Run: python -m bankers_cli check state.bks
+"""
+
+import argparse
+import sys
+
+
+def _is_snapshot(path: str) -> bool:
+    from binary_snapshot import MAGIC
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def load_state(path: str):
+    """
+    Load a banker from a binary snapshot or a JSON state
+    
+    JSON states use the get_system_state() layout (what the server's
+    GET /state returns); available is derived from the allocations.
+    """
+    from bankers_algorithm import BankersAlgorithm
+    if _is_snapshot(path):
+        return BankersAlgorithm.load(path)
+    
+    import json
+    with open(path) as f:
+        state = json.load(f)
+    banker = BankersAlgorithm(state['total_resources'])
+    resources = list(banker.total_resources)
+    processes = state.get('processes', {})
+    banker.add_processes(
+        [int(pid) for pid in processes],
+        [[p['max_claim'].get(r, 0) for r in resources] for p in processes.values()],
+        [[p.get('allocated', {}).get(r, 0) for r in resources] for p in processes.values()]
+    )
+    banker.history.clear()
+    return banker
+
+
+def cmd_check(args) -> int:
+    """Print whether a state is safe; exit status 1 if it is not"""
+    if _is_snapshot(args.state):
+        # Mapped in place: no Process objects are built
+        from binary_snapshot import open_snapshot
+        with open_snapshot(args.state) as snapshot:
+            sequence = snapshot.safe_sequence()
+    else:
+        banker = load_state(args.state)
+        sequence = banker.get_safe_sequence() if banker.is_safe() else None
+    
+    if args.json:
+        import json
+        print(json.dumps({'safe': sequence is not None, 'safe_sequence': sequence or []}))
+    elif sequence is None:
+        print("UNSAFE")
+    else:
+        print("SAFE " + " -> ".join(f"P{pid}" for pid in sequence))
+    return 0 if sequence is not None else 1
+
+
+def cmd_replay(args) -> int:
+    """Apply a JSONL or binary trace and summarize the outcome"""
+    from live_feed import apply_event
+    from trace_generator import read_trace
+    
+    banker = load_state(args.state) if args.state else None
+    events = rejected = 0
+    for event in read_trace(args.trace):
+        banker, ok = apply_event(banker, event)
+        events += 1
+        rejected += not ok
+        if banker is not None and not args.keep_history:
+            banker.history.clear()
+    if banker is None:
+        print("Trace has no init event", file=sys.stderr)
+        return 2
+    
+    print(f"{events} events, {rejected} rejected or denied")
+    print(f"{len(banker.processes)} processes, available {banker.available}")
+    if args.save:
+        banker.save(args.save)
+        print(f"Saved {args.save}")
+    return 0
+
+
+def cmd_report(args) -> int:
+    """Print the visualization report or health check for a state"""
+    from visualization import print_full_report, print_health_check
+    
+    banker = load_state(args.state)
+    if args.health:
+        print_health_check(banker)
+    else:
+        print_full_report(banker)
+    return 0
+
+
+def cmd_benchmark(args) -> int:
+    """Measure cold start of the CLI and the safety check on a generated state"""
+    import os
+    import random
+    import statistics
+    import subprocess
+    import tempfile
+    import time
+    from bankers_algorithm import BankersAlgorithm
+    
+    rng = random.Random(args.seed)
+    resources = {f"R{r}": args.processes * 4 for r in range(args.resources)}
+    banker = BankersAlgorithm(resources)
+    claims = [[rng.randint(1, 8) for _ in resources] for _ in range(args.processes)]
+    banker.add_processes(range(args.processes), claims, [[rng.randint(0, c) for c in row] for row in claims])
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.bks')
+        banker.save(path)
+        command = [sys.executable, '-m', 'bankers_cli', 'check', path]
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run(command, env=env, stdout=subprocess.DEVNULL)  # warm the bytecode cache
+        
+        def cold(argv):
+            timings = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                subprocess.run(argv, env=env, stdout=subprocess.DEVNULL)
+                timings.append(time.perf_counter() - start)
+            return statistics.median(timings) * 1000
+        
+        baseline = cold([sys.executable, '-c', 'pass'])
+        startup = cold([sys.executable, '-m', 'bankers_cli', '--help'])
+        check = cold(command)
+    
+    start = time.perf_counter()
+    safe = banker.is_safe()
+    in_process = (time.perf_counter() - start) * 1000
+    
+    print(f"interpreter start        {baseline:8.1f} ms")
+    print(f"bankers_cli --help       {startup:8.1f} ms")
+    print(f"bankers_cli check        {check:8.1f} ms  ({args.processes} processes, mapped snapshot)")
+    print(f"is_safe() in process     {in_process:8.1f} ms  ({'safe' if safe else 'unsafe'})")
+    return 0
+
+
+def cmd_gui(args) -> int:
+    from gui import main as gui_main
+    gui_main()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='bankers_cli', description="Banker's Algorithm tools")
+    sub = parser.add_subparsers(dest='command', required=True)
+    
+    check = sub.add_parser('check', help="Exit 0 if a state is safe, 1 if not")
+    check.add_argument('state', help="Binary snapshot or JSON state")
+    check.add_argument('--json', action='store_true', help="Print the verdict as JSON")
+    check.set_defaults(func=cmd_check)
+    
+    replay = sub.add_parser('replay', help="Apply a JSONL or binary trace")
+    replay.add_argument('trace')
+    replay.add_argument('--state', help="Start from this state instead of the trace's init event")
+    replay.add_argument('--save', help="Write the final state as a binary snapshot")
+    replay.add_argument('--keep-history', action='store_true')
+    replay.set_defaults(func=cmd_replay)
+    
+    report = sub.add_parser('report', help="Print a text report of a state")
+    report.add_argument('state')
+    report.add_argument('--health', action='store_true', help="Health check instead of the full report")
+    report.set_defaults(func=cmd_report)
+    
+    benchmark = sub.add_parser('benchmark', help="Measure cold start and safety check time")
+    benchmark.add_argument('--processes', type=int, default=1000)
+    benchmark.add_argument('--resources', type=int, default=4)
+    benchmark.add_argument('--runs', type=int, default=5)
+    benchmark.add_argument('--seed', type=int, default=0)
+    benchmark.set_defaults(func=cmd_benchmark)
+    
+    gui = sub.add_parser('gui', help="Start the PyQt5 application")
+    gui.set_defaults(func=cmd_gui)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
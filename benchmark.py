@@ -0,0 +1,194 @@
+"""
+Benchmarks for Banker's Algorithm components
+Run: python benchmark.py server [--clients 8] [--requests 2000] [--pipeline 16]
+     python benchmark.py client [--threads 16] [--calls 500]
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import threading
+import time
+from typing import Dict, List
+from bankers_algorithm import BankersAlgorithm
+
+
+def _encode(method: str, path: str, body: Dict = None) -> bytes:
+    data = json.dumps(body).encode() if body is not None else b''
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n\r\n"
+    return head.encode() + data
+
+
+async def _read_response(reader: asyncio.StreamReader) -> bytes:
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':', 1)[1])
+    return await reader.readexactly(length)
+
+
+async def _client(port: int, payloads: List[bytes], pipeline: int) -> int:
+    """Send payloads on one keep-alive connection with up to `pipeline` in flight"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    done = 0
+    for start in range(0, len(payloads), pipeline):
+        window = payloads[start:start + pipeline]
+        writer.write(b''.join(window))
+        for _ in window:
+            await _read_response(reader)
+            done += 1
+    writer.close()
+    await writer.wait_closed()
+    return done
+
+
+def bench_server(clients: int = 8, requests: int = 2000, pipeline: int = 16, batch: int = 0) -> Dict:
+    """
+    Measure requests/sec of the HTTP service under concurrent local clients
+    
+    Args:
+        clients: Concurrent keep-alive connections
+        requests: Operations per client
+        pipeline: Requests in flight per connection
+        batch: If > 0, send operations through /batch in groups of this size
+    """
+    from server import ServerThread
+    
+    # Few processes per client keep the safety check cheap, so the numbers
+    # reflect protocol overhead rather than the size of the state
+    per_client = 4
+    processes = clients * per_client
+    banker = BankersAlgorithm({'CPU': processes * 4, 'Memory': processes * 8})
+    for pid in range(processes):
+        banker.add_process(pid, {'CPU': 4, 'Memory': 8})
+    
+    def operations(client: int) -> List[Dict]:
+        ops = []
+        for i in range(requests):
+            # Three grants then a release, all on the same pid, so every
+            # operation does real work instead of hitting a cheap denial
+            pid = client * per_client + (i // 4) % per_client
+            if i % 4 == 3:
+                ops.append({'op': 'release', 'pid': pid})
+            else:
+                ops.append({'op': 'request', 'pid': pid, 'request': {'CPU': 1, 'Memory': 1}})
+        return ops
+    
+    def encode(ops: List[Dict]) -> List[bytes]:
+        if batch:
+            return [
+                _encode('POST', '/batch', {'operations': ops[i:i + batch]})
+                for i in range(0, len(ops), batch)
+            ]
+        return [_encode('POST', '/' + op['op'], op) for op in ops]
+    
+    payloads = [encode(operations(c)) for c in range(clients)]
+    
+    async def run_all():
+        return await asyncio.gather(*(_client(server.port, p, pipeline) for p in payloads))
+    
+    with ServerThread(banker) as server:
+        start = time.perf_counter()
+        asyncio.run(run_all())
+        elapsed = time.perf_counter() - start
+    
+    total = clients * requests
+    return {
+        'clients': clients,
+        'operations': total,
+        'http_requests': sum(len(p) for p in payloads),
+        'seconds': elapsed,
+        'ops_per_sec': total / elapsed
+    }
+
+
+def bench_client(threads: int = 16, calls: int = 500) -> Dict[str, float]:
+    """
+    Compare calls/sec for one connection per call, pooled connections and pooled + batched
+    
+    Args:
+        threads: Caller threads sharing one client
+        calls: Request/release calls per thread
+    """
+    from client import BankerClient
+    from server import ServerThread
+    
+    banker = BankersAlgorithm({'CPU': threads * 4, 'Memory': threads * 8})
+    for pid in range(threads):
+        banker.add_process(pid, {'CPU': 4, 'Memory': 8})
+    
+    def fresh_connection_call(port: int, pid: int, i: int):
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        op = 'release' if i % 2 else 'request'
+        conn.request('POST', '/' + op, body=json.dumps({'pid': pid, 'request': {'CPU': 1, 'Memory': 1}}))
+        conn.getresponse().read()
+        conn.close()
+    
+    def run(call) -> float:
+        barrier = threading.Barrier(threads + 1)
+        
+        def worker(pid):
+            barrier.wait()
+            for i in range(calls):
+                call(pid, i)
+        
+        workers = [threading.Thread(target=worker, args=(pid,)) for pid in range(threads)]
+        for t in workers:
+            t.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for t in workers:
+            t.join()
+        return threads * calls / (time.perf_counter() - start)
+    
+    results = {}
+    with ServerThread(banker) as server:
+        results['connection per call'] = run(lambda pid, i: fresh_connection_call(server.port, pid, i))
+        
+        for label, window in (('pooled', 0), ('pooled + batched', 0.001)):
+            with BankerClient(port=server.port, pool_size=4, batch_window=window) as client:
+                def call(pid, i, client=client):
+                    if i % 2:
+                        client.release_resources(pid)
+                    else:
+                        client.request_resources(pid, {'CPU': 1, 'Memory': 1})
+                results[label] = run(call)
+    
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banker's Algorithm benchmarks")
+    sub = parser.add_subparsers(dest='target', required=True)
+    
+    srv = sub.add_parser('server', help="HTTP service throughput")
+    srv.add_argument('--clients', type=int, default=8)
+    srv.add_argument('--requests', type=int, default=2000)
+    srv.add_argument('--pipeline', type=int, default=16)
+    srv.add_argument('--batch', type=int, default=0)
+    
+    cli = sub.add_parser('client', help="Client pooling and batching")
+    cli.add_argument('--threads', type=int, default=16)
+    cli.add_argument('--calls', type=int, default=500)
+    
+    args = parser.parse_args(argv)
+    
+    if args.target == 'server':
+        for pipeline, batch in ((1, 0), (args.pipeline, 0), (args.pipeline, args.batch or 32)):
+            result = bench_server(args.clients, args.requests, pipeline, batch)
+            label = f"pipeline={pipeline:<3} batch={batch:<3}"
+            print(f"{label} {result['ops_per_sec']:>10.0f} ops/s "
+                  f"({result['operations']} ops, {result['http_requests']} HTTP requests, "
+                  f"{result['seconds']:.2f}s)")
+    
+    elif args.target == 'client':
+        for label, rate in bench_client(args.threads, args.calls).items():
+            print(f"{label:<20} {rate:>10.0f} calls/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,339 @@
+"""
+Binary snapshots for Banker's Algorithm
+A small JSON header with the resource schema followed by raw int64 columns,
+so a saved state can be memory-mapped and analyzed in place without
+building any Process objects, or loaded back into a banker that builds
+them from the mapping as they are used.
+"""
+
+import gc
+import json
+import mmap
+import os
+import struct
+import sys
+import weakref
+from array import array
+from collections import deque
+from collections.abc import MutableMapping
+from itertools import repeat
+from operator import sub
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from bankers_algorithm import BankersAlgorithm, Process
+
+
+MAGIC = b'BKSNAP01'
+# magic, header length (the header is padded so the columns stay 8-byte aligned)
+PREFIX = struct.Struct('<8sQ')
+
+
+def save_snapshot(banker: BankersAlgorithm, path: str):
+    """
+    Write the banker's state to `path`
+    
+    Layout after the header: total[m], available[m], pids[n], then one
+    max-claim column of n values per resource, then one allocation column
+    per resource, all native int64. History is not kept. The file is written
+    next to `path` and renamed over it, so readers never see a partial one.
+    """
+    resources = list(banker.total_resources)
+    processes = list(banker.processes.values())
+    header = json.dumps({
+        'resources': resources,
+        'processes': len(processes),
+        'version': banker.version,
+        'byteorder': sys.byteorder
+    }).encode()
+    header += b' ' * (-len(header) % 8)
+    
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        array('q', [banker.total_resources[r] for r in resources]).tofile(f)
+        array('q', [banker.available.get(r, 0) for r in resources]).tofile(f)
+        array('q', [process.pid for process in processes]).tofile(f)
+        for r in resources:
+            array('q', [process.max_claim.get(r, 0) for process in processes]).tofile(f)
+        for r in resources:
+            array('q', [process.allocated.get(r, 0) for process in processes]).tofile(f)
+    os.replace(tmp, path)
+
+
+class MappedSnapshot:
+    """Read-only view of a snapshot file; columns are memoryviews into the mapping"""
+    
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, length = PREFIX.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a banker snapshot")
+            header = json.loads(self._mmap[PREFIX.size:PREFIX.size + length])
+            if header['byteorder'] != sys.byteorder:
+                raise ValueError(f"{path} was written on a {header['byteorder']}-endian machine")
+        except (struct.error, ValueError):
+            self._mmap.close()
+            raise
+        
+        self.resources: List[str] = header['resources']
+        self.version: int = header['version']
+        n, m = header['processes'], len(self.resources)
+        self._view = memoryview(self._mmap)[PREFIX.size + length:].cast('q')
+        
+        values = self._view
+        self.total = dict(zip(self.resources, values[:m].tolist()))
+        self.available = dict(zip(self.resources, values[m:2 * m].tolist()))
+        self.pids = values[2 * m:2 * m + n]
+        offset = 2 * m + n
+        self.max_claim: Dict[str, memoryview] = {}
+        self.allocated: Dict[str, memoryview] = {}
+        for columns in (self.max_claim, self.allocated):
+            for r in self.resources:
+                columns[r] = values[offset:offset + n]
+                offset += n
+        self._index: Optional[Dict[int, int]] = None
+    
+    def __len__(self) -> int:
+        return len(self.pids)
+    
+    def __enter__(self) -> 'MappedSnapshot':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        # Every view into the mapping has to be released before it can close
+        for view in (self.pids, *self.max_claim.values(), *self.allocated.values(), self._view):
+            view.release()
+        self._mmap.close()
+    
+    def needed(self, resource: str) -> List[int]:
+        return list(map(sub, self.max_claim[resource], self.allocated[resource]))
+    
+    def row(self, pid: int) -> Optional[int]:
+        """Position of a process in the columns, or None"""
+        if self._index is None:
+            self._index = {p: i for i, p in enumerate(self.pids.tolist())}
+        return self._index.get(pid)
+    
+    def process(self, pid: int) -> Dict[str, Dict[str, int]]:
+        """max_claim, allocated and needed of one process"""
+        i = self.row(pid)
+        if i is None:
+            raise KeyError(pid)
+        max_claim = {r: self.max_claim[r][i] for r in self.resources}
+        allocated = {r: self.allocated[r][i] for r in self.resources}
+        return {
+            'max_claim': max_claim,
+            'allocated': allocated,
+            'needed': {r: max_claim[r] - allocated[r] for r in self.resources}
+        }
+    
+    def safe_sequence(self) -> Optional[List[int]]:
+        """
+        A safe sequence of the snapshot's processes, or None if it is unsafe
+        
+        Runs the pointer reduction from deadlock_detection on the columns:
+        each resource keeps the processes sorted by need and a pointer past
+        those the work vector covers, so the check is O(n m log n) instead
+        of the banker's O(n^2 m).
+        """
+        n, resources = len(self), self.resources
+        needs = [self.needed(r) for r in resources]
+        allocated = [self.allocated[r].tolist() for r in resources]
+        queues = [sorted(range(n), key=need.__getitem__) for need in needs]
+        position = [0] * len(resources)
+        work = [self.available[r] for r in resources]
+        satisfied = [0] * n
+        ready = deque()
+        
+        def advance(r: int):
+            queue, need, i = queues[r], needs[r], position[r]
+            limit = work[r]
+            while i < n and need[queue[i]] <= limit:
+                j = queue[i]
+                satisfied[j] += 1
+                if satisfied[j] == len(resources):
+                    ready.append(j)
+                i += 1
+            position[r] = i
+        
+        if not resources:
+            return self.pids.tolist()
+        for r in range(len(resources)):
+            advance(r)
+        
+        order = []
+        while ready:
+            i = ready.popleft()
+            order.append(i)
+            for r, column in enumerate(allocated):
+                if column[i]:
+                    work[r] += column[i]
+                    advance(r)
+        if len(order) < n:
+            return None
+        pids = self.pids
+        return [pids[i] for i in order]
+    
+    def is_safe(self) -> bool:
+        return self.safe_sequence() is not None
+    
+    def build_process(self, i: int) -> Process:
+        """Process object for the row at position i"""
+        max_claim = {r: self.max_claim[r][i] for r in self.resources}
+        allocated = {r: self.allocated[r][i] for r in self.resources}
+        needed = {r: max_claim[r] - allocated[r] for r in self.resources}
+        return Process(self.pids[i], max_claim, allocated, needed)
+    
+    def build_processes(self) -> Iterator[Tuple[int, Process]]:
+        """(pid, Process) for every row, in file order"""
+        resources = self.resources
+        if resources:
+            claims = zip(*(self.max_claim[r].tolist() for r in resources))
+            allocations = zip(*(self.allocated[r].tolist() for r in resources))
+        else:
+            claims = allocations = repeat(())
+        for pid, claim, held in zip(self.pids.tolist(), claims, allocations):
+            yield pid, Process(
+                pid,
+                dict(zip(resources, claim)),
+                dict(zip(resources, held)),
+                dict(zip(resources, map(sub, claim, held)))
+            )
+    
+    def to_banker(self) -> BankersAlgorithm:
+        """Build a banker from the snapshot without re-running any checks"""
+        banker = self._empty_banker()
+        # Saves the collector repeated full passes over a million new objects
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            banker.processes.update(self.build_processes())
+        finally:
+            if collecting:
+                gc.enable()
+        return banker
+    
+    def _empty_banker(self) -> BankersAlgorithm:
+        banker = BankersAlgorithm(self.total)
+        banker.available = dict(self.available)
+        banker.version = self.version
+        return banker
+
+
+class SnapshotProcesses(MutableMapping):
+    """
+    A loaded banker's processes, built from a mapped snapshot on first use
+    
+    Looking up a pid builds just that Process. Iterating, which every
+    whole-state operation (is_safe, get_system_state, ...) does, builds the
+    rest in one pass; the banker then gets a plain dict back and the
+    mapping is closed. Order matches a banker that added the processes in
+    file order.
+    """
+    
+    def __init__(self, snapshot: MappedSnapshot, banker: BankersAlgorithm):
+        self._snapshot: Optional[MappedSnapshot] = snapshot
+        self._banker = weakref.ref(banker)
+        # Built or assigned processes; the rest are still only in the file
+        self._data: Dict[int, Process] = {}
+        # File pids that were removed (re-adding one puts it at the end)
+        self._removed: Set[int] = set()
+        self._unbuilt = len(snapshot)
+    
+    def _row(self, pid: int) -> Optional[int]:
+        """File position of a pid that is only in the file, or None"""
+        if not self._unbuilt or pid in self._data or pid in self._removed:
+            return None
+        return self._snapshot.row(pid)
+    
+    def __getitem__(self, pid: int) -> Process:
+        process = self._data.get(pid)
+        if process is None:
+            i = self._row(pid)
+            if i is None:
+                raise KeyError(pid)
+            process = self._data[pid] = self._snapshot.build_process(i)
+            self._unbuilt -= 1
+        return process
+    
+    def __setitem__(self, pid: int, process: Process):
+        if self._row(pid) is not None:
+            self._unbuilt -= 1
+        self._data[pid] = process
+    
+    def __delitem__(self, pid: int):
+        if self._row(pid) is not None:
+            self._unbuilt -= 1
+        else:
+            del self._data[pid]
+        if self._snapshot is not None and self._snapshot.row(pid) is not None:
+            self._removed.add(pid)
+    
+    def __contains__(self, pid) -> bool:
+        return pid in self._data or self._row(pid) is not None
+    
+    def __len__(self) -> int:
+        return len(self._data) + self._unbuilt
+    
+    def __iter__(self):
+        return iter(self._built())
+    
+    def values(self):
+        return self._built().values()
+    
+    def items(self):
+        return self._built().items()
+    
+    def _built(self) -> Dict[int, Process]:
+        """Build every remaining process, then hand the banker a plain dict"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self._data
+        
+        data = {}
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            for pid, process in snapshot.build_processes():
+                if pid not in self._removed:
+                    # Processes built earlier may have changed since
+                    data[pid] = self._data.pop(pid, process)
+        finally:
+            if collecting:
+                gc.enable()
+        data.update(self._data)
+        
+        self._data, self._snapshot, self._unbuilt = data, None, 0
+        self._removed.clear()
+        snapshot.close()
+        banker = self._banker()
+        if banker is not None and banker.processes is self:
+            banker.processes = data
+        return data
+
+
+def open_snapshot(path: str) -> MappedSnapshot:
+    """Memory-map a snapshot for read-only analysis"""
+    return MappedSnapshot(path)
+
+
+def load_snapshot(path: str) -> BankersAlgorithm:
+    """
+    Load a snapshot into a new banker
+    
+    Loading only maps the file; Process objects are built as they are used
+    (see SnapshotProcesses), so the cost of building them all is paid only
+    by operations that need the whole state.
+    """
+    snapshot = MappedSnapshot(path)
+    banker = snapshot._empty_banker()
+    if len(snapshot):
+        banker.processes = SnapshotProcesses(snapshot, banker)
+    else:
+        snapshot.close()
+    return banker
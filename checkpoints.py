@@ -0,0 +1,174 @@
+"""
+Checkpointed history for Banker's Algorithm
+Stores a compact snapshot every K operations plus the history entries in
+between, so any past state can be rebuilt by replaying at most K entries
+"""
+
+from typing import Dict, List, Tuple
+from bankers_algorithm import BankersAlgorithm, Process
+
+
+# (resources, total, available, ((pid, max_claim, allocated), ...))
+Snapshot = Tuple[Tuple[str, ...], Tuple[int, ...], Tuple[int, ...], Tuple[Tuple, ...]]
+
+
+def take_snapshot(banker: BankersAlgorithm) -> Snapshot:
+    """Capture banker state as nested tuples in resource order"""
+    resources = tuple(banker.total_resources)
+    return (
+        resources,
+        tuple(banker.total_resources[r] for r in resources),
+        tuple(banker.available.get(r, 0) for r in resources),
+        tuple(
+            (
+                pid,
+                tuple(proc.max_claim.get(r, 0) for r in resources),
+                tuple(proc.allocated.get(r, 0) for r in resources)
+            )
+            for pid, proc in banker.processes.items()
+        )
+    )
+
+
+def restore_snapshot(snapshot: Snapshot) -> BankersAlgorithm:
+    """Build a new banker from a snapshot without re-running any checks"""
+    resources, total, available, processes = snapshot
+    banker = BankersAlgorithm(dict(zip(resources, total)))
+    banker.available = dict(zip(resources, available))
+    
+    for pid, max_claim, allocated in processes:
+        process = Process(
+            pid=pid,
+            max_claim=dict(zip(resources, max_claim)),
+            allocated=dict(zip(resources, allocated))
+        )
+        process.calculate_needed()
+        banker.processes[pid] = process
+    
+    return banker
+
+
+def apply_entry(banker: BankersAlgorithm, entry: Dict):
+    """
+    Replay a committed history entry onto a banker
+    
+    Entries were already validated when they were recorded, so this applies
+    the delta directly instead of going through the request path.
+    """
+    action = entry['action']
+    
+    if action == 'capacity':
+        resource, delta = entry['resource'], entry['delta']
+        banker.total_resources[resource] += delta
+        banker.available[resource] = banker.available.get(resource, 0) + delta
+        return
+    if action == 'add_resource':
+        banker.total_resources[entry['resource']] = entry['total']
+        banker.available[entry['resource']] = entry['total']
+        return
+    if action == 'remove_resource':
+        resource = entry['resource']
+        del banker.total_resources[resource]
+        banker.available.pop(resource, None)
+        for process in banker.processes.values():
+            process.max_claim.pop(resource, None)
+            process.allocated.pop(resource, None)
+            process.needed.pop(resource, None)
+        return
+    if action == 'add_many':
+        # The matrices are stored column by column
+        resources = entry['resources']
+        n = len(entry['pids'])
+        claims = zip(*entry['max_claim']) if resources else [()] * n
+        allocations = zip(*entry['allocated']) if entry['allocated'] and resources else [(0,) * len(resources)] * n
+        for pid, claim, held in zip(entry['pids'], claims, allocations):
+            process = Process(pid=pid, max_claim=dict(zip(resources, claim)), allocated=dict(zip(resources, held)))
+            process.calculate_needed()
+            banker.processes[pid] = process
+            for resource, amount in zip(resources, held):
+                banker.available[resource] -= amount
+        return
+    
+    pid = entry['pid']
+    
+    if action == 'add':
+        max_claim = entry['max_claim']
+        banker.processes[pid] = Process(
+            pid=pid,
+            max_claim=dict(max_claim),
+            allocated={r: 0 for r in max_claim},
+            needed=dict(max_claim)
+        )
+        return
+    
+    process = banker.processes[pid]
+    
+    if action == 'allocate':
+        for resource, amount in entry['request'].items():
+            process.allocated[resource] = process.allocated.get(resource, 0) + amount
+            banker.available[resource] = banker.available.get(resource, 0) - amount
+        process.calculate_needed()
+    elif action in ('release', 'remove'):
+        for resource, amount in entry['released'].items():
+            process.allocated[resource] = process.allocated.get(resource, 0) - amount
+            banker.available[resource] = banker.available.get(resource, 0) + amount
+        process.calculate_needed()
+        if action == 'remove':
+            del banker.processes[pid]
+    else:
+        raise ValueError(f"Unknown history action: {action}")
+
+
+class CheckpointLog:
+    """Record a banker's history with periodic snapshots for fast random access"""
+    
+    def __init__(self, banker: BankersAlgorithm, interval: int = 100):
+        """
+        Start recording a banker's history
+        
+        Args:
+            banker: Banker to follow (its current state becomes index 0)
+            interval: Operations between snapshots (K)
+        """
+        if interval < 1:
+            raise ValueError("Checkpoint interval must be >= 1")
+        
+        self.banker = banker
+        self.interval = interval
+        self.entries: List[Dict] = []
+        # checkpoints[i] is the state after i * interval entries
+        self.checkpoints: List[Snapshot] = [take_snapshot(banker)]
+        banker.subscribe(self._on_entry)
+    
+    def __len__(self) -> int:
+        """Number of reachable states (initial state plus one per entry)"""
+        return len(self.entries) + 1
+    
+    def detach(self):
+        """Stop following the banker"""
+        self.banker.unsubscribe(self._on_entry)
+    
+    def _on_entry(self, entry: Dict):
+        self.entries.append(entry)
+        if len(self.entries) % self.interval == 0:
+            self.checkpoints.append(take_snapshot(self.banker))
+    
+    def state_at(self, index: int) -> BankersAlgorithm:
+        """
+        Rebuild the state after the first `index` entries
+        
+        Args:
+            index: 0 for the initial state, len(self) - 1 for the current one
+        
+        Returns:
+            A detached banker holding the reconstructed state
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"History index {index} out of range")
+        
+        checkpoint = index // self.interval
+        banker = restore_snapshot(self.checkpoints[checkpoint])
+        for entry in self.entries[checkpoint * self.interval:index]:
+            apply_entry(banker, entry)
+        
+        return banker
@@ -0,0 +1,344 @@
+"""
+Client library for the Banker's Algorithm HTTP service
+Mirrors the BankersAlgorithm API over a pool of keep-alive connections and
+transparently batches calls made within a short window into one /batch
+round-trip. BankerClient is thread-based, AsyncBankerClient uses asyncio.
+"""
+
+import asyncio
+import http.client
+import json
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from bankers_algorithm import AllocationStatus
+
+
+def _encode(method: str, path: str, body: Optional[Dict] = None) -> bytes:
+    data = json.dumps(body).encode() if body is not None else b''
+    head = (
+        f"{method} {path} HTTP/1.1\r\n"
+        f"Host: localhost\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n"
+    )
+    return head.encode() + data
+
+
+def _decode(op: Dict, code: int, payload: Dict):
+    """Turn a service response into the value the BankersAlgorithm method returns"""
+    kind = op['op']
+    if code >= 400 and kind not in ('request', 'release'):
+        raise ValueError(payload.get('error', f"HTTP {code}"))
+    
+    if kind == 'request':
+        if code >= 400:
+            return AllocationStatus.DENIED, payload.get('error', f"HTTP {code}")
+        return AllocationStatus(payload['status']), payload['message']
+    if kind == 'release':
+        return code < 400 and payload.get('released', False)
+    if kind == 'state':
+        payload['processes'] = {int(pid): proc for pid, proc in payload['processes'].items()}
+        return payload
+    if kind == 'what-if':
+        return payload
+    return None
+
+
+def _single_request(op: Dict) -> Tuple[str, str, Optional[Dict]]:
+    """Map one operation onto its dedicated endpoint"""
+    kind = op['op']
+    if kind == 'state':
+        return 'GET', '/state', None
+    if kind == 'remove':
+        return 'DELETE', f"/processes/{op['pid']}", None
+    if kind == 'add':
+        return 'POST', '/processes', op
+    return 'POST', '/' + kind, op
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__('localhost', timeout=timeout)
+        self.unix_path = path
+    
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+class _ClientAPI:
+    """BankersAlgorithm-shaped methods on top of a `_call(op)` primitive"""
+    
+    def add_process(self, pid: int, max_claim: Dict[str, int]):
+        return self._call({'op': 'add', 'pid': pid, 'max_claim': max_claim})
+    
+    def remove_process(self, pid: int):
+        return self._call({'op': 'remove', 'pid': pid})
+    
+    def request_resources(self, pid: int, request: Dict[str, int], request_id: Optional[str] = None):
+        op = {'op': 'request', 'pid': pid, 'request': request}
+        if request_id is not None:
+            op['request_id'] = request_id
+        return self._call(op)
+    
+    def release_resources(self, pid: int):
+        return self._call({'op': 'release', 'pid': pid})
+    
+    def explore_what_if(self, pid: int, request: Dict[str, int]):
+        return self._call({'op': 'what-if', 'pid': pid, 'request': request})
+    
+    def get_system_state(self):
+        return self._call({'op': 'state'})
+
+
+class BankerClient(_ClientAPI):
+    """Thread-safe synchronous client with connection pooling and request batching"""
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, unix_path: Optional[str] = None,
+                 pool_size: int = 4, batch_window: float = 0.002, max_batch: int = 256,
+                 timeout: float = 10.0):
+        """
+        Args:
+            host, port: Service address
+            unix_path: Connect over this Unix socket instead of TCP
+            pool_size: Persistent connections kept open
+            batch_window: Seconds to collect concurrent calls into one batch (0 disables batching)
+            max_batch: Largest number of operations sent in one round-trip
+            timeout: Socket timeout in seconds
+        """
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.timeout = timeout
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        
+        self.round_trips = 0
+        self.operations = 0
+        self._stats_lock = threading.Lock()
+        
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._pool_size = pool_size
+        self._pending: "queue.Queue[Tuple[Dict, Future]]" = queue.Queue()
+        self._senders = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="banker-client")
+        self._closed = False
+        self._batcher: Optional[threading.Thread] = None
+        if batch_window > 0:
+            self._batcher = threading.Thread(target=self._batch_loop, name="banker-batcher", daemon=True)
+            self._batcher.start()
+    
+    def close(self):
+        """Flush outstanding calls and close all pooled connections"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._batcher:
+            self._pending.put(None)
+            self._batcher.join()
+        self._senders.shutdown(wait=True)
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+    
+    def __enter__(self) -> 'BankerClient':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _call(self, op: Dict):
+        if self._closed:
+            raise RuntimeError("Client is closed")
+        if self._batcher is None:
+            method, path, body = _single_request(op)
+            code, payload = self._round_trip(method, path, body)
+            return _decode(op, code, payload)
+        
+        future: Future = Future()
+        self._pending.put((op, future))
+        return future.result()
+    
+    def _connection(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            if self.unix_path:
+                return _UnixHTTPConnection(self.unix_path, self.timeout)
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+    
+    def _round_trip(self, method: str, path: str, body: Optional[Dict]) -> Tuple[int, Dict]:
+        conn = self._connection()
+        try:
+            data = json.dumps(body) if body is not None else None
+            conn.request(method, path, body=data, headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            payload = json.loads(response.read())
+        except Exception:
+            conn.close()
+            raise
+        with self._stats_lock:
+            self.round_trips += 1
+        if self._pool.qsize() < self._pool_size:
+            self._pool.put(conn)
+        else:
+            conn.close()
+        return response.status, payload
+    
+    def _batch_loop(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            batch = [item]
+            try:
+                # Collect whatever else arrives within the window
+                deadline = time.monotonic() + self.batch_window
+                while len(batch) < self.max_batch:
+                    nxt = self._pending.get(timeout=max(0.0, deadline - time.monotonic()))
+                    if nxt is None:
+                        self._senders.submit(self._send_batch, batch)
+                        return
+                    batch.append(nxt)
+            except queue.Empty:
+                pass
+            self._senders.submit(self._send_batch, batch)
+    
+    def _send_batch(self, batch: List[Tuple[Dict, Future]]):
+        try:
+            if len(batch) == 1:
+                op = batch[0][0]
+                results = [self._round_trip(*_single_request(op))]
+            else:
+                code, payload = self._round_trip('POST', '/batch', {'operations': [op for op, _ in batch]})
+                if code != 200:
+                    raise RuntimeError(payload.get('error', f"HTTP {code}"))
+                results = [(r.pop('code'), r) for r in payload['results']]
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        
+        with self._stats_lock:
+            self.operations += len(batch)
+        for (op, future), (code, payload) in zip(batch, results):
+            try:
+                future.set_result(_decode(op, code, payload))
+            except Exception as e:
+                future.set_exception(e)
+
+
+class AsyncBankerClient(_ClientAPI):
+    """asyncio client with a pool of keep-alive connections and request batching"""
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, unix_path: Optional[str] = None,
+                 pool_size: int = 4, batch_window: float = 0.002, max_batch: int = 256):
+        """Same arguments as BankerClient; methods are coroutines"""
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        
+        self.round_trips = 0
+        self.operations = 0
+        
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(pool_size)
+        self._batch: List[Tuple[Dict, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+    
+    async def close(self):
+        """Flush outstanding calls and close all pooled connections"""
+        if self._batch:
+            self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            await writer.wait_closed()
+    
+    async def __aenter__(self) -> 'AsyncBankerClient':
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.close()
+    
+    async def _call(self, op: Dict):
+        if self.batch_window <= 0:
+            code, payload = await self._round_trip(*_single_request(op))
+            return _decode(op, code, payload)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._batch.append((op, future))
+        if len(self._batch) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return await future
+    
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch = self._batch, []
+        if batch:
+            task = asyncio.ensure_future(self._send_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _open(self):
+        if self.unix_path:
+            return await asyncio.open_unix_connection(self.unix_path)
+        return await asyncio.open_connection(self.host, self.port)
+    
+    async def _round_trip(self, method: str, path: str, body: Optional[Dict]) -> Tuple[int, Dict]:
+        async with self._slots:
+            reader, writer = self._idle.pop() if self._idle else await self._open()
+            try:
+                writer.write(_encode(method, path, body))
+                status_line = await reader.readline()
+                code = int(status_line.split()[1])
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b''):
+                        break
+                    if line.lower().startswith(b'content-length:'):
+                        length = int(line.split(b':', 1)[1])
+                payload = json.loads(await reader.readexactly(length))
+            except Exception:
+                writer.close()
+                raise
+            self.round_trips += 1
+            self._idle.append((reader, writer))
+            return code, payload
+    
+    async def _send_batch(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        try:
+            if len(batch) == 1:
+                results = [await self._round_trip(*_single_request(batch[0][0]))]
+            else:
+                code, payload = await self._round_trip('POST', '/batch', {'operations': [op for op, _ in batch]})
+                if code != 200:
+                    raise RuntimeError(payload.get('error', f"HTTP {code}"))
+                results = [(r.pop('code'), r) for r in payload['results']]
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        self.operations += len(batch)
+        for (op, future), (code, payload) in zip(batch, results):
+            if future.done():
+                continue
+            try:
+                future.set_result(_decode(op, code, payload))
+            except Exception as e:
+                future.set_exception(e)
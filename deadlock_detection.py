@@ -0,0 +1,262 @@
+"""
+Deadlock detection for systems running without avoidance
+Grants requests optimistically and finds deadlocked processes afterwards,
+for pools that cannot afford a safety check on every request. Detection
+is incremental: each run only re-examines processes that are blocked, and
+only previously deadlocked ones when nothing new has blocked since.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def _reduce(resources: List[str], work: Dict[str, int], candidates: Iterable[int],
+            allocation: Dict[int, Dict[str, int]], requests: Dict[int, Dict[str, int]]) -> Set[int]:
+    """
+    Run the detection reduction over `candidates` and return the ones that
+    can never proceed
+    
+    Each resource keeps the candidates sorted by what they request of it
+    and a pointer past those `work` already covers, so a candidate becomes
+    runnable once all its pointers have passed it. Finishing a candidate
+    only advances pointers, giving O(k m log k) for k candidates.
+    """
+    candidates = list(candidates)
+    m = len(resources)
+    work = dict(work)
+    queues = {
+        r: sorted((requests[pid].get(r, 0), pid) for pid in candidates)
+        for r in resources
+    }
+    position = {r: 0 for r in resources}
+    satisfied = {pid: 0 for pid in candidates}
+    ready = deque()
+    
+    def advance(resource: str):
+        queue, i = queues[resource], position[resource]
+        limit = work.get(resource, 0)
+        while i < len(queue) and queue[i][0] <= limit:
+            pid = queue[i][1]
+            satisfied[pid] += 1
+            if satisfied[pid] == m:
+                ready.append(pid)
+            i += 1
+        position[resource] = i
+    
+    if not m:
+        return set()
+    for resource in resources:
+        advance(resource)
+    
+    finished = 0
+    while ready:
+        pid = ready.popleft()
+        finished += 1
+        for resource, amount in allocation.get(pid, {}).items():
+            if amount:
+                work[resource] = work.get(resource, 0) + amount
+                advance(resource)
+    
+    if finished == len(candidates):
+        return set()
+    return {pid for pid in candidates if satisfied[pid] < m}
+
+
+def detect_deadlock(available: Dict[str, int], allocation: Dict[int, Dict[str, int]],
+                    requests: Dict[int, Dict[str, int]]) -> Set[int]:
+    """
+    One-shot detection over a snapshot
+    
+    Args:
+        available: Free instances per resource
+        allocation: Held resources per process
+        requests: Outstanding (blocked) request per process
+    
+    Returns:
+        Set of deadlocked process IDs
+    """
+    resources = sorted(set(available).union(*allocation.values(), *requests.values()))
+    work = dict(available)
+    for pid, held in allocation.items():
+        if not any(requests.get(pid, {}).values()):
+            for resource, amount in held.items():
+                work[resource] = work.get(resource, 0) + amount
+    blocked = [pid for pid, request in requests.items() if any(request.values())]
+    return _reduce(resources, work, blocked, allocation, requests)
+
+
+class DeadlockDetector:
+    """Optimistic allocator that detects deadlocks instead of avoiding them"""
+    
+    def __init__(self, resources: Dict[str, int]):
+        """
+        Args:
+            resources: Dictionary of resource types and their total instances
+        """
+        self.resources = list(resources)
+        self.total_resources = dict(resources)
+        self.available = dict(resources)
+        self.allocation: Dict[int, Dict[str, int]] = {}
+        # Outstanding request of each blocked process (the wait-for edges)
+        self.blocked: Dict[int, Dict[str, int]] = {}
+        # available plus everything held by processes that are not blocked:
+        # all of it comes back without any blocked process proceeding
+        self.base_work = dict(resources)
+        
+        self.deadlocked: Set[int] = set()
+        self._new_blocks = False
+        self.runs = 0
+        self.examined = 0
+    
+    @classmethod
+    def from_state(cls, available: Dict[str, int], allocation: Dict[int, Dict[str, int]],
+                   requests: Dict[int, Dict[str, int]]) -> 'DeadlockDetector':
+        """Build a detector from the current allocation and blocked request matrices"""
+        totals = dict(available)
+        for held in allocation.values():
+            for resource, amount in held.items():
+                totals[resource] = totals.get(resource, 0) + amount
+        detector = cls(totals)
+        detector.available = {r: available.get(r, 0) for r in totals}
+        detector.base_work = dict(detector.available)
+        for pid, held in allocation.items():
+            detector.allocation[pid] = dict(held)
+        for pid in allocation:
+            request = requests.get(pid)
+            if request and any(request.values()):
+                detector.blocked[pid] = dict(request)
+            else:
+                detector._add_work(detector.allocation[pid], 1)
+        detector._new_blocks = True
+        return detector
+    
+    def add_process(self, pid: int):
+        if pid in self.allocation:
+            raise ValueError(f"Process {pid} already exists")
+        self.allocation[pid] = {r: 0 for r in self.resources}
+    
+    def remove_process(self, pid: int) -> List[int]:
+        """Remove a process and free what it holds; returns the pids unblocked as a result"""
+        if pid not in self.allocation:
+            raise ValueError(f"Process {pid} not found")
+        held = self.allocation.pop(pid)
+        if self.blocked.pop(pid, None) is None:
+            self._add_work(held, -1)
+        self.deadlocked.discard(pid)
+        for resource, amount in held.items():
+            self.available[resource] += amount
+            self.base_work[resource] += amount
+        return self._grant_blocked()
+    
+    def request_resources(self, pid: int, request: Dict[str, int]) -> bool:
+        """
+        Grant a request if the resources are free, otherwise block the process
+        
+        Returns:
+            True if granted, False if the process is now blocked
+        """
+        if pid not in self.allocation:
+            raise ValueError(f"Process {pid} not found")
+        if pid in self.blocked:
+            raise ValueError(f"Process {pid} is blocked on an earlier request")
+        unknown = set(request) - set(self.total_resources)
+        if unknown:
+            raise ValueError(f"Unknown resources: {', '.join(sorted(unknown))}")
+        
+        if self._fits(request):
+            self._grant(pid, request)
+            return True
+        
+        self.blocked[pid] = dict(request)
+        self._add_work(self.allocation[pid], -1)
+        self._new_blocks = True
+        return False
+    
+    def release(self, pid: int, amounts: Optional[Dict[str, int]] = None) -> List[int]:
+        """
+        Return resources (all of them by default) and grant blocked requests
+        that now fit, in FIFO order
+        
+        Returns:
+            Process IDs whose blocked request was granted
+        """
+        if pid not in self.allocation:
+            raise ValueError(f"Process {pid} not found")
+        held = self.allocation[pid]
+        amounts = dict(held) if amounts is None else amounts
+        for resource, amount in amounts.items():
+            if amount < 0 or amount > held.get(resource, 0):
+                raise ValueError(f"Process {pid} cannot release {amount} {resource}")
+        
+        counted = pid not in self.blocked
+        for resource, amount in amounts.items():
+            held[resource] -= amount
+            self.available[resource] += amount
+            if not counted:
+                # Held by a blocked process: now back in the common pool
+                self.base_work[resource] += amount
+        return self._grant_blocked()
+    
+    def detect(self) -> Set[int]:
+        """
+        Return the set of deadlocked processes
+        
+        Processes that are not blocked always finish, so only blocked ones
+        are examined. Releases, removals and grants only add to the
+        reduction's starting work, so unless something blocked since the
+        last run only the previously deadlocked processes are re-examined.
+        """
+        if self._new_blocks:
+            candidates = list(self.blocked)
+        else:
+            candidates = [pid for pid in self.deadlocked if pid in self.blocked]
+        
+        # Blocked processes outside the candidate set were shown to finish
+        work = dict(self.base_work)
+        candidate_set = set(candidates)
+        for pid in self.blocked:
+            if pid not in candidate_set:
+                for resource, amount in self.allocation[pid].items():
+                    work[resource] += amount
+        
+        self.deadlocked = _reduce(self.resources, work, candidates, self.allocation, self.blocked)
+        self._new_blocks = False
+        self.runs += 1
+        self.examined += len(candidates)
+        return set(self.deadlocked)
+    
+    def wait_for(self) -> Dict[int, Set[int]]:
+        """Wait-for graph: each blocked process and the processes holding what it lacks"""
+        graph = {}
+        for pid, request in self.blocked.items():
+            short = [r for r, amount in request.items() if amount > self.available[r]]
+            graph[pid] = {
+                holder for holder, held in self.allocation.items()
+                if holder != pid and any(held.get(r, 0) for r in short)
+            }
+        return graph
+    
+    def _fits(self, request: Dict[str, int]) -> bool:
+        return all(amount <= self.available[r] for r, amount in request.items())
+    
+    def _grant(self, pid: int, request: Dict[str, int]):
+        held = self.allocation[pid]
+        for resource, amount in request.items():
+            held[resource] = held.get(resource, 0) + amount
+            self.available[resource] -= amount
+    
+    def _add_work(self, held: Dict[str, int], sign: int):
+        for resource, amount in held.items():
+            self.base_work[resource] = self.base_work.get(resource, 0) + sign * amount
+    
+    def _grant_blocked(self) -> List[int]:
+        granted = []
+        for pid, request in list(self.blocked.items()):
+            if self._fits(request):
+                del self.blocked[pid]
+                # Moving resources to a now-running process leaves base_work unchanged
+                self._add_work(self.allocation[pid], 1)
+                self._grant(pid, request)
+                self.deadlocked.discard(pid)
+                granted.append(pid)
+        return granted
@@ -0,0 +1,186 @@
+"""
+Hierarchical (node/global) Banker's Algorithm
+Each node runs its own banker over capacity it has reserved from a global
+banker, where every node is one "process" whose max claim is the node's
+hardware limit. Requests that fit the reservation are decided locally;
+only reservations escalate to the global level.
+
+Both levels stay safe: a node only grants what keeps its own banker safe
+using reserved capacity alone, and the global banker only hands out
+reservations that keep it safe. So every node can finish its processes
+without further help and every reservation can eventually be returned.
+"""
+
+import threading
+from multiprocessing.managers import BaseManager
+from typing import Dict, Optional, Tuple
+from bankers_algorithm import AllocationStatus, BankersAlgorithm
+
+
+class GlobalPool:
+    """Global banker tracking per-node reservations (thread safe)"""
+    
+    def __init__(self, resources: Dict[str, int]):
+        self.banker = BankersAlgorithm(resources)
+        self.lock = threading.Lock()
+        self.reservations_granted = 0
+        self.reservations_denied = 0
+    
+    def add_node(self, node_id: int, limit: Dict[str, int]):
+        """Register a node; `limit` is the most it may ever reserve"""
+        with self.lock:
+            self.banker.add_process(node_id, limit)
+    
+    def limit(self, node_id: int) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.banker.processes[node_id].max_claim)
+    
+    def reserve(self, node_id: int, amounts: Dict[str, int]) -> bool:
+        """Grow a node's reservation if the global state stays safe"""
+        with self.lock:
+            status, _ = self.banker.request_resources(node_id, amounts)
+            if status == AllocationStatus.GRANTED:
+                self.reservations_granted += 1
+                return True
+            self.reservations_denied += 1
+            return False
+    
+    def release(self, node_id: int, amounts: Dict[str, int]):
+        """Return part of a node's reservation"""
+        with self.lock:
+            self.banker.release(node_id, amounts)
+    
+    def reservations(self) -> Dict[int, Dict[str, int]]:
+        with self.lock:
+            return {node: dict(p.allocated) for node, p in self.banker.processes.items()}
+    
+    def state(self) -> Tuple[Dict[str, int], bool]:
+        """Return (available, is_safe) of the global banker"""
+        with self.lock:
+            return dict(self.banker.available), self.banker.is_safe()
+
+
+class NodeBanker:
+    """Node-local banker admitting requests against its reservation"""
+    
+    def __init__(self, node_id: int, pool: GlobalPool, slack: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            node_id: Node registered with pool.add_node()
+            pool: GlobalPool, or a proxy to one in another process
+            slack: Free capacity kept reserved after releases to avoid escalating again soon
+        """
+        self.node_id = node_id
+        self.pool = pool
+        self.limit = pool.limit(node_id)
+        self.slack = slack or {}
+        self.banker = BankersAlgorithm({r: 0 for r in self.limit})
+        
+        self.local_grants = 0
+        self.escalations = 0
+    
+    @property
+    def reserved(self) -> Dict[str, int]:
+        return dict(self.banker.total_resources)
+    
+    def add_process(self, pid: int, max_claim: Dict[str, int]) -> bool:
+        """
+        Admit a process to this node
+        
+        Reserves whatever the node lacks to run the new process first, which
+        keeps the node safe on its reservation alone.
+        
+        Returns:
+            False if the claim exceeds the node limit or the reservation was denied
+        """
+        if pid in self.banker.processes:
+            raise ValueError(f"Process {pid} already exists")
+        if any(amount > self.limit.get(r, 0) for r, amount in max_claim.items()):
+            return False
+        shortfall = {
+            r: amount - self.banker.available.get(r, 0)
+            for r, amount in max_claim.items()
+            if amount > self.banker.available.get(r, 0)
+        }
+        if shortfall and not self._reserve(shortfall):
+            return False
+        self.banker.add_process(pid, max_claim)
+        return True
+    
+    def request_resources(self, pid: int, request: Dict[str, int]) -> Tuple[AllocationStatus, str]:
+        """Grant locally if possible, otherwise grow the reservation and retry"""
+        status, message = self.banker.request_resources(pid, request)
+        if status == AllocationStatus.GRANTED:
+            self.local_grants += 1
+            return status, message
+        if pid not in self.banker.processes or any(
+            amount > self.banker.processes[pid].needed.get(r, 0) for r, amount in request.items()
+        ):
+            return status, message
+        
+        # First reserve just the shortfall, then, if the grant would still be
+        # unsafe, the rest of the request - after that the grant leaves the
+        # node's available vector where it started, so it is always safe
+        available = self.banker.available
+        shortfall = {r: a - available.get(r, 0) for r, a in request.items() if a > available.get(r, 0)}
+        rest = {r: a - shortfall.get(r, 0) for r, a in request.items() if a > shortfall.get(r, 0)}
+        for extra in (shortfall, rest):
+            if not extra:
+                continue
+            if not self._reserve(extra):
+                return AllocationStatus.DENIED, "Request denied - global reservation refused"
+            status, message = self.banker.request_resources(pid, request)
+            if status == AllocationStatus.GRANTED:
+                return status, message
+        return status, message
+    
+    def release_resources(self, pid: int) -> bool:
+        released = self.banker.release_resources(pid)
+        if released:
+            self._return_surplus()
+        return released
+    
+    def remove_process(self, pid: int):
+        self.banker.remove_process(pid)
+        self._return_surplus()
+    
+    def _reserve(self, amounts: Dict[str, int]) -> bool:
+        self.escalations += 1
+        if not self.pool.reserve(self.node_id, amounts):
+            return False
+        for resource, amount in amounts.items():
+            self.banker.add_capacity(resource, amount)
+        return True
+    
+    def _return_surplus(self):
+        """
+        Give back free capacity beyond the largest remaining need plus slack
+        
+        While available covers every process's need, any process can finish
+        first, so the node stays safe after shrinking to that level.
+        """
+        keep = {r: self.slack.get(r, 0) for r in self.limit}
+        for process in self.banker.processes.values():
+            for resource, need in process.needed.items():
+                keep[resource] = max(keep[resource], need + self.slack.get(resource, 0))
+        surplus = {
+            r: self.banker.available[r] - keep[r]
+            for r in self.limit
+            if self.banker.available[r] > keep[r]
+        }
+        returned = {}
+        for resource, amount in surplus.items():
+            status, _ = self.banker.remove_capacity(resource, amount)
+            if status == AllocationStatus.GRANTED:
+                returned[resource] = amount
+        if returned:
+            self.pool.release(self.node_id, returned)
+
+
+class PoolManager(BaseManager):
+    """Share one GlobalPool with node workers in other processes"""
+
+
+PoolManager.register('GlobalPool', GlobalPool, exposed=(
+    'add_node', 'limit', 'reserve', 'release', 'reservations', 'state'
+))
@@ -3,14 +3,18 @@ from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QTabWidget, QTableWidget, QTableWidgetItem, QPushButton, QLabel,
     QSpinBox, QLineEdit, QComboBox, QDialog, QMessageBox, QTextEdit,
-    QGroupBox, QGridLayout, QScrollArea, QFrame
+    QGroupBox, QGridLayout, QScrollArea, QFrame, QSlider, QTableView
 )
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QColor, QFont, QIcon
+from PyQt5.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor, QFont, QIcon, QPainter
 from PyQt5.QtChart import QChart, QChartView, QBarSeries, QBarSet, QBarCategoryAxis, QValueAxis
 from PyQt5.QtCore import Qt as QtCore
 import json
+import threading
 from bankers_algorithm import BankersAlgorithm, AllocationStatus
+from checkpoints import CheckpointLog
+from live_feed import LiveFeed
+from whatif_engine import WhatIfEngine
 
 
 class ResourceAllocationDialog(QDialog):
@@ -63,14 +67,127 @@ class ResourceAllocationDialog(QDialog):
         return {res: self.resource_inputs[res].value() for res in self.resources}
 
 
+class HistoryTableModel(QAbstractTableModel):
+    """Table model over a checkpoint log - rows are rendered only when visible"""
+    
+    HEADERS = ["Action", "Process ID", "Details", "Result"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log = None
+        self.row_count = 0
+    
+    def set_log(self, log):
+        self.beginResetModel()
+        self.log = log
+        self.row_count = len(log.entries) if log else 0
+        self.endResetModel()
+    
+    def sync(self):
+        """Append rows for entries recorded since the last sync"""
+        if not self.log:
+            return
+        count = len(self.log.entries)
+        if count > self.row_count:
+            self.beginInsertRows(QModelIndex(), self.row_count, count - 1)
+            self.row_count = count
+            self.endInsertRows()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.row_count
+    
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        
+        entry = self.log.entries[index.row()]
+        column = index.column()
+        if column == 0:
+            return entry['action']
+        if column == 1:
+            if 'pids' in entry:
+                return f"{len(entry['pids'])} processes"
+            return str(entry.get('pid', entry.get('resource')))
+        if column == 2:
+            details = entry.get('request') or entry.get('released') or entry.get('max_claim')
+            if details is None:
+                details = entry.get('delta', entry.get('total'))
+            return str(details)
+        return entry.get('status', 'done')
+
+
+class HeatmapWidget(QWidget):
+    """Paint a what-if grid: green cells are granted, red cells denied"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.grid = None
+        self.setMinimumSize(300, 300)
+    
+    def set_grid(self, grid):
+        self.grid = grid
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if not self.grid:
+            painter.drawText(self.rect(), Qt.AlignCenter, "No what-if grid computed")
+            return
+        
+        rows, cols = self.grid.shape
+        margin = 30
+        cell_w = max(1.0, (self.width() - margin) / cols)
+        cell_h = max(1.0, (self.height() - margin) / rows)
+        granted = QColor(52, 211, 153)
+        denied = QColor(239, 68, 68)
+        
+        # Each row is one granted run followed by one denied run
+        for a in range(rows):
+            y = int(a * cell_h)
+            h = int((a + 1) * cell_h) - y
+            split = int(margin + (self.grid.boundary[a] + 1) * cell_w)
+            painter.fillRect(margin, y, split - margin, h, granted)
+            painter.fillRect(split, y, self.width() - split, h, denied)
+        
+        painter.drawText(0, self.height() - 8, f"{self.grid.resource_a} ↓  {self.grid.resource_b} →")
+
+
 class BankersVisualizerGUI(QMainWindow):
     """Main GUI for Banker's Algorithm Visualizer"""
     
+    LIVE_REFRESH_MS = 250
+    
     def __init__(self):
         super().__init__()
         self.banker = None
         self.resources = {}
+        self.banker_lock = threading.RLock()
+        self.live_feed = None
+        self.history_log = None
         self.init_ui()
+        
+        # Live mode redraws at a bounded rate instead of once per event
+        self.live_timer = QTimer(self)
+        self.live_timer.setInterval(self.LIVE_REFRESH_MS)
+        self.live_timer.timeout.connect(self.refresh_live_view)
+        
+        # What-if grids are computed off the GUI thread and polled here
+        self.whatif_engine = WhatIfEngine()
+        self.heatmap_future = None
+        self.heatmap_key = None
+        self.heatmap_timer = QTimer(self)
+        self.heatmap_timer.setInterval(100)
+        self.heatmap_timer.timeout.connect(self.poll_heatmap)
     
     def init_ui(self):
         self.setWindowTitle("Banker's Algorithm Visualizer - Safe State Explorer")
@@ -175,6 +292,36 @@ class BankersVisualizerGUI(QMainWindow):
         whatif_group.setLayout(whatif_layout)
         layout.addWidget(whatif_group)
         
+        # Live feed
+        live_group = QGroupBox("Live Feed")
+        live_layout = QVBoxLayout()
+        
+        self.live_source = QComboBox()
+        self.live_source.addItem("JSONL trace file", "file")
+        self.live_source.addItem("Unix socket", "socket")
+        live_layout.addWidget(self.live_source)
+        
+        self.live_path = QLineEdit()
+        self.live_path.setPlaceholderText("Path to trace file or socket")
+        live_layout.addWidget(self.live_path)
+        
+        live_btn_layout = QHBoxLayout()
+        self.live_start_btn = QPushButton("Start Live Mode")
+        self.live_start_btn.clicked.connect(self.start_live_feed)
+        live_btn_layout.addWidget(self.live_start_btn)
+        
+        self.live_stop_btn = QPushButton("Stop")
+        self.live_stop_btn.setEnabled(False)
+        self.live_stop_btn.clicked.connect(self.stop_live_feed)
+        live_btn_layout.addWidget(self.live_stop_btn)
+        live_layout.addLayout(live_btn_layout)
+        
+        self.live_status = QLabel("Live mode off")
+        live_layout.addWidget(self.live_status)
+        
+        live_group.setLayout(live_layout)
+        layout.addWidget(live_group)
+        
         layout.addStretch()
         
         group.setLayout(layout)
@@ -200,11 +347,55 @@ class BankersVisualizerGUI(QMainWindow):
         self.safe_seq_text.setReadOnly(True)
         tabs.addTab(self.safe_seq_text, "Safe Sequence")
         
-        # History tab
-        self.history_table = QTableWidget()
-        self.history_table.setColumnCount(4)
-        self.history_table.setHorizontalHeaderLabels(["Action", "Process ID", "Details", "Result"])
-        tabs.addTab(self.history_table, "History")
+        # History tab - slider scrubs through past states
+        history_widget = QWidget()
+        history_layout = QVBoxLayout()
+        
+        self.history_slider = QSlider(Qt.Horizontal)
+        self.history_slider.setRange(0, 0)
+        self.history_slider.valueChanged.connect(self.show_history_state)
+        history_layout.addWidget(self.history_slider)
+        
+        self.history_label = QLabel("Viewing live state")
+        history_layout.addWidget(self.history_label)
+        
+        self.history_model = HistoryTableModel(self)
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
+        self.history_table.setSelectionBehavior(QTableView.SelectRows)
+        self.history_table.verticalHeader().setDefaultSectionSize(22)
+        self.history_table.clicked.connect(
+            lambda index: self.history_slider.setValue(index.row() + 1)
+        )
+        history_layout.addWidget(self.history_table)
+        
+        history_widget.setLayout(history_layout)
+        tabs.addTab(history_widget, "History")
+        
+        # What-if heatmap tab
+        heatmap_widget = QWidget()
+        heatmap_layout = QVBoxLayout()
+        
+        axis_layout = QHBoxLayout()
+        axis_layout.addWidget(QLabel("Rows:"))
+        self.heatmap_res_a = QComboBox()
+        axis_layout.addWidget(self.heatmap_res_a)
+        axis_layout.addWidget(QLabel("Columns:"))
+        self.heatmap_res_b = QComboBox()
+        axis_layout.addWidget(self.heatmap_res_b)
+        heatmap_btn = QPushButton("Show Heatmap")
+        heatmap_btn.clicked.connect(self.request_heatmap)
+        axis_layout.addWidget(heatmap_btn)
+        heatmap_layout.addLayout(axis_layout)
+        
+        self.heatmap_label = QLabel("Select the process on the left and two resources")
+        heatmap_layout.addWidget(self.heatmap_label)
+        
+        self.heatmap = HeatmapWidget()
+        heatmap_layout.addWidget(self.heatmap, 1)
+        
+        heatmap_widget.setLayout(heatmap_layout)
+        tabs.addTab(heatmap_widget, "What-If Heatmap")
         
         return tabs
     
@@ -216,8 +407,11 @@ class BankersVisualizerGUI(QMainWindow):
         }
         
         if all(v > 0 for v in resources.values()):
-            self.banker = BankersAlgorithm(resources)
-            self.resources = resources
+            with self.banker_lock:
+                self.banker = BankersAlgorithm(resources)
+                self.resources = resources
+                self.attach_history()
+            self.set_heatmap_resources()
             QMessageBox.information(self, "Success", "System initialized successfully!")
             self.update_display()
         else:
@@ -236,11 +430,13 @@ class BankersVisualizerGUI(QMainWindow):
         if dialog.exec_() == QDialog.Accepted:
             max_claim = dialog.get_result()
             try:
-                self.banker.add_process(pid, max_claim)
-                QMessageBox.information(self, "Success", f"Process {pid} added!")
-                self.update_display()
+                with self.banker_lock:
+                    self.banker.add_process(pid, max_claim)
             except ValueError as e:
                 QMessageBox.warning(self, "Error", str(e))
+                return
+            QMessageBox.information(self, "Success", f"Process {pid} added!")
+            self.update_display()
     
     def remove_process(self):
         """Remove selected process"""
@@ -250,11 +446,13 @@ class BankersVisualizerGUI(QMainWindow):
         
         pid = self.pid_input.value()
         try:
-            self.banker.remove_process(pid)
-            QMessageBox.information(self, "Success", f"Process {pid} removed!")
-            self.update_display()
+            with self.banker_lock:
+                self.banker.remove_process(pid)
         except ValueError as e:
             QMessageBox.warning(self, "Error", str(e))
+            return
+        QMessageBox.information(self, "Success", f"Process {pid} removed!")
+        self.update_display()
     
     def request_resources_dialog(self):
         """Show dialog to request resources"""
@@ -267,7 +465,8 @@ class BankersVisualizerGUI(QMainWindow):
         
         if dialog.exec_() == QDialog.Accepted:
             request = dialog.get_result()
-            status, message = self.banker.request_resources(pid, request)
+            with self.banker_lock:
+                status, message = self.banker.request_resources(pid, request)
             
             color = "green" if status == AllocationStatus.GRANTED else "red"
             QMessageBox.information(
@@ -284,7 +483,9 @@ class BankersVisualizerGUI(QMainWindow):
             return
         
         pid = self.pid_input.value()
-        if self.banker.release_resources(pid):
+        with self.banker_lock:
+            released = self.banker.release_resources(pid)
+        if released:
             QMessageBox.information(self, "Success", f"Resources released for Process {pid}")
             self.update_display()
         else:
@@ -301,7 +502,10 @@ class BankersVisualizerGUI(QMainWindow):
         
         if dialog.exec_() == QDialog.Accepted:
             request = dialog.get_result()
-            result = self.banker.explore_what_if(pid, request)
+            # explore_what_if restores the processes it saved, so feed events
+            # must not land while it runs
+            with self.banker_lock:
+                result = self.banker.explore_what_if(pid, request)
             
             feasible = result['feasible']
             message = result['message']
@@ -315,19 +519,163 @@ class BankersVisualizerGUI(QMainWindow):
             
             QMessageBox.information(self, "What-If Analysis", details)
     
+    def start_live_feed(self):
+        """Start applying events from a trace file or socket"""
+        path = self.live_path.text().strip()
+        if not path:
+            QMessageBox.warning(self, "Error", "Enter a trace file or socket path!")
+            return
+        
+        self.live_feed = LiveFeed(
+            self.banker,
+            self.live_source.currentData(),
+            path,
+            lock=self.banker_lock
+        )
+        self.live_feed.start()
+        self.live_timer.start()
+        
+        self.live_start_btn.setEnabled(False)
+        self.live_stop_btn.setEnabled(True)
+        self.live_status.setText("Live mode on - waiting for events")
+    
+    def stop_live_feed(self):
+        """Stop live mode and show the final state"""
+        if self.live_feed:
+            self.live_feed.stop()
+        self.live_timer.stop()
+        self.refresh_live_view()
+        
+        self.live_start_btn.setEnabled(True)
+        self.live_stop_btn.setEnabled(False)
+    
+    def refresh_live_view(self):
+        """Redraw from the live feed if events arrived since the last tick"""
+        feed = self.live_feed
+        if not feed or not feed.consume_changes():
+            if feed and feed.error:
+                self.live_status.setText(f"Live feed error: {feed.error}")
+            return
+        
+        with self.banker_lock:
+            if feed.banker is not self.banker:
+                self.banker = feed.banker
+                self.resources = dict(self.banker.total_resources)
+                self.attach_history()
+                self.set_heatmap_resources()
+            self.update_display()
+        
+        state = "on" if feed.is_running() else "off"
+        self.live_status.setText(
+            f"Live mode {state} - {feed.applied} applied, {feed.rejected} rejected"
+        )
+    
+    def set_heatmap_resources(self):
+        """Offer the current resource types as heatmap axes"""
+        names = list(self.resources)
+        for combo, default in ((self.heatmap_res_a, 0), (self.heatmap_res_b, 1)):
+            combo.clear()
+            combo.addItems(names)
+            combo.setCurrentIndex(min(default, len(names) - 1))
+    
+    def request_heatmap(self):
+        """Start following the selected process and resource pair"""
+        if not self.banker:
+            QMessageBox.warning(self, "Error", "Initialize system first!")
+            return
+        
+        self.heatmap_key = None
+        self.heatmap_timer.start()
+        self.poll_heatmap()
+    
+    def poll_heatmap(self):
+        """Show a finished grid and resubmit when the state version moves on"""
+        if self.heatmap_future is not None:
+            if not self.heatmap_future.done():
+                return
+            future, self.heatmap_future = self.heatmap_future, None
+            if future.exception() is not None:
+                self.heatmap_label.setText(str(future.exception()))
+                self.heatmap_timer.stop()
+                return
+            grid = future.result()
+            self.heatmap.set_grid(grid)
+            self.heatmap_label.setText(
+                f"Process {grid.pid}: {grid.resource_a} 0..{grid.shape[0] - 1} "
+                f"× {grid.resource_b} 0..{grid.shape[1] - 1}"
+            )
+        
+        pid = self.pid_input.value()
+        res_a = self.heatmap_res_a.currentText()
+        res_b = self.heatmap_res_b.currentText()
+        # Nothing to redo until the state version or the selection changes
+        key = self.whatif_engine.key(self.banker, pid, res_a, res_b)
+        if key == self.heatmap_key:
+            return
+        with self.banker_lock:
+            key = self.whatif_engine.key(self.banker, pid, res_a, res_b)
+            try:
+                self.heatmap_future = self.whatif_engine.submit(self.banker, pid, res_a, res_b)
+            except ValueError as e:
+                self.heatmap_label.setText(str(e))
+                self.heatmap_timer.stop()
+                return
+        self.heatmap_key = key
+    
+    def attach_history(self):
+        """Start checkpointing the current banker for the history browser"""
+        if self.history_log:
+            self.history_log.detach()
+        self.history_log = CheckpointLog(self.banker)
+        self.history_model.set_log(self.history_log)
+        self.history_slider.setRange(0, 0)
+    
+    def is_following_history(self):
+        """True when the history slider is at the newest state"""
+        return self.history_slider.value() == self.history_slider.maximum()
+    
+    def show_history_state(self, index):
+        """Show the state after `index` operations, or the live state at the end"""
+        if not self.history_log:
+            return
+        
+        if index >= len(self.history_log) - 1:
+            self.history_label.setText("Viewing live state")
+            self.update_display()
+            return
+        
+        with self.banker_lock:
+            past = self.history_log.state_at(index)
+        self.history_label.setText(
+            f"Viewing state after operation {index} of {len(self.history_log) - 1}"
+        )
+        self.render_state(past.get_system_state())
+    
     def update_display(self):
         """Update all display elements"""
         if not self.banker:
             return
         
-        state = self.banker.get_system_state()
-        
+        with self.banker_lock:
+            state = self.banker.get_system_state()
+            if self.history_log:
+                self.history_model.sync()
+                following = self.is_following_history()
+                self.history_slider.blockSignals(True)
+                self.history_slider.setMaximum(len(self.history_log) - 1)
+                if following:
+                    self.history_slider.setValue(self.history_slider.maximum())
+                self.history_slider.blockSignals(False)
+                if not following:
+                    return
+        
+        self.render_state(state)
+    
+    def render_state(self, state):
+        """Render a system state into the tables and chart"""
         # Update system state table
-        self.state_table.setRowCount(0)
-        for pid, proc_info in state['processes'].items():
-            row = self.state_table.rowCount()
-            self.state_table.insertRow(row)
-            
+        self.state_table.setRowCount(len(state['processes']))
+        for row, (pid, proc_info) in enumerate(state['processes'].items()):
             self.state_table.setItem(row, 0, QTableWidgetItem(str(pid)))
             self.state_table.setItem(row, 1, QTableWidgetItem(str(proc_info['max_claim'])))
             self.state_table.setItem(row, 2, QTableWidgetItem(str(proc_info['allocated'])))
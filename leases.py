@@ -0,0 +1,234 @@
+"""
+Lease-based allocations for Banker's Algorithm
+Grants can carry a TTL that the holder renews; a hierarchical timer wheel
+expires lapsed leases and returns their resources to the banker in one
+batched release per tick.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from bankers_algorithm import AllocationStatus, BankersAlgorithm
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel over integer ticks
+    
+    Level l has `slots` buckets of slots**l ticks each. A timer goes into
+    the lowest level whose range covers it and is moved down one level when
+    its bucket comes up, so scheduling is O(1) and each timer is touched at
+    most once per level.
+    """
+    
+    def __init__(self, slots: int = 64, levels: int = 4, start: int = 0):
+        if levels < 2:
+            # Timers past the top level are re-parked there and cascaded, which needs a level below it
+            raise ValueError(f"A timer wheel needs at least 2 levels, got {levels}")
+        self.slots = slots
+        self.levels = levels
+        self.current = start
+        self.count = 0
+        self.wheels: List[List[List[Tuple[object, int]]]] = [
+            [[] for _ in range(slots)] for _ in range(levels)
+        ]
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def schedule(self, key, tick: int):
+        """Fire `key` once the wheel reaches `tick` (past ticks fire on the next advance)"""
+        self._insert(key, max(tick, self.current + 1))
+        self.count += 1
+    
+    def advance(self, tick: int) -> List:
+        """Move the wheel to `tick` and return the keys that fired"""
+        fired = []
+        while self.current < tick:
+            if not self.count:
+                self.current = tick
+                break
+            self.current += 1
+            current = self.current
+            
+            # Cascade every level whose bucket boundary was just crossed
+            span = 1
+            for level in range(1, self.levels):
+                span *= self.slots
+                if current % span:
+                    break
+                bucket = self.wheels[level][(current // span) % self.slots]
+                entries = bucket[:]
+                bucket.clear()
+                for key, due in entries:
+                    if due <= current:
+                        fired.append(key)
+                        self.count -= 1
+                    else:
+                        self._insert(key, due)
+            
+            bucket = self.wheels[0][current % self.slots]
+            if bucket:
+                fired.extend(key for key, _ in bucket)
+                self.count -= len(bucket)
+                bucket.clear()
+        return fired
+    
+    def _insert(self, key, tick: int):
+        delta = tick - self.current
+        span = 1
+        for level in range(self.levels):
+            if delta < span * self.slots:
+                self.wheels[level][(tick // span) % self.slots].append((key, tick))
+                return
+            span *= self.slots
+        
+        # Beyond the top level's range: park in its farthest bucket, which
+        # re-inserts the timer when it comes up
+        span //= self.slots
+        park = self.current + span * (self.slots - 1)
+        self.wheels[-1][(park // span) % self.slots].append((key, tick))
+
+
+@dataclass
+class Lease:
+    """One granted request that must be renewed before it expires"""
+    lease_id: int
+    pid: int
+    amounts: Dict[str, int]
+    ttl: float
+    deadline: int
+
+
+class LeaseManager:
+    """Grant requests with a TTL and release them when they are not renewed"""
+    
+    def __init__(self, banker: BankersAlgorithm, tick: float = 0.1,
+                 lock: Optional[threading.RLock] = None, clock=time.monotonic):
+        """
+        Args:
+            banker: Banker whose grants are leased
+            tick: Timer resolution in seconds; leases expire up to one tick late
+            lock: Lock shared with other users of the banker
+            clock: Time source (seconds)
+        """
+        self.banker = banker
+        self.tick = tick
+        self.lock = lock or threading.RLock()
+        self.clock = clock
+        
+        self.leases: Dict[int, Lease] = {}
+        self.wheel = TimerWheel(start=self._tick_of(clock()))
+        self.next_id = 1
+        self.expired = 0
+        self.batches = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def request_resources(self, pid: int, request: Dict[str, int],
+                          ttl: float) -> Tuple[AllocationStatus, str, Optional[int]]:
+        """
+        Request resources under a lease of `ttl` seconds
+        
+        Returns:
+            Tuple of (status, message, lease_id) - lease_id is None if denied
+        """
+        with self.lock:
+            status, message = self.banker.request_resources(pid, request)
+            if status != AllocationStatus.GRANTED:
+                return status, message, None
+            lease = Lease(self.next_id, pid, dict(request), ttl, self._deadline(ttl))
+            self.next_id += 1
+            self.leases[lease.lease_id] = lease
+            self.wheel.schedule(lease.lease_id, lease.deadline)
+            return status, message, lease.lease_id
+    
+    def renew(self, lease_id: int, ttl: Optional[float] = None) -> bool:
+        """Push a lease's deadline `ttl` seconds (default: its own TTL) into the future"""
+        with self.lock:
+            lease = self.leases.get(lease_id)
+            if lease is None:
+                return False
+            if ttl is not None:
+                lease.ttl = ttl
+            # The old timer is left in the wheel and ignored when it fires
+            lease.deadline = self._deadline(lease.ttl)
+            self.wheel.schedule(lease_id, lease.deadline)
+            return True
+    
+    def release(self, lease_id: int) -> bool:
+        """Return a lease's resources now"""
+        with self.lock:
+            lease = self.leases.pop(lease_id, None)
+            if lease is None:
+                return False
+            self._release([lease])
+            return True
+    
+    def expire(self, now: Optional[float] = None) -> List[Lease]:
+        """
+        Release every lease whose deadline has passed
+        
+        All expired leases are returned through one banker.release_many()
+        call, so pending requests are retried once per tick.
+        """
+        with self.lock:
+            now = self.clock() if now is None else now
+            expired = []
+            for lease_id in self.wheel.advance(self._tick_of(now)):
+                lease = self.leases.get(lease_id)
+                # Skip timers superseded by a renewal or an explicit release
+                if lease is None or lease.deadline > self.wheel.current:
+                    continue
+                del self.leases[lease_id]
+                expired.append(lease)
+            if expired:
+                self._release(expired)
+                self.expired += len(expired)
+                self.batches += 1
+            return expired
+    
+    def start(self):
+        """Expire leases every tick on a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="lease-expiry", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def _run(self):
+        while not self._stop.wait(self.tick):
+            self.expire()
+    
+    def _tick_of(self, seconds: float) -> int:
+        return int(seconds / self.tick)
+    
+    def _deadline(self, ttl: float) -> int:
+        # Round up so a lease never expires before its TTL has passed
+        return math.ceil((self.clock() + ttl) / self.tick)
+    
+    def _release(self, leases: List[Lease]):
+        # Sum per process, capped at what it still holds (it may have
+        # released or been removed since the grant)
+        releases: Dict[int, Dict[str, int]] = {}
+        for lease in leases:
+            process = self.banker.processes.get(lease.pid)
+            if process is None:
+                continue
+            amounts = releases.setdefault(lease.pid, {})
+            for resource, amount in lease.amounts.items():
+                amounts[resource] = min(
+                    amounts.get(resource, 0) + amount,
+                    process.allocated.get(resource, 0)
+                )
+        releases = {pid: amounts for pid, amounts in releases.items() if any(amounts.values())}
+        if releases:
+            self.banker.release_many(releases)
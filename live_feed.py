@@ -0,0 +1,238 @@
+"""
+Live event feed for Banker's Algorithm
+Streams add/request/release events from a JSONL trace file or a local
+Unix socket and applies them to a banker in batches on a worker thread
+"""
+
+import json
+import os
+import socket
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+from bankers_algorithm import BankersAlgorithm, AllocationStatus
+
+
+def parse_event(line: str) -> Optional[Dict]:
+    """Parse one JSONL line into an event dict (None for blank or bad lines)"""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(event, dict) or 'op' not in event:
+        return None
+    return event
+
+
+def _amounts(value) -> Dict[str, int]:
+    if not isinstance(value, dict) or not all(isinstance(amount, int) for amount in value.values()):
+        raise TypeError(f"Expected a resource -> integer mapping, got {value!r}")
+    return value
+
+
+def apply_event(banker: Optional[BankersAlgorithm], event: Dict) -> Tuple[Optional[BankersAlgorithm], bool]:
+    """
+    Apply a single event to a banker
+    
+    Supported events:
+        {"op": "init", "resources": {...}}
+        {"op": "add", "pid": 1, "max_claim": {...}}
+        {"op": "request", "pid": 1, "request": {...}}
+        {"op": "release", "pid": 1}
+        {"op": "release", "pid": 1, "amounts": {...}}
+        {"op": "remove", "pid": 1}
+    
+    Returns:
+        Tuple of (banker, ok) - an "init" event returns a fresh banker
+    """
+    op = event.get('op')
+    
+    try:
+        if op == 'init':
+            return BankersAlgorithm(_amounts(event['resources'])), True
+    except (KeyError, TypeError):
+        return banker, False
+    
+    if banker is None:
+        return banker, False
+    
+    pid = event.get('pid')
+    try:
+        if op == 'add':
+            banker.add_process(pid, _amounts(event['max_claim']))
+        elif op == 'request':
+            status, _ = banker.request_resources(pid, _amounts(event['request']))
+            return banker, status == AllocationStatus.GRANTED
+        elif op == 'release':
+            if 'amounts' in event:
+                banker.release(pid, _amounts(event['amounts']))
+            else:
+                return banker, banker.release_resources(pid)
+        elif op == 'remove':
+            banker.remove_process(pid)
+        else:
+            return banker, False
+    except (KeyError, TypeError, AttributeError, ValueError):
+        # A malformed event is rejected; the feed keeps going
+        return banker, False
+    
+    return banker, True
+
+
+def tail_jsonl(path: str, stop: threading.Event, poll_interval: float = 0.05,
+               from_start: bool = True) -> Iterator[List[str]]:
+    """
+    Tail a JSONL file, yielding every complete line written so far as one chunk
+    
+    Args:
+        path: File to follow
+        stop: Event that ends the generator when set
+        poll_interval: Seconds to sleep when no new data is available
+        from_start: Replay existing content before following new writes
+    """
+    while not os.path.exists(path):
+        if stop.wait(poll_interval):
+            return
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        partial = ''
+        while not stop.is_set():
+            data = f.read(1 << 20)
+            if not data:
+                stop.wait(poll_interval)
+                continue
+            
+            data = partial + data
+            lines = data.split('\n')
+            partial = lines.pop()
+            if lines:
+                yield lines
+
+
+def read_unix_socket(path: str, stop: threading.Event, poll_interval: float = 0.2) -> Iterator[List[str]]:
+    """
+    Read JSONL events from a local Unix socket, reconnecting if the peer goes away
+    
+    Args:
+        path: Socket path exposed by the running system
+        stop: Event that ends the generator when set
+        poll_interval: Seconds between connection attempts
+    """
+    while not stop.is_set():
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(path)
+        except OSError:
+            sock.close()
+            stop.wait(poll_interval)
+            continue
+        
+        sock.settimeout(poll_interval)
+        partial = b''
+        try:
+            while not stop.is_set():
+                try:
+                    data = sock.recv(1 << 16)
+                except socket.timeout:
+                    continue
+                if not data:
+                    break
+                
+                data = partial + data
+                lines = data.split(b'\n')
+                partial = lines.pop()
+                if lines:
+                    yield [line.decode('utf-8', 'replace') for line in lines]
+        except OSError:
+            pass
+        finally:
+            sock.close()
+
+
+class LiveFeed:
+    """Apply a stream of events to a banker on a background worker thread"""
+    
+    def __init__(self, banker: Optional[BankersAlgorithm], source: str, path: str,
+                 batch_size: int = 5000, lock: Optional[threading.RLock] = None):
+        """
+        Initialize the live feed
+        
+        Args:
+            banker: Banker to drive (replaced if the stream sends an "init" event)
+            source: "file" to tail a JSONL trace or "socket" for a Unix socket
+            path: Trace file or socket path
+            batch_size: Maximum events applied per lock acquisition
+            lock: Lock shared with readers of the banker (e.g. the GUI)
+        """
+        if source not in ('file', 'socket'):
+            raise ValueError(f"Unknown live feed source: {source}")
+        
+        self.banker = banker
+        self.source = source
+        self.path = path
+        self.batch_size = batch_size
+        self.lock = lock or threading.RLock()
+        
+        self.applied = 0
+        self.rejected = 0
+        self.error: Optional[str] = None
+        self._seen = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start consuming events"""
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="live-feed", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 1.0):
+        """Stop consuming events and wait for the worker to exit"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def consume_changes(self) -> bool:
+        """Return True if events were applied since the last call"""
+        total = self.applied + self.rejected
+        changed = total != self._seen
+        self._seen = total
+        return changed
+    
+    def _chunks(self) -> Iterator[List[str]]:
+        if self.source == 'file':
+            return tail_jsonl(self.path, self._stop)
+        return read_unix_socket(self.path, self._stop)
+    
+    def _run(self):
+        try:
+            for lines in self._chunks():
+                events = [e for e in map(parse_event, lines) if e is not None]
+                for start in range(0, len(events), self.batch_size):
+                    self._apply_batch(events[start:start + self.batch_size])
+        except Exception as e:
+            self.error = str(e)
+    
+    def _apply_batch(self, events: List[Dict]):
+        applied = rejected = 0
+        with self.lock:
+            banker = self.banker
+            for event in events:
+                banker, ok = apply_event(banker, event)
+                if ok:
+                    applied += 1
+                else:
+                    rejected += 1
+            self.banker = banker
+            self.applied += applied
+            self.rejected += rejected
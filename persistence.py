@@ -0,0 +1,269 @@
+"""
+SQLite persistence for Banker's Algorithm
+Mirrors resources and process rows into a WAL-mode database. The in-memory
+banker stays authoritative; changes are committed in batches every N
+operations or T seconds, and startup rebuilds the banker with one bulk read.
+"""
+
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+from bankers_algorithm import BankersAlgorithm
+from checkpoints import restore_snapshot
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resources (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    available INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS process_resources (
+    pid INTEGER NOT NULL,
+    resource TEXT NOT NULL,
+    max_claim INTEGER NOT NULL,
+    allocated INTEGER NOT NULL,
+    PRIMARY KEY (pid, resource)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class SQLiteStore:
+    """Write-behind SQLite store for a banker"""
+    
+    def __init__(self, path: str, flush_every: int = 256, flush_interval: float = 0.05):
+        """
+        Args:
+            path: Database file
+            flush_every: Commit once this many operations are pending
+            flush_interval: Commit pending operations at least this often (seconds)
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        
+        self.banker: Optional[BankersAlgorithm] = None
+        self.commits = 0
+        self.operations = 0
+        
+        # Latest row values captured on the mutating thread, keyed by pid
+        # (None marks a removed process)
+        self._dirty: Dict[int, Optional[Tuple[Dict[str, int], Dict[str, int]]]] = {}
+        self._removed = set()
+        self._available: Optional[Dict[str, int]] = None
+        # Full resources table after a capacity or resource-type change
+        self._resources: Optional[List[Tuple[str, int, int, int]]] = None
+        self._dropped = set()
+        self._version = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+    
+    def load(self) -> Optional[BankersAlgorithm]:
+        """
+        Rebuild a banker from the database
+        
+        Returns:
+            The stored banker, or None if the database is empty
+        """
+        resources = self.conn.execute(
+            "SELECT name, total, available FROM resources ORDER BY position"
+        ).fetchall()
+        if not resources:
+            return None
+        names = tuple(r[0] for r in resources)
+        index = {name: i for i, name in enumerate(names)}
+        
+        processes: Dict[int, Tuple[List[int], List[int]]] = {}
+        for pid, resource, max_claim, allocated in self.conn.execute(
+            "SELECT pid, resource, max_claim, allocated FROM process_resources ORDER BY pid"
+        ):
+            row = processes.get(pid)
+            if row is None:
+                row = processes[pid] = ([0] * len(names), [0] * len(names))
+            row[0][index[resource]] = max_claim
+            row[1][index[resource]] = allocated
+        
+        banker = restore_snapshot((
+            names,
+            tuple(r[1] for r in resources),
+            tuple(r[2] for r in resources),
+            tuple((pid, tuple(claim), tuple(alloc)) for pid, (claim, alloc) in processes.items())
+        ))
+        version = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        banker.version = version[0] if version else 0
+        return banker
+    
+    def attach(self, banker: BankersAlgorithm):
+        """Write the banker's full state and persist its changes from now on"""
+        with self._lock:
+            self.conn.execute("BEGIN")
+            self.conn.execute("DELETE FROM resources")
+            self.conn.execute("DELETE FROM process_resources")
+            self.conn.executemany(
+                "INSERT INTO resources VALUES (?, ?, ?, ?)",
+                [
+                    (name, i, total, banker.available.get(name, 0))
+                    for i, (name, total) in enumerate(banker.total_resources.items())
+                ]
+            )
+            self.conn.executemany(
+                "INSERT INTO process_resources VALUES (?, ?, ?, ?)",
+                [
+                    (pid, name, amount, proc.allocated.get(name, 0))
+                    for pid, proc in banker.processes.items()
+                    for name, amount in proc.max_claim.items()
+                ]
+            )
+            self._write_version(banker.version)
+            self.conn.execute("COMMIT")
+            self.commits += 1
+        
+        self.banker = banker
+        banker.subscribe(self._on_entry)
+        self._flusher = threading.Thread(target=self._flush_loop, name="sqlite-flush", daemon=True)
+        self._flusher.start()
+    
+    def flush(self):
+        """Commit all pending changes in one transaction"""
+        with self._lock:
+            if not self._pending:
+                return
+            dirty, self._dirty = self._dirty, {}
+            removed, self._removed = self._removed, set()
+            available, self._available = self._available, None
+            resources, self._resources = self._resources, None
+            dropped, self._dropped = self._dropped, set()
+            
+            self.conn.execute("BEGIN")
+            if removed:
+                self.conn.executemany("DELETE FROM process_resources WHERE pid = ?", [(pid,) for pid in removed])
+            if dropped:
+                self.conn.executemany("DELETE FROM process_resources WHERE resource = ?", [(name,) for name in dropped])
+            if resources is not None:
+                self.conn.execute("DELETE FROM resources")
+                self.conn.executemany("INSERT INTO resources VALUES (?, ?, ?, ?)", resources)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO process_resources VALUES (?, ?, ?, ?)",
+                [
+                    (pid, name, amount, allocated.get(name, 0))
+                    for pid, row in dirty.items() if row is not None
+                    for max_claim, allocated in (row,)
+                    for name, amount in max_claim.items()
+                ]
+            )
+            if available is not None:
+                self.conn.executemany(
+                    "UPDATE resources SET available = ? WHERE name = ?",
+                    [(amount, name) for name, amount in available.items()]
+                )
+            self._write_version(self._version)
+            self.conn.execute("COMMIT")
+            
+            self.commits += 1
+            self.operations += self._pending
+            self._pending = 0
+    
+    def close(self):
+        """Flush, stop persisting and close the database"""
+        self._stop.set()
+        if self._flusher:
+            self._flusher.join()
+        if self.banker is not None:
+            self.banker.unsubscribe(self._on_entry)
+        self.flush()
+        self.conn.close()
+    
+    def __enter__(self) -> 'SQLiteStore':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _write_version(self, version: int):
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+    
+    def _on_entry(self, entry: Dict):
+        banker = self.banker
+        action = entry['action']
+        if action in ('capacity', 'add_resource', 'remove_resource'):
+            with self._lock:
+                self._on_resource_entry(entry)
+                full = self._pending >= self.flush_every
+            if full:
+                self.flush()
+            return
+        if action == 'add_many':
+            with self._lock:
+                for pid in entry['pids']:
+                    process = banker.processes[pid]
+                    self._dirty[pid] = (dict(process.max_claim), dict(process.allocated))
+                self._available = dict(banker.available)
+                self._version = banker.version
+                self._pending += 1
+                full = self._pending >= self.flush_every
+            if full:
+                self.flush()
+            return
+        pid = entry['pid']
+        with self._lock:
+            if action == 'remove':
+                self._dirty[pid] = None
+                self._removed.add(pid)
+            else:
+                process = banker.processes[pid]
+                self._dirty[pid] = (dict(process.max_claim), dict(process.allocated))
+            if action != 'add':
+                self._available = dict(banker.available)
+            self._version = banker.version
+            self._pending += 1
+            full = self._pending >= self.flush_every
+        if full:
+            self.flush()
+    
+    def _on_resource_entry(self, entry: Dict):
+        banker = self.banker
+        resource = entry['resource']
+        if entry['action'] == 'remove_resource':
+            self._dropped.add(resource)
+            # Rows captured earlier in this batch must not bring it back
+            for row in self._dirty.values():
+                if row is not None:
+                    row[0].pop(resource, None)
+        # A re-added resource keeps its drop: the stored rows still hold the
+        # old claims, and rows captured after the re-add are written after it
+        self._resources = [
+            (name, i, total, banker.available.get(name, 0))
+            for i, (name, total) in enumerate(banker.total_resources.items())
+        ]
+        self._available = dict(banker.available)
+        self._version = banker.version
+        self._pending += 1
+    
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+def open_banker(path: str, resources: Dict[str, int], **options) -> Tuple[BankersAlgorithm, SQLiteStore]:
+    """
+    Load the banker stored at `path`, or create one with `resources`
+    
+    Returns:
+        Tuple of (banker, store); close the store on shutdown
+    """
+    store = SQLiteStore(path, **options)
+    banker = store.load() or BankersAlgorithm(resources)
+    store.attach(banker)
+    return banker, store
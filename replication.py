@@ -0,0 +1,449 @@
+"""
+Leader/follower replication for Banker's Algorithm
+The leader ships every committed history entry over a local socket;
+followers bootstrap from a snapshot, apply entries in order and serve
+read-only queries (get_system_state, is_safe, explore_what_if)
+
+Run a leader:   python replication.py leader --unix /tmp/banker-repl.sock
+Run a follower: python replication.py follower --unix /tmp/banker-repl.sock
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple, Union
+from bankers_algorithm import BankersAlgorithm
+from checkpoints import apply_entry, restore_snapshot, take_snapshot
+
+
+Address = Union[str, Tuple[str, int]]
+
+
+def _family(address: Address) -> int:
+    return socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+
+
+def _encode(message: Dict) -> bytes:
+    return json.dumps(message, separators=(',', ':')).encode() + b'\n'
+
+
+class _FollowerLink:
+    """Leader-side connection to one follower"""
+    
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.outbox: "queue.Queue[Optional[bytes]]" = queue.Queue()
+
+
+class ReplicationLeader:
+    """Stream a banker's committed mutations to followers"""
+    
+    def __init__(self, banker: BankersAlgorithm, address: Address, journal_size: int = 10000,
+                 heartbeat_interval: float = 0.5, lock: Optional[threading.RLock] = None):
+        """
+        Args:
+            banker: Authoritative banker (mutate it while holding `lock`)
+            address: Unix socket path or (host, port) to listen on
+            journal_size: Recent entries kept so reconnecting followers can catch up without a snapshot
+            heartbeat_interval: Seconds between heartbeats on idle links
+            lock: Lock serializing banker mutations with snapshotting
+        """
+        self.banker = banker
+        self.address = address
+        self.heartbeat_interval = heartbeat_interval
+        self.lock = lock or threading.RLock()
+        
+        self.journal: "deque[Tuple[int, bytes]]" = deque(maxlen=journal_size)
+        self.links: List[_FollowerLink] = []
+        self.snapshots_sent = 0
+        self.last_commit_ts = time.time()
+        
+        self._stop = threading.Event()
+        self._listener: Optional[socket.socket] = None
+        self._threads: List[threading.Thread] = []
+    
+    @property
+    def seq(self) -> int:
+        return self.banker.version
+    
+    def start(self) -> 'ReplicationLeader':
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+        self._listener = socket.socket(_family(self.address), socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(self.address)
+        self._listener.listen()
+        self._listener.settimeout(0.2)
+        if not isinstance(self.address, str):
+            self.address = self._listener.getsockname()
+        
+        self.banker.subscribe(self._on_entry)
+        self._spawn(self._accept_loop, "repl-accept")
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        self.banker.unsubscribe(self._on_entry)
+        with self.lock:
+            for link in self.links:
+                link.outbox.put(None)
+        for thread in self._threads:
+            thread.join(1)
+        if self._listener:
+            self._listener.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+    
+    def __enter__(self) -> 'ReplicationLeader':
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def _spawn(self, target, name, *args):
+        thread = threading.Thread(target=target, name=name, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+    
+    def _on_entry(self, entry: Dict):
+        seq = self.banker.version
+        ts = time.time()
+        line = _encode({'type': 'entry', 'seq': seq, 'ts': ts, 'entry': entry})
+        with self.lock:
+            self.last_commit_ts = ts
+            self.journal.append((seq, line))
+            for link in self.links:
+                link.outbox.put(line)
+    
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                sock, _ = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            self._spawn(self._serve_follower, "repl-link", sock)
+    
+    def _serve_follower(self, sock: socket.socket):
+        sock.settimeout(5)
+        try:
+            hello = json.loads(sock.makefile('rb').readline() or b'{}')
+        except (OSError, ValueError):
+            sock.close()
+            return
+        sock.settimeout(None)
+        from_seq = int(hello.get('from_seq', -1))
+        
+        link = _FollowerLink(sock)
+        with self.lock:
+            oldest = self.journal[0][0] if self.journal else self.seq + 1
+            if 0 <= from_seq <= self.seq and from_seq >= oldest - 1:
+                # Catch up from the journal
+                for seq, line in self.journal:
+                    if seq > from_seq:
+                        link.outbox.put(line)
+            else:
+                link.outbox.put(_encode({
+                    'type': 'snapshot',
+                    'seq': self.seq,
+                    'ts': time.time(),
+                    'snapshot': take_snapshot(self.banker)
+                }))
+                self.snapshots_sent += 1
+            self.links.append(link)
+        
+        try:
+            self._send_loop(link)
+        finally:
+            with self.lock:
+                if link in self.links:
+                    self.links.remove(link)
+            sock.close()
+    
+    def _send_loop(self, link: _FollowerLink):
+        while not self._stop.is_set():
+            try:
+                line = link.outbox.get(timeout=self.heartbeat_interval)
+            except queue.Empty:
+                line = None
+                heartbeat = True
+            else:
+                heartbeat = False
+                if line is None:
+                    return
+            
+            # Every write starts with where the leader is now, so followers
+            # can tell how far behind what they have received leaves them
+            head = _encode({
+                'type': 'heartbeat' if heartbeat else 'head',
+                'seq': self.seq,
+                'ts': time.time(),
+                'commit_ts': self.last_commit_ts
+            })
+            chunks = [head] if heartbeat else [head, line]
+            closing = False
+            while True:
+                try:
+                    more = link.outbox.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    closing = True
+                    break
+                chunks.append(more)
+            try:
+                link.sock.sendall(b''.join(chunks))
+            except OSError:
+                return
+            if closing:
+                return
+
+
+class ReplicationFollower:
+    """Read-only replica kept up to date from a leader"""
+    
+    def __init__(self, address: Address, reconnect_interval: float = 0.2):
+        """
+        Args:
+            address: Leader's Unix socket path or (host, port)
+            reconnect_interval: Seconds between connection attempts
+        """
+        self.address = address
+        self.reconnect_interval = reconnect_interval
+        self.lock = threading.RLock()
+        
+        self.banker: Optional[BankersAlgorithm] = None
+        self.applied_seq = -1
+        self.leader_seq = -1
+        self.leader_commit_ts = 0.0
+        self.last_commit_ts = 0.0
+        self.last_message_ts = 0.0
+        # (seq, commit time) of entries received but not applied yet
+        self.unapplied: "deque[Tuple[int, float]]" = deque()
+        self.snapshots_loaded = 0
+        self.entries_applied = 0
+        
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> 'ReplicationFollower':
+        self._thread = threading.Thread(target=self._run, name="repl-follower", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(1)
+    
+    def __enter__(self) -> 'ReplicationFollower':
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the first snapshot has been loaded"""
+        return self._ready.wait(timeout)
+    
+    def wait_for_seq(self, seq: int, timeout: float = 5.0) -> bool:
+        """Wait until entries up to `seq` have been applied"""
+        deadline = time.time() + timeout
+        while self.applied_seq < seq:
+            if time.time() > deadline:
+                return False
+            time.sleep(0.005)
+        return True
+    
+    def lag(self) -> Dict:
+        """
+        Replication lag metrics
+        
+        The leader stamps its seq and last commit time on every write, and
+        both are recorded as soon as data arrives, before it is applied.
+        
+        Returns:
+            entries: Leader entries not applied yet
+            seconds: Age of the oldest unapplied commit (0 when caught up);
+                when no unapplied entry has arrived yet, the age of the
+                leader's latest commit
+            since_last_message: Seconds since anything arrived from the leader
+        """
+        now = time.time()
+        behind = max(0, self.leader_seq - self.applied_seq)
+        seconds = 0.0
+        if behind:
+            try:
+                oldest = self.unapplied[0][1]
+            except IndexError:
+                oldest = self.leader_commit_ts
+            seconds = max(0.0, now - oldest)
+        return {
+            'entries': behind,
+            'seconds': seconds,
+            'since_last_message': now - self.last_message_ts if self.last_message_ts else None,
+            'applied_seq': self.applied_seq,
+            'leader_seq': self.leader_seq
+        }
+    
+    # Read-only queries
+    
+    def get_system_state(self) -> Dict:
+        with self.lock:
+            self._require_ready()
+            return self.banker.get_system_state()
+    
+    def is_safe(self) -> bool:
+        with self.lock:
+            self._require_ready()
+            return self.banker.is_safe()
+    
+    def get_safe_sequence(self) -> List[int]:
+        with self.lock:
+            self._require_ready()
+            return self.banker.get_safe_sequence()
+    
+    def explore_what_if(self, pid: int, request: Dict[str, int]) -> Dict:
+        with self.lock:
+            self._require_ready()
+            return self.banker.explore_what_if(pid, request)
+    
+    def _require_ready(self):
+        if self.banker is None:
+            raise RuntimeError("Follower has not received a snapshot yet")
+    
+    # Replication stream
+    
+    def _run(self):
+        while not self._stop.is_set():
+            sock = socket.socket(_family(self.address), socket.SOCK_STREAM)
+            try:
+                sock.connect(self.address)
+            except OSError:
+                sock.close()
+                self._stop.wait(self.reconnect_interval)
+                continue
+            
+            try:
+                sock.sendall(_encode({'from_seq': self.applied_seq if self.banker else -1}))
+                sock.settimeout(0.5)
+                self._read_stream(sock)
+            except OSError:
+                pass
+            finally:
+                sock.close()
+    
+    def _read_stream(self, sock: socket.socket):
+        partial = b''
+        while not self._stop.is_set():
+            try:
+                data = sock.recv(1 << 16)
+            except socket.timeout:
+                continue
+            if not data:
+                return
+            
+            lines = (partial + data).split(b'\n')
+            partial = lines.pop()
+            messages = [json.loads(line) for line in lines]
+            for message in messages:
+                self._receive(message)
+            with self.lock:
+                for message in messages:
+                    if not self._handle(message):
+                        # Gap in the stream - reconnect and resync
+                        self.unapplied.clear()
+                        return
+    
+    def _receive(self, message: Dict):
+        """Note what arrived for lag(), before waiting to apply it"""
+        self.last_message_ts = time.time()
+        self.leader_seq = max(self.leader_seq, message['seq'])
+        if 'commit_ts' in message:
+            self.leader_commit_ts = message['commit_ts']
+        if message['type'] == 'entry' and message['seq'] > self.applied_seq:
+            self.unapplied.append((message['seq'], message['ts']))
+    
+    def _handle(self, message: Dict) -> bool:
+        seq = message['seq']
+        kind = message['type']
+        
+        if kind == 'snapshot':
+            self.banker = restore_snapshot(message['snapshot'])
+            self.banker.version = seq
+            self.applied_seq = seq
+            self.last_commit_ts = message['ts']
+            self.snapshots_loaded += 1
+            self._ready.set()
+            self._drop_unapplied()
+        elif kind == 'entry':
+            if seq <= self.applied_seq:
+                self._drop_unapplied()
+                return True
+            if self.banker is None or seq != self.applied_seq + 1:
+                return False
+            apply_entry(self.banker, message['entry'])
+            self.banker.version = seq
+            self.applied_seq = seq
+            self.last_commit_ts = message['ts']
+            self.entries_applied += 1
+            self._drop_unapplied()
+        return True
+    
+    def _drop_unapplied(self):
+        unapplied = self.unapplied
+        while unapplied and unapplied[0][0] <= self.applied_seq:
+            unapplied.popleft()
+
+
+def _address(args) -> Address:
+    return args.unix if args.unix else ('127.0.0.1', args.port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banker's Algorithm replication")
+    parser.add_argument('role', choices=['leader', 'follower'])
+    parser.add_argument('--unix', help="Unix socket path")
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--resources', default='CPU=10,Memory=20,Disk=15')
+    args = parser.parse_args(argv)
+    
+    if args.role == 'leader':
+        from live_feed import apply_event, parse_event
+        from server import parse_resources
+        
+        banker = BankersAlgorithm(parse_resources(args.resources))
+        leader = ReplicationLeader(banker, _address(args)).start()
+        print(f"Leader listening on {leader.address}; reading JSONL events from stdin")
+        try:
+            for line in sys.stdin:
+                event = parse_event(line)
+                if event and event['op'] != 'init':
+                    with leader.lock:
+                        apply_event(banker, event)
+        except KeyboardInterrupt:
+            pass
+        leader.stop()
+    else:
+        follower = ReplicationFollower(_address(args)).start()
+        try:
+            while True:
+                time.sleep(1)
+                if follower.banker is not None:
+                    lag = follower.lag()
+                    print(f"seq={lag['applied_seq']} lag={lag['entries']} entries "
+                          f"safe={follower.is_safe()}")
+        except KeyboardInterrupt:
+            follower.stop()
+
+
+if __name__ == '__main__':
+    main()
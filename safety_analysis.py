@@ -0,0 +1,295 @@
+"""
+Safe sequence analysis for Banker's Algorithm
+Counts and enumerates every safe ordering of the processes as a measure of
+scheduling slack, exactly by dynamic programming over finished-process sets
+or, for larger systems, by sampling within a time budget
+"""
+
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from bankers_algorithm import BankersAlgorithm
+from whatif_engine import is_safe_vectors
+
+
+@dataclass
+class SequenceCount:
+    """Number of safe sequences, exact or estimated"""
+    count: float  # an int when exact
+    exact: bool
+    states: int = 0
+    samples: int = 0
+    std_error: float = 0.0
+
+
+def _vectors(banker: BankersAlgorithm) -> Tuple[List[int], List[List[int]], List[List[int]], List[int]]:
+    """Return (available, allocated, needed, pids) in resource order"""
+    resources = list(banker.total_resources)
+    pids = list(banker.processes)
+    available = [banker.available.get(r, 0) for r in resources]
+    allocated = [[banker.processes[pid].allocated.get(r, 0) for r in resources] for pid in pids]
+    needed = [[banker.processes[pid].needed.get(r, 0) for r in resources] for pid in pids]
+    return available, allocated, needed, pids
+
+
+def _runnable(work: List[int], needed: List[List[int]], remaining: List[int]) -> List[int]:
+    m = len(work)
+    return [i for i in remaining if all(needed[i][r] <= work[r] for r in range(m))]
+
+
+def iter_safe_sequences(banker: BankersAlgorithm) -> Iterator[List[int]]:
+    """
+    Lazily yield every safe sequence of process IDs
+    
+    Work only grows as processes finish, so from a safe state every partial
+    order can be completed: the search never backtracks out of a dead end
+    and each sequence costs O(n^2 m) to produce.
+    """
+    available, allocated, needed, pids = _vectors(banker)
+    if not is_safe_vectors(available, allocated, needed):
+        return
+    
+    m = len(available)
+    order: List[int] = []
+    
+    def extend(work: List[int], remaining: List[int]) -> Iterator[List[int]]:
+        if not remaining:
+            yield [pids[i] for i in order]
+            return
+        for i in _runnable(work, needed, remaining):
+            order.append(i)
+            alloc = allocated[i]
+            yield from extend([work[r] + alloc[r] for r in range(m)], [j for j in remaining if j != i])
+            order.pop()
+    
+    yield from extend(available, list(range(len(pids))))
+
+
+def count_safe_sequences(banker: BankersAlgorithm, time_budget: float = 1.0, exact_limit: int = 24,
+                         seed: Optional[int] = None) -> SequenceCount:
+    """
+    Count the safe sequences of the current state
+    
+    The work vector depends only on which processes have finished, so the
+    count is a DP over finished-process bitmasks (memoized, at most 2^n
+    states). Systems with more than `exact_limit` processes, or where the DP
+    runs out of `time_budget`, get a sampled estimate instead.
+    
+    Args:
+        banker: Banker to analyze (not modified)
+        time_budget: Seconds to spend in total
+        exact_limit: Largest process count attempted exactly
+        seed: Seed for the sampling fallback
+    """
+    deadline = time.perf_counter() + time_budget
+    available, allocated, needed, pids = _vectors(banker)
+    if not is_safe_vectors(available, allocated, needed):
+        return SequenceCount(0, True)
+    
+    if len(pids) <= exact_limit:
+        result = _count_exact(available, allocated, needed, deadline)
+        if result is not None:
+            return result
+    return estimate_safe_sequences(banker, max(deadline - time.perf_counter(), 0.0), seed=seed)
+
+
+def _count_exact(available: List[int], allocated: List[List[int]], needed: List[List[int]],
+                 deadline: float) -> Optional[SequenceCount]:
+    """Bitmask DP; returns None if the deadline passes first"""
+    n, m = len(allocated), len(available)
+    full = (1 << n) - 1
+    memo: Dict[int, int] = {full: 1}
+    
+    def count(mask: int, work: List[int]) -> int:
+        cached = memo.get(mask)
+        if cached is not None:
+            return cached
+        if len(memo) & 1023 == 0 and time.perf_counter() > deadline:
+            raise TimeoutError
+        total = 0
+        for i in range(n):
+            if mask >> i & 1:
+                continue
+            need = needed[i]
+            if all(need[r] <= work[r] for r in range(m)):
+                alloc = allocated[i]
+                total += count(mask | 1 << i, [work[r] + alloc[r] for r in range(m)])
+        memo[mask] = total
+        return total
+    
+    try:
+        total = count(0, list(available))
+    except TimeoutError:
+        return None
+    return SequenceCount(total, True, states=len(memo))
+
+
+def estimate_safe_sequences(banker: BankersAlgorithm, time_budget: float = 1.0,
+                            samples: Optional[int] = None, seed: Optional[int] = None) -> SequenceCount:
+    """
+    Estimate the number of safe sequences by random walks
+    
+    Each walk finishes a uniformly chosen runnable process at every step and
+    multiplies the branching factors along the way, which is an unbiased
+    estimate of the number of complete orderings (Knuth's estimator).
+    Counts can exceed float range for very large systems and then report inf.
+    
+    Args:
+        banker: Banker to analyze (not modified)
+        time_budget: Seconds to sample for
+        samples: Stop after this many walks even if time is left
+        seed: Random seed
+    """
+    deadline = time.perf_counter() + time_budget
+    available, allocated, needed, pids = _vectors(banker)
+    if not is_safe_vectors(available, allocated, needed):
+        return SequenceCount(0, True)
+    
+    rng = random.Random(seed)
+    m = len(available)
+    total = total_sq = 0.0
+    walks = 0
+    while samples is None or walks < samples:
+        work = list(available)
+        remaining = list(range(len(pids)))
+        estimate = 1.0
+        while remaining:
+            runnable = _runnable(work, needed, remaining)
+            estimate *= len(runnable)
+            i = rng.choice(runnable)
+            alloc = allocated[i]
+            for r in range(m):
+                work[r] += alloc[r]
+            remaining.remove(i)
+        total += estimate
+        total_sq += estimate * estimate
+        walks += 1
+        if time.perf_counter() > deadline:
+            break
+    
+    mean = total / walks
+    variance = max(total_sq / walks - mean * mean, 0.0) if walks > 1 else 0.0
+    return SequenceCount(mean, False, samples=walks, std_error=math.sqrt(variance / walks))
+
+
+@dataclass
+class PreemptionPlan:
+    """Allocations to revoke so the state becomes safe again"""
+    victims: List[int]
+    revoked: Dict[int, Dict[str, int]]
+    safe_sequence: List[int]
+    evaluated: int = 0
+    complete: bool = True  # False if the time budget cut the search short
+
+
+def _finish(work: List[int], allocated: List[List[int]], needed: List[List[int]],
+            remaining: List[int]) -> Tuple[List[int], List[int], List[int]]:
+    """Finish processes from `remaining` while any can; returns (order, work, still stuck)"""
+    work = list(work)
+    remaining = list(remaining)
+    order = []
+    progress = True
+    while remaining and progress:
+        progress = False
+        for i in _runnable(work, needed, remaining):
+            alloc = allocated[i]
+            for r in range(len(work)):
+                work[r] += alloc[r]
+            order.append(i)
+            remaining.remove(i)
+            progress = True
+    return order, work, remaining
+
+
+def preemption_plan(banker: BankersAlgorithm, time_budget: float = 0.05) -> PreemptionPlan:
+    """
+    Choose processes to roll back (revoke their whole allocation) until the
+    state is safe
+    
+    Only processes that are stuck when the safety search stops are
+    candidates: the others finish and return their allocation anyway.
+    Each round rolls back the candidate that lets the most processes finish
+    (ties: the smallest allocation); then victims that turn out unnecessary
+    are restored. When the budget runs out, candidates are no longer
+    evaluated and the largest holder is taken instead, so a plan is always
+    returned. Apply it with banker.release_many(plan.revoked); an empty
+    safe_sequence means no rollback can make the state safe.
+    
+    Args:
+        banker: Banker to analyze (not modified)
+        time_budget: Seconds to spend evaluating candidates
+    """
+    deadline = time.perf_counter() + time_budget
+    available, allocated, needed, pids = _vectors(banker)
+    allocated = [list(row) for row in allocated]
+    needed = [list(row) for row in needed]
+    original = [list(row) for row in allocated]
+    free = list(available)
+    m = len(available)
+    
+    def roll_back(i: int):
+        for r in range(m):
+            free[r] += allocated[i][r]
+            needed[i][r] += allocated[i][r]
+            allocated[i][r] = 0
+    
+    _, work, stuck = _finish(available, allocated, needed, range(len(pids)))
+    victims: List[int] = []
+    evaluated = 0
+    complete = True
+    while stuck:
+        # Rolling back a process that holds nothing frees nothing
+        candidates = [i for i in stuck if any(allocated[i])]
+        if not candidates:
+            break
+        best, best_score = None, None
+        for i in candidates:
+            if time.perf_counter() > deadline:
+                complete = False
+                break
+            # Evaluate as if rolled back: its allocation moves into work, so it holds nothing
+            saved_need, held = needed[i], allocated[i]
+            needed[i] = [saved_need[r] + held[r] for r in range(m)]
+            allocated[i] = [0] * m
+            finished, _, _ = _finish([work[r] + held[r] for r in range(m)], allocated, needed, stuck)
+            needed[i], allocated[i] = saved_need, held
+            evaluated += 1
+            score = (len(finished), -sum(held))
+            if best_score is None or score > best_score:
+                best, best_score = i, score
+        if best is None:
+            best = max(candidates, key=lambda i: sum(allocated[i]))
+        
+        work = [work[r] + allocated[best][r] for r in range(m)]
+        roll_back(best)
+        victims.append(best)
+        _, work, stuck = _finish(work, allocated, needed, stuck)
+    
+    # Restore victims the final plan does not need, latest first
+    for i in reversed(victims[:]):
+        if time.perf_counter() > deadline:
+            complete = False
+            break
+        for r in range(m):
+            free[r] -= original[i][r]
+            needed[i][r] -= original[i][r]
+        allocated[i] = list(original[i])
+        evaluated += 1
+        if _finish(free, allocated, needed, range(len(pids)))[2]:
+            roll_back(i)
+        else:
+            victims.remove(i)
+    
+    order, _, stuck = _finish(free, allocated, needed, range(len(pids)))
+    return PreemptionPlan(
+        victims=[pids[i] for i in victims],
+        revoked={
+            pids[i]: {r: amount for r, amount in banker.processes[pids[i]].allocated.items() if amount}
+            for i in victims
+        },
+        safe_sequence=[pids[i] for i in order] if not stuck else [],
+        evaluated=evaluated,
+        complete=complete
+    )
@@ -0,0 +1,222 @@
+"""
+Grant scheduling for Banker's Algorithm
+Decides in which order the banker's waiting requests are tried whenever
+resources come back. Policies are pluggable; candidates are decided
+together with request_resources_batch against one working state, and each
+scheduler keeps throughput and wait-time statistics so policies can be
+compared on the same workload.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from bankers_algorithm import AllocationStatus, BankersAlgorithm
+
+
+@dataclass
+class PendingRequest:
+    """A request waiting to be granted"""
+    pid: int
+    request: Dict[str, int]
+    submitted: float
+    priority: int = 0
+    seq: int = 0
+
+
+class SchedulingPolicy:
+    """Orders pending requests; lower keys are tried first"""
+    name = 'fifo'
+    
+    def key(self, item: PendingRequest, banker: BankersAlgorithm, now: float):
+        return item.seq
+
+
+class SmallestFirstPolicy(SchedulingPolicy):
+    """Smallest request first, so one large request cannot hold up many small ones"""
+    name = 'smallest-first'
+    
+    def key(self, item: PendingRequest, banker: BankersAlgorithm, now: float):
+        return sum(item.request.values()), item.seq
+
+
+class ShortestRemainingNeedPolicy(SchedulingPolicy):
+    """Process closest to its max claim first, since it finishes and releases soonest"""
+    name = 'shortest-remaining-need'
+    
+    def key(self, item: PendingRequest, banker: BankersAlgorithm, now: float):
+        return sum(banker.processes[item.pid].needed.values()), item.seq
+
+
+class PriorityAgingPolicy(SchedulingPolicy):
+    """Highest priority first; waiting raises priority by `aging_rate` per time unit"""
+    name = 'priority-aging'
+    
+    def __init__(self, aging_rate: float = 0.1):
+        self.aging_rate = aging_rate
+    
+    def key(self, item: PendingRequest, banker: BankersAlgorithm, now: float):
+        return -(item.priority + self.aging_rate * (now - item.submitted)), item.seq
+
+
+POLICIES: Dict[str, Callable[[], SchedulingPolicy]] = {
+    'fifo': SchedulingPolicy,
+    'smallest-first': SmallestFirstPolicy,
+    'shortest-remaining-need': ShortestRemainingNeedPolicy,
+    'priority-aging': PriorityAgingPolicy
+}
+
+
+def make_policy(policy: Union[str, SchedulingPolicy]) -> SchedulingPolicy:
+    if isinstance(policy, SchedulingPolicy):
+        return policy
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown scheduling policy: {policy}")
+    return POLICIES[policy]()
+
+
+class GrantScheduler:
+    """Grant the banker's waiting requests in policy order"""
+    
+    def __init__(self, banker: BankersAlgorithm, policy: Union[str, SchedulingPolicy] = 'fifo',
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            banker: Banker to schedule grants on; its `pending` queue is
+                retried through this scheduler from now on
+            policy: Policy name from POLICIES or a SchedulingPolicy instance
+            clock: Time source used for wait times and aging
+        """
+        self.banker = banker
+        self.policy = make_policy(policy)
+        self.clock = clock
+        self.started = clock()
+        # Scheduling data for the entries of banker.pending, keyed by id();
+        # the entry is kept with it so the id stays unique
+        self.waiting: Dict[int, Tuple[Tuple[int, Dict[str, int]], PendingRequest]] = {}
+        # Grants collected while release() or remove_process() runs
+        self._grants: Optional[List[PendingRequest]] = None
+        
+        self.granted = 0
+        self.granted_waiting = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.dispatches = 0
+        self.attempts = 0
+        self._seq = 0
+        banker.scheduler = self
+    
+    @property
+    def queue(self) -> List[PendingRequest]:
+        """The banker's waiting requests in arrival order"""
+        return [item for _, item in self._sync(self.clock())]
+    
+    def submit(self, pid: int, request: Dict[str, int], priority: int = 0) -> Tuple[AllocationStatus, str]:
+        """Request resources now; the banker queues the request if it has to wait"""
+        pending = self.banker.pending
+        queued = len(pending)
+        status, message = self.banker.submit_request(pid, request)
+        if status == AllocationStatus.GRANTED:
+            self.granted += 1
+        elif len(pending) > queued:
+            entry = pending[-1]
+            self.waiting[id(entry)] = (entry, self._item(entry, self.clock(), priority))
+        return status, message
+    
+    def release(self, pid: int, amounts: Optional[Dict[str, int]] = None) -> List[PendingRequest]:
+        """Release part (or all) of an allocation; returns the waiting requests it granted"""
+        self._grants = []
+        try:
+            if amounts is None:
+                self.banker.release_resources(pid)
+            else:
+                self.banker.release(pid, amounts)
+            return self._grants
+        finally:
+            self._grants = None
+    
+    def remove_process(self, pid: int) -> List[PendingRequest]:
+        """Remove a process and its waiting requests; returns the waiting requests it granted"""
+        self._grants = []
+        try:
+            self.banker.remove_process(pid)
+            return self._grants
+        finally:
+            self._grants = None
+    
+    def dispatch(self) -> List[PendingRequest]:
+        """
+        Try the banker's waiting requests in policy order
+        
+        The banker calls this whenever resources come back. Requests that fit
+        what is available are decided in one request_resources_batch call,
+        which validates each against what the earlier grants left over and
+        runs a single safety check when they are all safe together.
+        """
+        banker = self.banker
+        if not banker.pending:
+            return []
+        now = self.clock()
+        available = banker.available
+        candidates = sorted(
+            ((entry, item) for entry, item in self._sync(now)
+             if all(amount <= available.get(r, 0) for r, amount in item.request.items())),
+            key=lambda pair: self.policy.key(pair[1], banker, now)
+        )
+        if not candidates:
+            return []
+        
+        self.dispatches += 1
+        self.attempts += len(candidates)
+        results = banker.request_resources_batch([entry for entry, _ in candidates])
+        granted = []
+        done = set()
+        for (entry, item), (status, message) in zip(candidates, results):
+            if status == AllocationStatus.GRANTED:
+                granted.append(item)
+                done.add(id(entry))
+                wait = now - item.submitted
+                self.wait_total += wait
+                self.wait_max = max(self.wait_max, wait)
+            elif not banker.can_wait(message):
+                done.add(id(entry))
+        if done:
+            banker.pending = [entry for entry in banker.pending if id(entry) not in done]
+            for key in done:
+                del self.waiting[key]
+        self.granted += len(granted)
+        self.granted_waiting += len(granted)
+        if self._grants is not None:
+            self._grants.extend(granted)
+        return granted
+    
+    def _item(self, entry: Tuple[int, Dict[str, int]], now: float, priority: int = 0) -> PendingRequest:
+        item = PendingRequest(entry[0], entry[1], now, priority, self._seq)
+        self._seq += 1
+        return item
+    
+    def _sync(self, now: float) -> List[Tuple[Tuple[int, Dict[str, int]], PendingRequest]]:
+        """
+        Pair every entry of banker.pending with its scheduling data
+        
+        Entries the banker dropped (e.g. with their process) are forgotten;
+        entries queued on the banker directly start waiting now.
+        """
+        waiting = {}
+        for entry in self.banker.pending:
+            known = self.waiting.get(id(entry))
+            waiting[id(entry)] = known if known is not None else (entry, self._item(entry, now))
+        self.waiting = waiting
+        return list(waiting.values())
+    
+    def stats(self) -> Dict:
+        elapsed = self.clock() - self.started
+        return {
+            'policy': self.policy.name,
+            'granted': self.granted,
+            'queued': len(self.banker.pending),
+            'throughput': self.granted / elapsed if elapsed > 0 else 0.0,
+            'mean_wait': self.wait_total / self.granted_waiting if self.granted_waiting else 0.0,
+            'max_wait': self.wait_max,
+            'dispatches': self.dispatches,
+            'attempts': self.attempts
+        }
@@ -0,0 +1,378 @@
+"""
+HTTP/JSON service for Banker's Algorithm
+Serves one shared banker over localhost TCP or a Unix socket using asyncio,
+with keep-alive connections, pipelining and a batch endpoint
+
+Endpoints:
+    GET    /state               System state
+    POST   /processes           {"pid": 1, "max_claim": {...}}
+    DELETE /processes/<pid>     Remove a process
+    POST   /request             {"pid": 1, "request": {...}[, "request_id": "..."]}
+    POST   /release             {"pid": 1} or {"pid": 1, "amounts": {...}}
+    POST   /what-if             {"pid": 1, "request": {...}}
+    POST   /batch               {"operations": [{"op": "request", ...}, ...]}
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+from typing import Dict, List, Optional, Tuple
+from bankers_algorithm import BankersAlgorithm
+
+
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large"
+}
+
+MAX_BODY = 16 * 1024 * 1024
+
+
+def _amounts(value) -> Dict[str, int]:
+    """Check a resource -> amount mapping taken from a request body"""
+    if not isinstance(value, dict) or not all(
+            isinstance(amount, int) and not isinstance(amount, bool) and amount >= 0 for amount in value.values()):
+        raise TypeError(f"expected a resource -> non-negative integer mapping, got {value!r}")
+    return value
+
+
+def state_to_json(state: Dict) -> Dict:
+    """Make a get_system_state() result JSON friendly (pid keys become strings)"""
+    state = dict(state)
+    state['processes'] = {str(pid): proc for pid, proc in state['processes'].items()}
+    return state
+
+
+class BankerService:
+    """Execute JSON operations against a banker"""
+    
+    def __init__(self, banker: BankersAlgorithm):
+        self.banker = banker
+        self.requests_served = 0
+    
+    def execute(self, op: Dict) -> Tuple[int, Dict]:
+        """
+        Execute one operation
+        
+        Operations use the same shape as live feed events:
+        {"op": "add" | "remove" | "request" | "release" | "what-if" | "state", ...}
+        
+        Returns:
+            Tuple of (http status, payload)
+        """
+        kind = op.get('op')
+        if kind == 'state':
+            return 200, state_to_json(self.banker.get_system_state())
+        
+        try:
+            pid = int(op['pid'])
+        except (KeyError, TypeError, ValueError) as e:
+            return 400, {'error': f"Missing or invalid pid: {e}"}
+        
+        try:
+            if kind == 'add':
+                self.banker.add_process(pid, _amounts(op['max_claim']))
+                return 201, {'pid': pid}
+            if kind == 'remove':
+                self.banker.remove_process(pid)
+                return 200, {'pid': pid}
+            if kind == 'request':
+                status, message = self.banker.request_resources(pid, _amounts(op['request']), op.get('request_id'))
+                return 200, {'status': status.value, 'message': message}
+            if kind == 'release':
+                if 'amounts' in op:
+                    woken = self.banker.release(pid, _amounts(op['amounts']))
+                    return 200, {'released': True, 'woken': [[p, request] for p, request in woken]}
+                return 200, {'released': self.banker.release_resources(pid)}
+            if kind == 'what-if':
+                return 200, self.banker.explore_what_if(pid, _amounts(op['request']))
+        except ValueError as e:
+            status = 404 if 'not found' in str(e) else 409
+            return status, {'error': str(e)}
+        except (KeyError, TypeError, AttributeError) as e:
+            return 400, {'error': f"Missing or invalid field: {e}"}
+        
+        return 400, {'error': f"Unknown operation: {kind}"}
+    
+    def execute_batch(self, operations: List[Dict]) -> List[Dict]:
+        """
+        Execute operations in order
+        
+        Runs of consecutive "request" operations are decided together with
+        BankersAlgorithm.request_resources_batch (one safety check when they
+        all fit), everything else goes through execute().
+        """
+        results: List[Dict] = []
+        i = 0
+        while i < len(operations):
+            if not isinstance(operations[i], dict):
+                results.append({'error': "Operation must be an object", 'code': 400})
+                i += 1
+                continue
+            if not self._batchable(operations[i]):
+                status, payload = self.execute(operations[i])
+                results.append(dict(payload, code=status))
+                i += 1
+                continue
+            
+            j = i
+            requests = []
+            try:
+                while j < len(operations) and isinstance(operations[j], dict) and self._batchable(operations[j]):
+                    requests.append((int(operations[j]['pid']), _amounts(operations[j]['request'])))
+                    j += 1
+            except (KeyError, TypeError, ValueError) as e:
+                # Decide the well-formed prefix, then report the bad operation
+                for status, message in self.banker.request_resources_batch(requests):
+                    results.append({'status': status.value, 'message': message, 'code': 200})
+                results.append({'error': f"Missing or invalid field: {e}", 'code': 400})
+                i = j + 1
+                continue
+            
+            for status, message in self.banker.request_resources_batch(requests):
+                results.append({'status': status.value, 'message': message, 'code': 200})
+            i = j
+        
+        return results
+    
+    @staticmethod
+    def _batchable(op: Dict) -> bool:
+        # Requests carrying an id go through the dedupe cache one by one
+        return op.get('op') == 'request' and 'request_id' not in op
+    
+    def route(self, method: str, path: str, body: Optional[Dict]) -> Tuple[int, Dict]:
+        """Map an HTTP method and path onto an operation"""
+        self.requests_served += 1
+        body = body or {}
+        if not isinstance(body, dict):
+            return 400, {'error': "Body must be a JSON object"}
+        
+        if path == '/state':
+            if method != 'GET':
+                return 405, {'error': 'Use GET'}
+            return self.execute({'op': 'state'})
+        
+        if path.startswith('/processes/') and method == 'DELETE':
+            return self.execute({'op': 'remove', 'pid': path.rsplit('/', 1)[1]})
+        
+        if method != 'POST':
+            if path in ('/processes', '/request', '/release', '/what-if', '/batch'):
+                return 405, {'error': 'Use POST'}
+            return 404, {'error': f"Unknown path: {path}"}
+        
+        if path == '/processes':
+            return self.execute(dict(body, op='add'))
+        if path == '/request':
+            return self.execute(dict(body, op='request'))
+        if path == '/release':
+            return self.execute(dict(body, op='release'))
+        if path == '/what-if':
+            return self.execute(dict(body, op='what-if'))
+        if path == '/batch':
+            operations = body.get('operations')
+            if not isinstance(operations, list):
+                return 400, {'error': "Expected an 'operations' list"}
+            return 200, {'results': self.execute_batch(operations)}
+        
+        return 404, {'error': f"Unknown path: {path}"}
+
+
+class BankerServer:
+    """asyncio HTTP/1.1 server with keep-alive and pipelining"""
+    
+    def __init__(self, banker: BankersAlgorithm, host: str = '127.0.0.1', port: int = 8765,
+                 unix_path: Optional[str] = None):
+        """
+        Args:
+            banker: Shared banker instance
+            host, port: TCP address (localhost by default)
+            unix_path: Serve on a Unix socket instead of TCP
+        """
+        self.service = BankerService(banker)
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.server: Optional[asyncio.AbstractServer] = None
+    
+    async def start(self):
+        if self.unix_path:
+            self.server = await asyncio.start_unix_server(self.handle_connection, path=self.unix_path)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+            # Pick up the real port when bound to port 0
+            self.port = self.server.sockets[0].getsockname()[1]
+    
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+    
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+    
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until the client closes it"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                if not request_line.strip():
+                    continue
+                
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    self._write(writer, 400, {'error': 'Malformed request line'}, False)
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                
+                keep_alive = (
+                    headers.get('connection', '').lower() != 'close'
+                    and version.upper() != 'HTTP/1.0'
+                )
+                
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # Without a usable length the body cannot be skipped
+                    self._write(writer, 400, {'error': 'Invalid Content-Length'}, False)
+                    break
+                if length > MAX_BODY:
+                    self._write(writer, 413, {'error': 'Body too large'}, False)
+                    break
+                
+                body = None
+                if length:
+                    raw = await reader.readexactly(length)
+                    try:
+                        body = json.loads(raw)
+                    except ValueError:
+                        self._write(writer, 400, {'error': 'Body is not valid JSON'}, keep_alive)
+                        continue
+                
+                status, payload = self.service.route(method.upper(), path, body)
+                self._write(writer, status, payload, keep_alive)
+                
+                if not keep_alive:
+                    break
+                
+                # Pipelined requests already buffered are answered before
+                # waiting for the socket to drain
+                if writer.transport.get_write_buffer_size() > 64 * 1024:
+                    await writer.drain()
+            
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+    
+    def _write(self, writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool):
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode()
+        writer.write(head + body)
+
+
+class ServerThread:
+    """Run a BankerServer on its own event loop in a background thread (tests, benchmarks)"""
+    
+    def __init__(self, banker: BankersAlgorithm, host: str = '127.0.0.1', port: int = 0,
+                 unix_path: Optional[str] = None):
+        self.server = BankerServer(banker, host, port, unix_path)
+        self.loop = asyncio.new_event_loop()
+        self.thread: Optional[threading.Thread] = None
+    
+    @property
+    def port(self) -> int:
+        return self.server.port
+    
+    def start(self) -> 'ServerThread':
+        ready = threading.Event()
+        
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_until_complete(self.server.start())
+            ready.set()
+            self.loop.run_forever()
+        
+        self.thread = threading.Thread(target=run, name="banker-server", daemon=True)
+        self.thread.start()
+        ready.wait()
+        return self
+    
+    def stop(self):
+        """Close the listener, cancel open connections and stop the loop"""
+        async def shutdown():
+            await self.server.stop()
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+    
+    def __enter__(self) -> 'ServerThread':
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def parse_resources(text: str) -> Dict[str, int]:
+    """Parse 'CPU=10,Memory=20' into a resource dict"""
+    resources = {}
+    for item in text.split(','):
+        name, _, amount = item.partition('=')
+        resources[name.strip()] = int(amount)
+    return resources
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a Banker's Algorithm instance over HTTP/JSON")
+    parser.add_argument('--resources', default='CPU=10,Memory=20,Disk=15',
+                        help="Total resources, e.g. CPU=10,Memory=20")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="Serve on this Unix socket path instead of TCP")
+    args = parser.parse_args(argv)
+    
+    banker = BankersAlgorithm(parse_resources(args.resources))
+    server = BankerServer(banker, args.host, args.port, args.unix)
+    
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Serving Banker's Algorithm on {where}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""
+Shared-memory state for Banker's Algorithm
+One writer process mirrors the available vector, allocation and need
+matrices and the version counter into a multiprocessing.shared_memory
+block; reader processes attach by name and read them in place, using a
+seqlock to detect writes that overlap a read.
+"""
+
+import json
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, List, Optional, TypeVar
+from bankers_algorithm import BankersAlgorithm
+
+
+# Header words (int64): seqlock counter, banker version, resources,
+# process capacity, processes, moved flag
+SEQ, VERSION, RESOURCES, CAPACITY, COUNT, MOVED = range(6)
+HEADER_WORDS = 8
+NAME_BYTES = 64
+RESOURCE_BYTES = 1024
+DATA_OFFSET = HEADER_WORDS * 8 + NAME_BYTES + RESOURCE_BYTES
+
+T = TypeVar('T')
+
+
+def _block_size(resources: int, capacity: int) -> int:
+    return DATA_OFFSET + 8 * (resources + capacity + 2 * capacity * resources)
+
+
+class SharedView:
+    """int64 views over one shared block (no data is copied)"""
+    
+    def __init__(self, shm: shared_memory.SharedMemory):
+        self.shm = shm
+        buf = shm.buf
+        self.header = buf[:HEADER_WORDS * 8].cast('q')
+        m, capacity = self.header[RESOURCES], self.header[CAPACITY]
+        
+        names = bytes(buf[HEADER_WORDS * 8 + NAME_BYTES:DATA_OFFSET]).rstrip(b'\0')
+        self.resources: List[str] = json.loads(names) if names else []
+        
+        offset = DATA_OFFSET
+        self.available = buf[offset:offset + 8 * m].cast('q')
+        offset += 8 * m
+        self.pids = buf[offset:offset + 8 * capacity].cast('q')
+        offset += 8 * capacity
+        self.allocated = buf[offset:offset + 8 * capacity * m].cast('q')
+        offset += 8 * capacity * m
+        self.needed = buf[offset:offset + 8 * capacity * m].cast('q')
+    
+    @property
+    def count(self) -> int:
+        return self.header[COUNT]
+    
+    def row(self, matrix: memoryview, index: int) -> memoryview:
+        """Slice one process row out of `allocated` or `needed`"""
+        m = len(self.resources)
+        return matrix[index * m:(index + 1) * m]
+    
+    def moved_to(self) -> str:
+        start = HEADER_WORDS * 8
+        return bytes(self.shm.buf[start:start + NAME_BYTES]).rstrip(b'\0').decode()
+    
+    def release(self):
+        for view in (self.header, self.available, self.pids, self.allocated, self.needed):
+            view.release()
+
+
+class SharedStateWriter:
+    """Keep a shared-memory copy of a banker's matrices up to date (single writer)"""
+    
+    def __init__(self, banker: BankersAlgorithm, capacity: int = 1024, name: Optional[str] = None):
+        """
+        Args:
+            banker: Banker owned by this process
+            capacity: Process rows reserved; the block is reallocated when it fills up
+            name: Shared memory name (generated if omitted)
+        """
+        self.banker = banker
+        self.resources = list(banker.total_resources)
+        self.slots: Dict[int, int] = {}
+        self.retired: List[SharedView] = []
+        self.view = self._create(max(capacity, len(banker.processes)), name)
+        self._write_all()
+        banker.subscribe(self._on_entry)
+    
+    @property
+    def name(self) -> str:
+        return self.view.shm.name
+    
+    def close(self):
+        """Stop mirroring and free the shared blocks"""
+        self.banker.unsubscribe(self._on_entry)
+        for view in self.retired + [self.view]:
+            view.release()
+            view.shm.close()
+            view.shm.unlink()
+        self.retired = []
+    
+    def __enter__(self) -> 'SharedStateWriter':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _create(self, capacity: int, name: Optional[str]) -> SharedView:
+        names = json.dumps(self.resources).encode()
+        if len(names) > RESOURCE_BYTES:
+            raise ValueError("Too many resource names for the shared header")
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_block_size(len(self.resources), capacity))
+        shm.buf[HEADER_WORDS * 8 + NAME_BYTES:HEADER_WORDS * 8 + NAME_BYTES + len(names)] = names
+        header = shm.buf[:HEADER_WORDS * 8].cast('q')
+        header[RESOURCES] = len(self.resources)
+        header[CAPACITY] = capacity
+        header.release()
+        return SharedView(shm)
+    
+    def _write_all(self):
+        view = self.view
+        view.header[SEQ] += 1
+        self.slots.clear()
+        for r, resource in enumerate(self.resources):
+            view.available[r] = self.banker.available.get(resource, 0)
+        for pid, process in self.banker.processes.items():
+            self._write_row(len(self.slots), pid, process)
+        view.header[COUNT] = len(self.slots)
+        view.header[VERSION] = self.banker.version
+        view.header[SEQ] += 1
+    
+    def _write_row(self, slot: int, pid: int, process):
+        self.slots[pid] = slot
+        view = self.view
+        view.pids[slot] = pid
+        base = slot * len(self.resources)
+        for r, resource in enumerate(self.resources):
+            view.allocated[base + r] = process.allocated.get(resource, 0)
+            view.needed[base + r] = process.needed.get(resource, 0)
+    
+    def _grow(self):
+        """Move to a block twice the size"""
+        self._move(self.view.header[CAPACITY] * 2)
+    
+    def _move(self, capacity: int):
+        """
+        Rewrite the state into a new block and point readers at it
+        
+        Old blocks stay linked until close() so readers that attached to
+        any of them can follow the chain.
+        """
+        old = self.view
+        self.view = self._create(capacity, None)
+        self._write_all()
+        
+        new_name = self.name.encode()
+        start = HEADER_WORDS * 8
+        old.shm.buf[start:start + len(new_name)] = new_name
+        old.header[MOVED] = 1
+        self.retired.append(old)
+    
+    def _on_entry(self, entry: Dict):
+        action = entry['action']
+        if action in ('add_resource', 'remove_resource'):
+            # The row width changed, so the layout has to be rebuilt
+            self.resources = list(self.banker.total_resources)
+            self._move(self.view.header[CAPACITY])
+            return
+        if action == 'capacity':
+            view = self.view
+            view.header[SEQ] += 1
+            view.available[self.resources.index(entry['resource'])] = self.banker.available[entry['resource']]
+            view.header[VERSION] = self.banker.version
+            view.header[SEQ] += 1
+            return
+        if action == 'add_many':
+            count = len(self.slots) + len(entry['pids'])
+            capacity = self.view.header[CAPACITY]
+            if count > capacity:
+                while capacity < count:
+                    capacity *= 2
+                self._move(capacity)
+                return
+            view = self.view
+            view.header[SEQ] += 1
+            for pid in entry['pids']:
+                self._write_row(len(self.slots), pid, self.banker.processes[pid])
+            for r, resource in enumerate(self.resources):
+                view.available[r] = self.banker.available.get(resource, 0)
+            view.header[COUNT] = len(self.slots)
+            view.header[VERSION] = self.banker.version
+            view.header[SEQ] += 1
+            return
+        
+        pid = entry['pid']
+        if action == 'add' and len(self.slots) >= self.view.header[CAPACITY]:
+            self._grow()
+            return
+        
+        view = self.view
+        view.header[SEQ] += 1
+        
+        if action == 'remove':
+            # Keep rows dense: move the last row into the freed slot
+            slot = self.slots.pop(pid)
+            last = len(self.slots)
+            if slot != last:
+                moved_pid = view.pids[last]
+                self._write_row(slot, moved_pid, self.banker.processes[moved_pid])
+        else:
+            slot = self.slots.get(pid, len(self.slots))
+            self._write_row(slot, pid, self.banker.processes[pid])
+        
+        if action != 'add':
+            for r, resource in enumerate(self.resources):
+                view.available[r] = self.banker.available.get(resource, 0)
+        view.header[COUNT] = len(self.slots)
+        view.header[VERSION] = self.banker.version
+        view.header[SEQ] += 1
+
+
+class SharedStateReader:
+    """Attach to a writer's block and read consistent state without copying it"""
+    
+    def __init__(self, name: str):
+        self.retries = 0
+        self.view = self._attach(name)
+    
+    def _attach(self, name: str) -> SharedView:
+        # The writer owns the block. Attach without registering it with this
+        # process's resource tracker, which would unlink it when we exit
+        # (what track=False does on Python 3.13+)
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args: None
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+        return SharedView(shm)
+    
+    def close(self):
+        self.view.release()
+        self.view.shm.close()
+    
+    def __enter__(self) -> 'SharedStateReader':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def read(self, fn: Callable[[SharedView], T]) -> T:
+        """
+        Run `fn` on the live shared views and return its result
+        
+        `fn` is retried until it ran without a concurrent write, so it must
+        not have side effects and should copy anything it keeps.
+        """
+        while True:
+            view = self.view
+            seq = view.header[SEQ]
+            if seq & 1:
+                self.retries += 1
+                time.sleep(0)
+                continue
+            if view.header[MOVED]:
+                self.view = self._attach(view.moved_to())
+                view.release()
+                view.shm.close()
+                continue
+            result = fn(view)
+            if view.header[SEQ] == seq:
+                return result
+            self.retries += 1
+    
+    @property
+    def version(self) -> int:
+        return self.read(lambda view: view.header[VERSION])
+    
+    def snapshot(self) -> Dict:
+        """Copy the state out as {'version', 'available', 'allocated', 'needed'} keyed by resource and pid"""
+        def copy(view: SharedView) -> Dict:
+            resources = view.resources
+            allocated, needed = {}, {}
+            for i in range(view.count):
+                pid = view.pids[i]
+                allocated[pid] = dict(zip(resources, view.row(view.allocated, i).tolist()))
+                needed[pid] = dict(zip(resources, view.row(view.needed, i).tolist()))
+            return {
+                'version': view.header[VERSION],
+                'available': dict(zip(resources, view.available.tolist())),
+                'allocated': allocated,
+                'needed': needed
+            }
+        return self.read(copy)
+    
+    def is_safe(self) -> bool:
+        """Run the safety check directly over the shared matrices"""
+        from whatif_engine import is_safe_vectors
+        
+        def check(view: SharedView) -> bool:
+            rows = range(view.count)
+            return is_safe_vectors(
+                view.available.tolist(),
+                [view.row(view.allocated, i) for i in rows],
+                [view.row(view.needed, i) for i in rows]
+            )
+        return self.read(check)
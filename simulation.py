@@ -0,0 +1,249 @@
+"""
+Monte Carlo workload simulation for Banker's Algorithm
+Generates processes with random claims and request/release cadence, drives a
+banker through them as a discrete-event simulation and aggregates
+throughput, wait, deny rate and utilization over seeded replicas run on a
+process pool. Useful for sizing total_resources and for comparing grant
+scheduling policies on the same workload.
+
+Run: python simulation.py --resources CPU=16,Memory=32 --replicas 32
+"""
+
+import argparse
+import heapq
+import itertools
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+from bankers_algorithm import AllocationStatus, BankersAlgorithm
+from scheduler import GrantScheduler
+
+
+METRICS = ('throughput', 'mean_wait', 'deny_rate', 'utilization')
+
+
+@dataclass
+class SimulationConfig:
+    """Workload model for one simulated system"""
+    resources: Dict[str, int] = field(default_factory=lambda: {'CPU': 16, 'Memory': 32})
+    duration: float = 1000.0
+    arrival_rate: float = 0.1
+    max_claim_fraction: float = 0.5
+    max_claim: Optional[Dict[str, int]] = None
+    requests_per_process: int = 3
+    think_time: float = 2.0
+    hold_time: float = 10.0
+    policy: str = 'fifo'  # grant scheduling policy, see scheduler.POLICIES
+    max_priority: int = 3
+
+
+def _random_claim(rng: random.Random, config: SimulationConfig) -> Dict[str, int]:
+    """Uniform claim up to `max_claim` if given, else up to a fraction of each total"""
+    claim = {}
+    for r, total in config.resources.items():
+        limit = config.max_claim.get(r, 0) if config.max_claim else int(total * config.max_claim_fraction)
+        claim[r] = rng.randint(1, max(1, min(limit, total)))
+    return claim
+
+
+def _split_request(rng: random.Random, need: Dict[str, int], steps_left: int) -> Dict[str, int]:
+    """Ask for roughly 1/steps_left of the remaining need (all of it on the last step)"""
+    if steps_left <= 1:
+        return {r: n for r, n in need.items() if n}
+    request = {}
+    for r, n in need.items():
+        amount = min(n, rng.randint(0, max(1, 2 * n // steps_left)))
+        if amount:
+            request[r] = amount
+    return request or {r: n for r, n in need.items() if n}
+
+
+def simulate(config: SimulationConfig, seed: int) -> Dict[str, float]:
+    """
+    Run one replica
+    
+    Processes arrive as a Poisson stream, make `requests_per_process`
+    requests for parts of their claim separated by exponential think times,
+    hold everything for an exponential service time, then release and leave.
+    Requests that are denied wait in a GrantScheduler and are retried in
+    `config.policy` order whenever resources are released. Each process gets
+    a random priority in [0, max_priority), used by the priority policy.
+    
+    Returns:
+        throughput (completed processes per time unit), mean_wait (request to
+        grant), deny_rate (requests not granted when first made / requests),
+        utilization (mean fraction of all resources allocated), plus raw counts
+    """
+    rng = random.Random(seed)
+    banker = BankersAlgorithm(config.resources)
+    total = sum(config.resources.values())
+    
+    events: List[Tuple[float, int, str, int]] = []
+    order = 0
+    
+    def schedule(time: float, kind: str, pid: int = -1):
+        nonlocal order
+        heapq.heappush(events, (time, order, kind, pid))
+        order += 1
+    
+    steps_left: Dict[int, int] = {}
+    priority: Dict[int, int] = {}
+    requests = denied = completed = grants = 0
+    wait_total = 0.0
+    allocated_area = 0.0
+    allocated_now = 0
+    now = 0.0
+    next_pid = 0
+    scheduler = GrantScheduler(banker, config.policy, clock=lambda: now)
+    
+    def granted(pid: int, request: Dict[str, int], issued: float):
+        nonlocal grants, wait_total, allocated_now
+        grants += 1
+        wait_total += now - issued
+        allocated_now += sum(request.values())
+        steps_left[pid] -= 1
+        if steps_left[pid] == 0:
+            schedule(now + rng.expovariate(1 / config.hold_time), 'finish', pid)
+        else:
+            schedule(now + rng.expovariate(1 / config.think_time), 'request', pid)
+    
+    schedule(rng.expovariate(config.arrival_rate), 'arrive')
+    while events:
+        time, _, kind, pid = heapq.heappop(events)
+        if time > config.duration:
+            break
+        allocated_area += allocated_now * (time - now)
+        now = time
+        
+        if kind == 'arrive':
+            pid = next_pid
+            next_pid += 1
+            banker.add_process(pid, _random_claim(rng, config))
+            steps_left[pid] = config.requests_per_process
+            priority[pid] = rng.randrange(max(1, config.max_priority))
+            schedule(now, 'request', pid)
+            schedule(now + rng.expovariate(config.arrival_rate), 'arrive')
+        
+        elif kind == 'request':
+            request = _split_request(rng, banker.processes[pid].needed, steps_left[pid])
+            requests += 1
+            status, _ = scheduler.submit(pid, request, priority[pid])
+            if status == AllocationStatus.GRANTED:
+                granted(pid, request, now)
+            else:
+                denied += 1
+        
+        elif kind == 'finish':
+            allocated_now -= sum(banker.processes[pid].allocated.values())
+            del steps_left[pid], priority[pid]
+            completed += 1
+            
+            # Released resources may unblock waiting requests
+            for item in scheduler.remove_process(pid):
+                granted(item.pid, item.request, item.submitted)
+        
+        # Long runs would otherwise keep every operation in memory
+        banker.history.clear()
+    
+    allocated_area += allocated_now * (config.duration - now)
+    return {
+        'throughput': completed / config.duration,
+        'mean_wait': wait_total / grants if grants else 0.0,
+        'deny_rate': denied / requests if requests else 0.0,
+        'utilization': allocated_area / (total * config.duration) if total else 0.0,
+        'completed': completed,
+        'requests': requests,
+        'retries': scheduler.attempts,
+        'still_waiting': len(scheduler.queue),
+        'max_wait': scheduler.wait_max
+    }
+
+
+def _simulate_args(args: Tuple[Dict, int]) -> Dict[str, float]:
+    config, seed = args
+    return simulate(SimulationConfig(**config), seed)
+
+
+def aggregate(results: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Mean, standard deviation and 95% confidence half-width of each metric"""
+    summary = {}
+    n = len(results)
+    for metric in METRICS:
+        values = [r[metric] for r in results]
+        mean = sum(values) / n
+        std = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1)) if n > 1 else 0.0
+        summary[metric] = {
+            'mean': mean,
+            'std': std,
+            'ci95': 1.96 * std / math.sqrt(n),
+            'min': min(values),
+            'max': max(values)
+        }
+    return summary
+
+
+def run_replicas(config: SimulationConfig, replicas: int = 16, seed: int = 0,
+                 workers: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Run independent replicas (seeds seed .. seed + replicas - 1) on a process pool
+    
+    Args:
+        config: Workload model
+        replicas: Number of replicas
+        seed: First seed; the same seed always gives the same results
+        workers: Pool size (all cores by default, 1 runs in-process)
+    """
+    jobs = [(asdict(config), seed + i) for i in range(replicas)]
+    if workers == 1:
+        results = [_simulate_args(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_args, jobs, chunksize=max(1, replicas // 32)))
+    return aggregate(results)
+
+
+def main(argv=None):
+    from server import parse_resources
+    
+    parser = argparse.ArgumentParser(description="Monte Carlo capacity planning for Banker's Algorithm")
+    parser.add_argument('--resources', default='CPU=16,Memory=32',
+                        help="Sizes to compare, separated by ';', e.g. CPU=16,Memory=32;CPU=24,Memory=48")
+    parser.add_argument('--replicas', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--duration', type=float, default=1000.0)
+    parser.add_argument('--arrival-rate', type=float, default=0.1)
+    parser.add_argument('--max-claim-fraction', type=float, default=0.5)
+    parser.add_argument('--max-claim', help="Absolute claim limits, e.g. CPU=4,Memory=8 "
+                                            "(keeps the workload fixed while sizes vary)")
+    parser.add_argument('--requests-per-process', type=int, default=3)
+    parser.add_argument('--think-time', type=float, default=2.0)
+    parser.add_argument('--hold-time', type=float, default=10.0)
+    parser.add_argument('--policy', default='fifo',
+                        help="Grant scheduling policies to compare, separated by ',' "
+                             "(fifo, smallest-first, shortest-remaining-need, priority-aging)")
+    args = parser.parse_args(argv)
+    
+    for sizes, policy in itertools.product(args.resources.split(';'), args.policy.split(',')):
+        config = SimulationConfig(
+            resources=parse_resources(sizes),
+            duration=args.duration,
+            arrival_rate=args.arrival_rate,
+            max_claim_fraction=args.max_claim_fraction,
+            max_claim=parse_resources(args.max_claim) if args.max_claim else None,
+            requests_per_process=args.requests_per_process,
+            think_time=args.think_time,
+            hold_time=args.hold_time,
+            policy=policy
+        )
+        summary = run_replicas(config, args.replicas, args.seed, args.workers)
+        print(f"\n{sizes}, {policy} ({args.replicas} replicas)")
+        for metric, stats in summary.items():
+            print(f"  {metric:<12} {stats['mean']:>10.4f} ± {stats['ci95']:.4f}  "
+                  f"(min {stats['min']:.4f}, max {stats['max']:.4f})")
+
+
+if __name__ == '__main__':
+    main()
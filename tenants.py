@@ -0,0 +1,192 @@
+"""
+Multi-tenant registry for Banker's Algorithm
+Hosts many independent bankers over one resource-name schema. Recently used
+tenants are live BankersAlgorithm objects; the rest are packed into int64
+arrays and rebuilt on first use, so memory follows the active set.
+"""
+
+import pickle
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from bankers_algorithm import BankersAlgorithm, Process
+
+
+class TenantRegistry:
+    """Route operations to per-tenant bankers and evict idle ones to compact storage"""
+    
+    def __init__(self, resources: List[str], max_active: int = 256, idle_seconds: Optional[float] = None):
+        """
+        Args:
+            resources: Resource names shared by every tenant
+            max_active: Live bankers kept before the least recently used is packed
+            idle_seconds: Pack tenants untouched for this long on evict_idle() (None disables)
+        """
+        self.resources = list(resources)
+        self.max_active = max_active
+        self.idle_seconds = idle_seconds
+        
+        self.active: "OrderedDict[str, BankersAlgorithm]" = OrderedDict()
+        self.last_used: Dict[str, float] = {}
+        self.packed: Dict[str, bytes] = {}
+        
+        self.materializations = 0
+        self.evictions = 0
+        self.lock = threading.RLock()
+    
+    def __contains__(self, tenant_id: str) -> bool:
+        return tenant_id in self.active or tenant_id in self.packed
+    
+    def __len__(self) -> int:
+        return len(self.active) + len(self.packed)
+    
+    def create_tenant(self, tenant_id: str, totals: Dict[str, int]) -> BankersAlgorithm:
+        """Create a tenant with its own totals over the shared schema"""
+        unknown = set(totals) - set(self.resources)
+        if unknown:
+            raise ValueError(f"Unknown resources: {', '.join(sorted(unknown))}")
+        with self.lock:
+            if tenant_id in self:
+                raise ValueError(f"Tenant {tenant_id} already exists")
+            banker = BankersAlgorithm({r: totals.get(r, 0) for r in self.resources})
+            self._activate(tenant_id, banker)
+            return banker
+    
+    def drop_tenant(self, tenant_id: str):
+        with self.lock:
+            if tenant_id not in self:
+                raise ValueError(f"Tenant {tenant_id} not found")
+            self.active.pop(tenant_id, None)
+            self.packed.pop(tenant_id, None)
+            self.last_used.pop(tenant_id, None)
+    
+    def get(self, tenant_id: str) -> BankersAlgorithm:
+        """
+        Return the tenant's banker, rebuilding it from compact storage if needed
+        
+        The object may be packed away by later calls, so look it up again
+        rather than keeping it.
+        """
+        with self.lock:
+            banker = self.active.get(tenant_id)
+            if banker is not None:
+                self.active.move_to_end(tenant_id)
+                self.last_used[tenant_id] = time.monotonic()
+                return banker
+            
+            data = self.packed.pop(tenant_id, None)
+            if data is None:
+                raise ValueError(f"Tenant {tenant_id} not found")
+            banker = self.unpack(data)
+            self.materializations += 1
+            self._activate(tenant_id, banker)
+            return banker
+    
+    def execute(self, tenant_id: str, op: Dict) -> Tuple[int, Dict]:
+        """
+        Run a service operation ({"op": "request", "pid": ..., ...}) for one tenant
+        
+        Returns:
+            Tuple of (http-style status, payload) as BankerService.execute
+        """
+        from server import BankerService
+        
+        with self.lock:
+            try:
+                banker = self.get(tenant_id)
+            except ValueError as e:
+                return 404, {'error': str(e)}
+            return BankerService(banker).execute(op)
+    
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Pack tenants idle for longer than idle_seconds; returns how many were packed"""
+        if self.idle_seconds is None:
+            return 0
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            idle = [t for t in self.active if now - self.last_used[t] > self.idle_seconds]
+            for tenant_id in idle:
+                self._evict(tenant_id)
+            return len(idle)
+    
+    def memory_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                'tenants': len(self),
+                'active': len(self.active),
+                'packed': len(self.packed),
+                'packed_bytes': sum(len(data) for data in self.packed.values()),
+                'materializations': self.materializations,
+                'evictions': self.evictions
+            }
+    
+    def _activate(self, tenant_id: str, banker: BankersAlgorithm):
+        self.active[tenant_id] = banker
+        self.last_used[tenant_id] = time.monotonic()
+        while len(self.active) > self.max_active:
+            self._evict(next(iter(self.active)))
+    
+    def _evict(self, tenant_id: str):
+        banker = self.active.pop(tenant_id)
+        self.packed[tenant_id] = self.pack(banker)
+        self.evictions += 1
+    
+    # Compact storage
+    
+    def pack(self, banker: BankersAlgorithm) -> bytes:
+        """
+        Pack a banker into int64s in schema order
+        
+        Layout: version, process count, trailer length, totals[m],
+        available[m], then per process pid, max_claim[m], allocated[m].
+        Waiting requests, queued capacity removals and remembered request
+        outcomes follow as a pickled trailer, written only when there are
+        any. History is not kept.
+        """
+        resources = self.resources
+        trailer = b''
+        if banker.pending or banker.pending_capacity or len(banker.request_cache):
+            trailer = pickle.dumps((
+                banker.pending,
+                banker.pending_capacity,
+                list(banker.request_cache.entries.items())
+            ))
+        values = array('q', [banker.version, len(banker.processes), len(trailer)])
+        values.extend(banker.total_resources.get(r, 0) for r in resources)
+        values.extend(banker.available.get(r, 0) for r in resources)
+        for pid, process in banker.processes.items():
+            values.append(pid)
+            values.extend(process.max_claim.get(r, 0) for r in resources)
+            values.extend(process.allocated.get(r, 0) for r in resources)
+        return values.tobytes() + trailer
+    
+    def unpack(self, data: bytes) -> BankersAlgorithm:
+        """Rebuild a banker packed by pack() without re-running any checks"""
+        values = array('q')
+        values.frombytes(data[:8 * 3])
+        trailer_length = values[2]
+        values.frombytes(data[8 * 3:len(data) - trailer_length])
+        resources = self.resources
+        m = len(resources)
+        
+        banker = BankersAlgorithm(dict(zip(resources, values[3:3 + m])))
+        banker.available = dict(zip(resources, values[3 + m:3 + 2 * m]))
+        banker.version = values[0]
+        if trailer_length:
+            banker.pending, banker.pending_capacity, outcomes = pickle.loads(data[len(data) - trailer_length:])
+            banker.request_cache.entries.update(outcomes)
+        
+        offset = 3 + 2 * m
+        for _ in range(values[1]):
+            pid = values[offset]
+            process = Process(
+                pid=pid,
+                max_claim=dict(zip(resources, values[offset + 1:offset + 1 + m])),
+                allocated=dict(zip(resources, values[offset + 1 + m:offset + 1 + 2 * m]))
+            )
+            process.calculate_needed()
+            banker.processes[pid] = process
+            offset += 1 + 2 * m
+        return banker
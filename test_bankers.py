@@ -2,8 +2,42 @@
 Unit tests for Banker's Algorithm implementation
 """
 
+import asyncio
+import contextlib
+import io
+import http.client
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
-from bankers_algorithm import BankersAlgorithm, AllocationStatus, Process
+from bankers_algorithm import BankersAlgorithm, AllocationStatus, Process, RequestCache, StateCache
+import bankers_cli
+from binary_snapshot import SnapshotProcesses, load_snapshot, open_snapshot
+from checkpoints import CheckpointLog, restore_snapshot, take_snapshot
+from deadlock_detection import DeadlockDetector, detect_deadlock
+from federation import GlobalPool, NodeBanker, PoolManager
+from leases import LeaseManager, TimerWheel
+from client import AsyncBankerClient, BankerClient
+from live_feed import LiveFeed, apply_event, parse_event
+from persistence import SQLiteStore, open_banker
+from replication import ReplicationFollower, ReplicationLeader
+from scheduler import GrantScheduler, PendingRequest, PriorityAgingPolicy
+from safety_analysis import count_safe_sequences, estimate_safe_sequences, iter_safe_sequences, preemption_plan
+from server import ServerThread
+from shared_state import SharedStateReader, SharedStateWriter
+from tenants import TenantRegistry
+from simulation import SimulationConfig, run_replicas, simulate
+from trace_generator import TraceGenerator, read_trace, write_binary, write_jsonl
+from visualization import StateTransitionAnalyzer
+from whatif_engine import WhatIfEngine, compute_grid
 
 
 class TestProcess(unittest.TestCase):
@@ -159,6 +193,184 @@ class TestBankersAlgorithm(unittest.TestCase):
         
         # Verify state wasn't modified
         self.assertEqual(self.banker.processes[0].allocated, {'CPU': 0, 'Memory': 0})
+        self.assertEqual([h['action'] for h in self.banker.history], ['add', 'add'])
+    
+    def test_partial_release(self):
+        """Test releasing part of an allocation"""
+        self.banker.add_process(0, {'CPU': 5, 'Memory': 10})
+        self.banker.request_resources(0, {'CPU': 4, 'Memory': 6})
+        
+        self.banker.release(0, {'CPU': 1, 'Memory': 6})
+        self.assertEqual(self.banker.available, {'CPU': 7, 'Memory': 20})
+        self.assertEqual(self.banker.processes[0].allocated, {'CPU': 3, 'Memory': 0})
+        self.assertEqual(self.banker.processes[0].needed, {'CPU': 2, 'Memory': 10})
+        self.assertEqual(self.banker.history[-1], {'action': 'release', 'pid': 0, 'released': {'CPU': 1, 'Memory': 6}})
+        
+        with self.assertRaises(ValueError):
+            self.banker.release(0, {'CPU': 4})
+        with self.assertRaises(ValueError):
+            self.banker.release(9, {'CPU': 1})
+    
+    def test_release_wakes_pending(self):
+        """Test queued requests are granted once enough is released"""
+        self.banker.add_process(0, {'CPU': 8, 'Memory': 4})
+        self.banker.add_process(1, {'CPU': 6, 'Memory': 4})
+        self.banker.request_resources(0, {'CPU': 8})
+        
+        status, message = self.banker.submit_request(1, {'CPU': 4})
+        self.assertEqual(status, AllocationStatus.DENIED)
+        self.assertTrue(message.endswith('queued'))
+        # Invalid requests are not queued
+        self.banker.submit_request(1, {'CPU': 7})
+        self.assertEqual(self.banker.pending, [(1, {'CPU': 4})])
+        
+        self.assertEqual(self.banker.release(0, {'CPU': 1}), [])
+        self.assertEqual(self.banker.release(0, {'CPU': 3}), [(1, {'CPU': 4})])
+        self.assertEqual(self.banker.pending, [])
+        self.assertEqual(self.banker.processes[1].allocated['CPU'], 4)
+        self.assertTrue(self.banker.is_safe())
+    
+    def test_capacity_changes(self):
+        """Test adding capacity needs no check and unsafe removals are refused or queued"""
+        self.banker.add_process(0, {'CPU': 8, 'Memory': 4})
+        self.banker.add_process(1, {'CPU': 6, 'Memory': 4})
+        self.banker.request_resources(0, {'CPU': 4})
+        self.banker.request_resources(1, {'CPU': 2})
+        
+        # Removing 2 of the 4 free CPUs leaves nobody able to finish
+        status, message = self.banker.remove_capacity('CPU', 2)
+        self.assertEqual(status, AllocationStatus.DENIED)
+        self.assertTrue(message.endswith('unsafe state'))
+        self.assertEqual(self.banker.available['CPU'], 4)
+        
+        status, _ = self.banker.remove_capacity('CPU', 2, queue=True)
+        self.assertEqual(self.banker.pending_capacity, [('CPU', 2)])
+        self.banker.release(0, {'CPU': 2})
+        self.assertEqual(self.banker.pending_capacity, [])
+        self.assertEqual(self.banker.total_resources['CPU'], 8)
+        self.assertEqual(self.banker.available['CPU'], 4)
+        self.assertTrue(self.banker.is_safe())
+        
+        self.banker.submit_request(0, {'CPU': 4})
+        self.assertEqual(self.banker.add_capacity('CPU', 2), [(0, {'CPU': 4})])
+        self.assertEqual(self.banker.total_resources['CPU'], 10)
+        with self.assertRaises(ValueError):
+            self.banker.add_capacity('GPU', 1)
+    
+    def test_resource_types(self):
+        """Test resource types can be added and removed without rebuilding processes"""
+        self.banker.add_process(0, {'CPU': 5, 'Memory': 10})
+        self.banker.request_resources(0, {'Memory': 2})
+        
+        self.banker.add_resource_type('GPU', 2)
+        self.banker.add_process(1, {'CPU': 1, 'GPU': 2})
+        self.assertEqual(self.banker.request_resources(1, {'GPU': 2})[0], AllocationStatus.GRANTED)
+        self.assertTrue(self.banker.is_safe())
+        
+        with self.assertRaises(ValueError):
+            self.banker.remove_resource_type('Memory')
+        self.banker.release_resources(0)
+        self.banker.remove_resource_type('Memory')
+        self.assertEqual(self.banker.processes[0].max_claim, {'CPU': 5})
+        self.assertNotIn('Memory', self.banker.available)
+        self.assertEqual(
+            [h['action'] for h in self.banker.history[-2:]],
+            ['release', 'remove_resource']
+        )
+    
+    def test_remove_resource_type_with_queued_requests(self):
+        """Test queued requests drop a removed resource and can still be granted"""
+        self.banker.add_resource_type('GPU', 1)
+        self.banker.add_process(1, {'CPU': 10})
+        self.banker.add_process(2, {'CPU': 2, 'GPU': 1})
+        self.banker.request_resources(1, {'CPU': 10})
+        self.banker.submit_request(2, {'CPU': 1, 'GPU': 1})
+        
+        self.banker.remove_resource_type('GPU')
+        self.assertEqual(self.banker.pending, [(2, {'CPU': 1})])
+        self.banker.release_resources(1)
+        self.assertEqual(self.banker.pending, [])
+        self.assertEqual(self.banker.processes[2].allocated, {'CPU': 1})
+    
+    def test_add_processes(self):
+        """Test bulk admission validates everything and matches add_process"""
+        reference = BankersAlgorithm({'CPU': 10, 'Memory': 20})
+        reference.add_process(0, {'CPU': 5, 'Memory': 10})
+        reference.add_process(1, {'CPU': 3, 'Memory': 4})
+        reference.request_resources(1, {'CPU': 2, 'Memory': 1})
+        
+        self.banker.enable_state_cache()
+        self.assertEqual(self.banker.add_processes([0, 1], [[5, 10], [3, 4]], [(0, 0), (2, 1)]), 2)
+        self.assertEqual(self.banker.get_system_state(), reference.get_system_state())
+        self.assertEqual(self.banker.history[-1]['action'], 'add_many')
+        key = self.banker.state_cache.key
+        self.banker.rehash()
+        self.assertEqual(self.banker.state_cache.key, key)
+        
+        # Nothing is added when any row is invalid
+        for claims, allocated in (([[11, 1]], None), ([[2, 2]], [[3, 0]]), ([[9, 1]], [[9, 0]]), ([[1]], None)):
+            with self.assertRaises(ValueError):
+                self.banker.add_processes([5], claims, allocated)
+        with self.assertRaises(ValueError):
+            self.banker.add_processes([1, 6], [[1, 1], [1, 1]])
+        self.assertEqual(sorted(self.banker.processes), [0, 1])
+        
+        # Columns can follow any order of the resources
+        self.banker.add_processes([2], [[4, 1]], resources=['Memory', 'CPU'])
+        self.assertEqual(self.banker.processes[2].max_claim, {'Memory': 4, 'CPU': 1})
+    
+    def test_add_processes_from_file(self):
+        """Test a CSV process table is streamed into a bulk load"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'processes.csv')
+            with open(path, 'w') as f:
+                f.write("pid,Memory,CPU,allocated.CPU,allocated.Memory\n")
+                for pid in range(4):
+                    f.write(f"{pid},4,2,1,{pid}\n")
+            self.assertEqual(self.banker.add_processes_from_file(path), 4)
+        self.assertEqual(self.banker.processes[3].needed, {'Memory': 1, 'CPU': 1})
+        self.assertEqual(self.banker.available, {'CPU': 6, 'Memory': 14})
+        self.assertTrue(self.banker.is_safe())
+    
+    def test_request_ids_are_idempotent(self):
+        """Test a retried request id returns the first outcome without allocating again"""
+        self.banker.add_process(0, {'CPU': 5, 'Memory': 10})
+        first = self.banker.request_resources(0, {'CPU': 2}, request_id='a')
+        self.assertEqual(self.banker.request_resources(0, {'CPU': 2}, request_id='a'), first)
+        self.assertEqual(self.banker.processes[0].allocated['CPU'], 2)
+        self.assertEqual(len(self.banker.history), 2)
+        
+        self.banker.request_resources(0, {'CPU': 2}, request_id='b')
+        self.assertEqual(self.banker.processes[0].allocated['CPU'], 4)
+        self.assertEqual(self.banker.request_cache.stats()['hit_rate'], 1 / 3)
+    
+    def test_request_cache_bounds(self):
+        """Test cached outcomes are dropped by size and age"""
+        now = [0.0]
+        cache = RequestCache(max_size=2, ttl=10, clock=lambda: now[0])
+        for request_id in 'abc':
+            cache.put(request_id, AllocationStatus.GRANTED, 'ok')
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('b'))
+        now[0] = 11
+        self.assertIsNone(cache.get('c'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(len(cache), 1)
+    
+    def test_history_and_listeners(self):
+        """Test every committed mutation is recorded and broadcast"""
+        seen = []
+        self.banker.subscribe(seen.append)
+        
+        self.banker.add_process(0, {'CPU': 5, 'Memory': 10})
+        self.banker.request_resources(0, {'CPU': 2, 'Memory': 3})
+        self.banker.request_resources(0, {'CPU': 9, 'Memory': 0})
+        self.banker.release_resources(0)
+        self.banker.remove_process(0)
+        
+        self.assertEqual([h['action'] for h in seen], ['add', 'allocate', 'release', 'remove'])
+        self.assertEqual(seen, self.banker.history)
+        self.assertEqual(self.banker.version, 4)
     
     def test_get_system_state(self):
         """Test system state retrieval"""
@@ -173,6 +385,568 @@ class TestBankersAlgorithm(unittest.TestCase):
         self.assertIn(0, state['processes'])
 
 
+class TestBatchRequests(unittest.TestCase):
+    """Test batched request decisions"""
+    
+    def test_batch_matches_sequential(self):
+        """Test batch results equal calling request_resources in order"""
+        for seed in range(100):
+            rnd = random.Random(seed)
+            resources = {'CPU': rnd.randint(3, 10), 'Memory': rnd.randint(3, 10)}
+            batched = BankersAlgorithm(resources)
+            sequential = BankersAlgorithm(resources)
+            for pid in range(rnd.randint(1, 6)):
+                claim = {r: rnd.randint(0, v) for r, v in resources.items()}
+                batched.add_process(pid, claim)
+                sequential.add_process(pid, claim)
+            
+            requests = [
+                (rnd.randint(0, 6), {r: rnd.randint(0, 3) for r in resources})
+                for _ in range(rnd.randint(1, 15))
+            ]
+            expected = [sequential.request_resources(pid, req) for pid, req in requests]
+            
+            self.assertEqual(batched.request_resources_batch(requests), expected)
+            self.assertEqual(batched.get_system_state(), sequential.get_system_state())
+            self.assertEqual(batched.history, sequential.history)
+    
+    def test_group_is_atomic(self):
+        """Test group requests are granted or denied as a whole"""
+        banker = BankersAlgorithm({'CPU': 5, 'Memory': 5})
+        banker.add_process(0, {'CPU': 4, 'Memory': 4})
+        banker.add_process(1, {'CPU': 4, 'Memory': 4})
+        
+        # Each half is safe alone, together they are not
+        status, message = banker.request_group({0: {'CPU': 2, 'Memory': 2}, 1: {'CPU': 2, 'Memory': 2}})
+        self.assertEqual(status, AllocationStatus.DENIED)
+        self.assertIn('unsafe', message)
+        self.assertEqual(banker.available, {'CPU': 5, 'Memory': 5})
+        
+        # Requests that only fit one at a time are rejected before the safety check
+        status, message = banker.request_group({0: {'CPU': 3}, 1: {'CPU': 3}})
+        self.assertEqual(status, AllocationStatus.DENIED)
+        self.assertIn('process 1', message)
+        self.assertEqual(banker.available, {'CPU': 5, 'Memory': 5})
+        self.assertEqual(banker.processes[0].allocated, {'CPU': 0, 'Memory': 0})
+        
+        status, _ = banker.request_group({0: {'CPU': 3, 'Memory': 3}, 1: {'CPU': 1, 'Memory': 1}})
+        self.assertEqual(status, AllocationStatus.GRANTED)
+        self.assertEqual(banker.available, {'CPU': 1, 'Memory': 1})
+        self.assertEqual([entry['pid'] for entry in banker.history if entry['action'] == 'allocate'], [0, 1])
+    
+    def test_group_history_replays(self):
+        """Test checkpoints taken inside a group grant match the replayed state"""
+        banker = BankersAlgorithm({'A': 9})
+        banker.add_process(0, {'A': 4})
+        banker.add_process(1, {'A': 4})
+        log = CheckpointLog(banker, interval=2)
+        banker.request_resources(0, {'A': 1})
+        banker.request_group({0: {'A': 1}, 1: {'A': 2}})
+        self.assertEqual(log.state_at(3).available, {'A': 5})
+        self.assertEqual(log.state_at(3).get_system_state(), banker.get_system_state())
+        self.assertEqual(log.state_at(2).available, {'A': 7})
+    
+    def test_batch_denies_unsafe_request(self):
+        """Test an unsafe request in the middle of a batch is isolated"""
+        banker = BankersAlgorithm({'CPU': 5, 'Memory': 5})
+        banker.add_process(0, {'CPU': 4, 'Memory': 4})
+        banker.add_process(1, {'CPU': 4, 'Memory': 4})
+        
+        results = banker.request_resources_batch([
+            (0, {'CPU': 2, 'Memory': 2}),
+            (1, {'CPU': 1, 'Memory': 1}),
+            (1, {'CPU': 1, 'Memory': 1}),
+            (0, {'CPU': 1, 'Memory': 0})
+        ])
+        
+        statuses = [status for status, _ in results]
+        self.assertEqual(statuses, [
+            AllocationStatus.GRANTED,
+            AllocationStatus.GRANTED,
+            AllocationStatus.DENIED,
+            AllocationStatus.GRANTED
+        ])
+        self.assertIn('unsafe', results[2][1])
+        self.assertEqual(banker.available, {'CPU': 1, 'Memory': 2})
+        self.assertTrue(banker.is_safe())
+    
+    def test_batch_history_replays(self):
+        """Test checkpoints taken inside a batch match the replayed state"""
+        banker = BankersAlgorithm({'CPU': 9})
+        for pid in range(3):
+            banker.add_process(pid, {'CPU': 3})
+        log = CheckpointLog(banker, interval=1)
+        banker.request_resources_batch([(0, {'CPU': 1}), (1, {'CPU': 2}), (2, {'CPU': 3})])
+        self.assertEqual([log.state_at(i).available['CPU'] for i in range(4)], [9, 8, 6, 3])
+        log = CheckpointLog(banker, interval=2)
+        banker.request_resources_batch([(0, {'CPU': 1}), (1, {'CPU': 1})])
+        self.assertEqual(log.state_at(2).get_system_state(), banker.get_system_state())
+    
+    def test_batch_on_unsafe_state(self):
+        """Test a batch with nothing valid on an unsafe state is simply denied"""
+        banker = BankersAlgorithm({'A': 4})
+        banker.add_processes([0, 1], [[4], [4]], [[2], [2]])
+        results = banker.request_resources_batch([(0, {'A': 5}), (1, {'A': 1})])
+        self.assertEqual([status for status, _ in results], [AllocationStatus.DENIED] * 2)
+        self.assertEqual(banker.available, {'A': 0})
+    
+    def test_negative_requests_denied(self):
+        """Test negative amounts cannot create capacity on any request path"""
+        banker = BankersAlgorithm({'A': 10})
+        banker.add_processes([0, 1], [[5], [5]])
+        self.assertEqual(banker.request_resources(0, {'A': -50})[0], AllocationStatus.DENIED)
+        results = banker.request_resources_batch([(0, {'A': 1}), (1, {'A': -3})])
+        self.assertEqual([status for status, _ in results], [AllocationStatus.GRANTED, AllocationStatus.DENIED])
+        self.assertEqual(banker.request_group({0: {'A': 1}, 1: {'A': -1}})[0], AllocationStatus.DENIED)
+        self.assertEqual(banker.available, {'A': 9})
+        self.assertEqual(banker.processes[1].allocated, {'A': 0})
+
+
+class TestStateCache(unittest.TestCase):
+    """Test hashed safety verdicts"""
+    
+    def test_hash_tracks_mutations(self):
+        """Test the incremental hash and cached verdicts match a fresh computation"""
+        rng = random.Random(7)
+        banker = BankersAlgorithm({'CPU': 12, 'Memory': 12})
+        cache = banker.enable_state_cache()
+        for pid in range(6):
+            banker.add_process(pid, {'CPU': rng.randint(1, 8), 'Memory': rng.randint(1, 8)})
+        
+        for step in range(400):
+            pid = rng.randrange(6)
+            choice = rng.random()
+            if choice < 0.6:
+                banker.request_resources(pid, {'CPU': rng.randint(0, 2), 'Memory': rng.randint(0, 2)})
+            elif choice < 0.8:
+                banker.explore_what_if(pid, {'CPU': 1})
+            elif choice < 0.95:
+                banker.release_resources(pid)
+            else:
+                claim = dict(banker.processes[pid].max_claim)
+                banker.remove_process(pid)
+                banker.add_process(pid, claim)
+            
+            key = cache.key
+            banker.rehash()
+            self.assertEqual(cache.key, key)
+            self.assertEqual(banker.is_safe(), banker._check_safe())
+        
+        self.assertGreater(cache.stats()['hit_rate'], 0.3)
+    
+    def test_same_state_hits(self):
+        """Test returning to a seen state reuses its verdict and safe sequence"""
+        banker = BankersAlgorithm({'CPU': 10, 'Memory': 20})
+        cache = banker.enable_state_cache()
+        banker.add_process(0, {'CPU': 7, 'Memory': 5})
+        banker.add_process(1, {'CPU': 3, 'Memory': 2})
+        sequence = banker.get_safe_sequence()
+        
+        banker.request_resources(0, {'CPU': 2})
+        banker.release(0, {'CPU': 2})
+        hits = cache.hits
+        self.assertEqual(banker.get_safe_sequence(), sequence)
+        self.assertEqual(cache.hits, hits + 1)
+        
+        # A different claim is a different state
+        banker.remove_process(1)
+        banker.add_process(1, {'CPU': 4, 'Memory': 2})
+        misses = cache.misses
+        banker.is_safe()
+        self.assertEqual(cache.misses, misses + 1)
+    
+    def test_second_hash_is_independent(self):
+        """Test cells that collide under hash() still differ in h2"""
+        # hash(-1) == hash(-2), so these cells share every hash() input
+        first, second = StateCache(), StateCache()
+        first.update(('allocated', -1, 'CPU'), 0, 3)
+        second.update(('allocated', -2, 'CPU'), 0, 3)
+        self.assertEqual(first.h1, second.h1)
+        self.assertNotEqual(first.h2, second.h2)
+
+
+class TestSafetyAnalysis(unittest.TestCase):
+    """Test safe sequence counting and enumeration"""
+    
+    def _random_banker(self, seed: int, processes: int) -> BankersAlgorithm:
+        rng = random.Random(seed)
+        banker = BankersAlgorithm({'CPU': 10, 'Memory': 6})
+        for pid in range(processes):
+            banker.add_process(pid, {'CPU': rng.randint(1, 6), 'Memory': rng.randint(1, 4)})
+        for _ in range(4 * processes):
+            banker.request_resources(rng.randrange(processes), {'CPU': rng.randint(0, 2), 'Memory': rng.randint(0, 1)})
+        return banker
+    
+    def _is_safe_order(self, banker: BankersAlgorithm, order) -> bool:
+        work = dict(banker.available)
+        for pid in order:
+            process = banker.processes[pid]
+            if not process.can_finish(work):
+                return False
+            for resource, amount in process.allocated.items():
+                work[resource] += amount
+        return True
+    
+    def test_matches_brute_force(self):
+        """Test the DP count and the enumeration against every permutation"""
+        for seed in range(5):
+            banker = self._random_banker(seed, 6)
+            expected = [list(order) for order in itertools.permutations(banker.processes)
+                        if self._is_safe_order(banker, order)]
+            
+            result = count_safe_sequences(banker)
+            self.assertTrue(result.exact)
+            self.assertEqual(result.count, len(expected))
+            self.assertEqual(sorted(iter_safe_sequences(banker)), sorted(expected))
+    
+    def test_unsafe_state_has_none(self):
+        """Test an unsafe state has no safe sequences"""
+        banker = BankersAlgorithm({'CPU': 4})
+        banker.add_process(0, {'CPU': 4})
+        banker.add_process(1, {'CPU': 4})
+        banker.processes[0].allocated['CPU'] = 2
+        banker.processes[1].allocated['CPU'] = 2
+        banker.available['CPU'] = 0
+        for process in banker.processes.values():
+            process.calculate_needed()
+        
+        self.assertEqual(count_safe_sequences(banker).count, 0)
+        self.assertEqual(list(iter_safe_sequences(banker)), [])
+    
+    def test_sampling_fallback(self):
+        """Test large systems fall back to an estimate close to the exact count"""
+        banker = self._random_banker(11, 8)
+        exact = count_safe_sequences(banker).count
+        
+        estimate = count_safe_sequences(banker, time_budget=0.2, exact_limit=4, seed=1)
+        self.assertFalse(estimate.exact)
+        self.assertGreater(estimate.samples, 100)
+        self.assertLess(abs(estimate.count - exact), 5 * estimate.std_error + 1e-9 * exact)
+        
+        few = estimate_safe_sequences(banker, samples=10, seed=1)
+        self.assertEqual(few.samples, 10)
+    
+    def _unsafe_banker(self, seed: int) -> BankersAlgorithm:
+        """Allocate at random without safety checks"""
+        rng = random.Random(seed)
+        banker = BankersAlgorithm({'CPU': 10, 'Memory': 8, 'Disk': 6})
+        for pid in range(8):
+            banker.add_process(pid, {'CPU': rng.randint(1, 8), 'Memory': rng.randint(1, 6), 'Disk': rng.randint(1, 5)})
+        for process in banker.processes.values():
+            for resource, claim in process.max_claim.items():
+                amount = rng.randint(0, min(claim, banker.available[resource]))
+                process.allocated[resource] = amount
+                banker.available[resource] -= amount
+            process.calculate_needed()
+        return banker
+    
+    def test_diagnose(self):
+        """Test the diagnosis lists the stuck processes and what each lacks"""
+        banker = BankersAlgorithm({'CPU': 4, 'Memory': 4})
+        banker.add_process(0, {'CPU': 1, 'Memory': 1})
+        banker.add_process(1, {'CPU': 4, 'Memory': 2})
+        banker.add_process(2, {'CPU': 3, 'Memory': 4})
+        banker.request_resources(0, {'CPU': 1})
+        banker.request_resources(1, {'CPU': 2})
+        self.assertEqual(banker.diagnose()['blocked'], {})
+        
+        # Grant process 2 without a safety check
+        banker.processes[2].allocated = {'CPU': 1, 'Memory': 3}
+        banker.processes[2].calculate_needed()
+        banker.available = {'CPU': 0, 'Memory': 1}
+        diagnosis = banker.diagnose()
+        self.assertFalse(diagnosis['safe'])
+        self.assertEqual(diagnosis['finished'], [0])
+        self.assertEqual(diagnosis['blocked'], {1: {'CPU': 1, 'Memory': 1}, 2: {'CPU': 1}})
+    
+    def test_preemption_plan(self):
+        """Test applying the plan restores safety and no victim could be spared"""
+        unsafe = 0
+        for seed in range(40):
+            banker = self._unsafe_banker(seed)
+            if banker.is_safe():
+                continue
+            unsafe += 1
+            
+            plan = preemption_plan(banker, time_budget=1.0)
+            self.assertTrue(plan.complete)
+            for victim in plan.victims:
+                spared = self._unsafe_banker(seed)
+                spared.release_many({pid: r for pid, r in plan.revoked.items() if pid != victim})
+                self.assertFalse(spared.is_safe())
+            
+            banker.release_many(plan.revoked)
+            self.assertTrue(banker.is_safe())
+            self.assertTrue(self._is_safe_order(banker, plan.safe_sequence))
+        self.assertGreater(unsafe, 30)
+    
+    def test_preemption_candidate_not_counted_twice(self):
+        """Test a candidate's allocation is only returned once while it is scored"""
+        banker = BankersAlgorithm({'A': 7, 'B': 4})
+        banker.add_processes(range(4), [[2, 3], [6, 1], [4, 2], [7, 2]], [[1, 2], [1, 0], [1, 1], [2, 1]])
+        self.assertFalse(banker.is_safe())
+        
+        plan = preemption_plan(banker, time_budget=1.0)
+        self.assertEqual(plan.revoked, {3: {'A': 2, 'B': 1}})
+        banker.release_many(plan.revoked)
+        self.assertTrue(banker.is_safe())
+
+
+class TestDeadlockDetection(unittest.TestCase):
+    """Test deadlock detection without avoidance"""
+    
+    def test_cycle_is_detected(self):
+        """Test a circular wait is found and cleared by removing a member"""
+        detector = DeadlockDetector({'A': 1, 'B': 1, 'C': 2})
+        for pid in range(3):
+            detector.add_process(pid)
+        self.assertTrue(detector.request_resources(0, {'A': 1}))
+        self.assertTrue(detector.request_resources(1, {'B': 1}))
+        self.assertTrue(detector.request_resources(2, {'C': 1}))
+        self.assertFalse(detector.request_resources(0, {'B': 1}))
+        self.assertFalse(detector.request_resources(1, {'A': 1}))
+        # Not part of the cycle, but waits on a member of it
+        self.assertFalse(detector.request_resources(2, {'A': 1}))
+        
+        self.assertEqual(detector.detect(), {0, 1, 2})
+        self.assertEqual(detector.wait_for(), {0: {1}, 1: {0}, 2: {0}})
+        
+        self.assertEqual(detector.remove_process(1), [0])
+        self.assertEqual(detector.detect(), set())
+        # The second run only re-examined the one process still blocked
+        self.assertEqual(detector.examined, 3 + 1)
+        
+        self.assertEqual(detector.release(0), [2])
+        self.assertEqual(detector.blocked, {})
+    
+    def test_incremental_matches_full(self):
+        """Test incremental runs agree with one-shot detection on random workloads"""
+        rng = random.Random(5)
+        resources = {'CPU': 6, 'Memory': 6, 'Disk': 4}
+        detector = DeadlockDetector(resources)
+        for pid in range(8):
+            detector.add_process(pid)
+        
+        for step in range(600):
+            pid = rng.randrange(8)
+            if pid not in detector.allocation:
+                detector.add_process(pid)
+            elif pid in detector.blocked or rng.random() < 0.3:
+                if rng.random() < 0.1:
+                    detector.remove_process(pid)
+                else:
+                    held = detector.allocation[pid]
+                    detector.release(pid, {r: rng.randint(0, a) for r, a in held.items()})
+            else:
+                detector.request_resources(pid, {r: rng.randint(0, 2) for r in resources})
+            
+            if step % 3 == 0:
+                expected = detect_deadlock(detector.available, detector.allocation, detector.blocked)
+                self.assertEqual(detector.detect(), expected)
+        
+        self.assertGreater(detector.runs, 100)
+    
+    def test_analyzer_reports_deadlock(self):
+        """Test StateTransitionAnalyzer reports a detector's deadlocked set"""
+        detector = DeadlockDetector.from_state(
+            {'A': 0, 'B': 0},
+            {0: {'A': 1}, 1: {'B': 1}, 2: {'A': 1}},
+            {0: {'B': 1}, 1: {'A': 1}}
+        )
+        banker = BankersAlgorithm({'A': 2, 'B': 1})
+        self.assertEqual(StateTransitionAnalyzer(banker, detector).get_deadlocked_processes(), [])
+        detector.request_resources(2, {'B': 1})
+        health = StateTransitionAnalyzer(banker, detector).get_system_health()
+        self.assertEqual(health['deadlocked'], [0, 1, 2])
+        self.assertEqual(StateTransitionAnalyzer(banker).get_deadlocked_processes(), [])
+
+
+class TestServer(unittest.TestCase):
+    """Test HTTP/JSON service"""
+    
+    def setUp(self):
+        self.banker = BankersAlgorithm({'CPU': 10, 'Memory': 20})
+        self.server = ServerThread(self.banker).start()
+        self.conn = http.client.HTTPConnection('127.0.0.1', self.server.port, timeout=5)
+    
+    def tearDown(self):
+        self.conn.close()
+        self.server.stop()
+    
+    def call(self, method, path, body=None):
+        data = json.dumps(body) if body is not None else None
+        self.conn.request(method, path, body=data)
+        response = self.conn.getresponse()
+        return response.status, json.loads(response.read())
+    
+    def test_endpoints_on_one_connection(self):
+        """Test add/request/what-if/release/remove over a keep-alive connection"""
+        self.assertEqual(self.call('POST', '/processes', {'pid': 0, 'max_claim': {'CPU': 5, 'Memory': 10}})[0], 201)
+        self.assertEqual(self.call('POST', '/processes', {'pid': 0, 'max_claim': {'CPU': 5}})[0], 409)
+        
+        status, body = self.call('POST', '/request', {'pid': 0, 'request': {'CPU': 2, 'Memory': 3}})
+        self.assertEqual((status, body['status']), (200, 'GRANTED'))
+        
+        status, body = self.call('POST', '/what-if', {'pid': 0, 'request': {'CPU': 3, 'Memory': 0}})
+        self.assertTrue(body['feasible'])
+        
+        status, body = self.call('GET', '/state')
+        self.assertEqual(body['available'], {'CPU': 8, 'Memory': 17})
+        self.assertEqual(body['processes']['0']['allocated'], {'CPU': 2, 'Memory': 3})
+        
+        self.assertTrue(self.call('POST', '/release', {'pid': 0})[1]['released'])
+        self.assertEqual(self.call('DELETE', '/processes/0')[0], 200)
+        self.assertEqual(self.call('DELETE', '/processes/0')[0], 404)
+        self.assertEqual(self.call('GET', '/nowhere')[0], 404)
+        self.assertEqual(self.call('POST', '/request', {'request': {}})[0], 400)
+    
+    def test_malformed_input(self):
+        """Test malformed bodies and headers get 400 instead of dropping the connection"""
+        self.banker.add_process(0, {'CPU': 5, 'Memory': 5})
+        self.assertEqual(self.call('POST', '/request', {'pid': 0, 'request': 5})[0], 400)
+        self.assertEqual(self.call('POST', '/request', {'pid': 0, 'request': {'CPU': 'x'}})[0], 400)
+        self.assertEqual(self.call('POST', '/processes', [1, 2])[0], 400)
+        self.assertEqual(self.call('POST', '/request', {'pid': 0, 'request': {'CPU': -50}})[0], 400)
+        self.assertEqual(self.call('POST', '/request', {'pid': 0, 'request': {'CPU': True}})[0], 400)
+        status, body = self.call('POST', '/batch', {'operations': [
+            {'op': 'request', 'pid': 0, 'request': {'CPU': 1}},
+            {'op': 'request', 'pid': 0, 'request': [1]},
+            {'op': 'request', 'pid': 0, 'request': {'CPU': -1}},
+            7
+        ]})
+        self.assertEqual([result['code'] for result in body['results']], [200, 400, 400, 400])
+        self.assertEqual(self.banker.available['CPU'], 9)
+        
+        with socket.create_connection(('127.0.0.1', self.server.port), timeout=5) as sock:
+            sock.sendall(b'POST /request HTTP/1.1\r\nContent-Length: lots\r\n\r\n')
+            self.assertTrue(sock.recv(65536).startswith(b'HTTP/1.1 400'))
+        self.assertEqual(self.call('GET', '/state')[0], 200)
+    
+    def test_batch_endpoint(self):
+        """Test mixed operations in one batch"""
+        status, body = self.call('POST', '/batch', {'operations': [
+            {'op': 'add', 'pid': 1, 'max_claim': {'CPU': 4, 'Memory': 4}},
+            {'op': 'request', 'pid': 1, 'request': {'CPU': 1, 'Memory': 1}},
+            {'op': 'request', 'pid': 1, 'request': {'CPU': 9, 'Memory': 0}},
+            {'op': 'release', 'pid': 1},
+            {'op': 'bogus', 'pid': 1},
+            {'op': 'request', 'pid': 1, 'request': {'CPU': 2}, 'request_id': 'x'},
+            {'op': 'request', 'pid': 1, 'request': {'CPU': 2}, 'request_id': 'x'}
+        ]})
+        
+        self.assertEqual(status, 200)
+        results = body['results']
+        self.assertEqual(results[0]['code'], 201)
+        self.assertEqual(results[1]['status'], 'GRANTED')
+        self.assertEqual(results[2]['status'], 'DENIED')
+        self.assertTrue(results[3]['released'])
+        self.assertEqual(results[4]['code'], 400)
+        self.assertEqual(results[6], results[5])
+        self.assertEqual(self.banker.processes[1].allocated['CPU'], 2)
+    
+    def test_pipelining(self):
+        """Test several requests written at once are answered in order"""
+        self.banker.add_process(0, {'CPU': 5, 'Memory': 5})
+        body = json.dumps({'pid': 0, 'request': {'CPU': 1, 'Memory': 1}}).encode()
+        one = b'POST /request HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s' % (len(body), body)
+        
+        with socket.create_connection(('127.0.0.1', self.server.port), timeout=5) as sock:
+            sock.sendall(one * 6 + b'GET /state HTTP/1.1\r\nConnection: close\r\n\r\n')
+            data = b''
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        
+        self.assertEqual(data.count(b'HTTP/1.1 200 OK'), 7)
+        self.assertEqual(data.count(b'GRANTED'), 5)
+        self.assertEqual(data.count(b'DENIED'), 1)
+        self.assertIn(b'"available": {"CPU": 5, "Memory": 15}', data)
+
+
+class TestClient(unittest.TestCase):
+    """Test client library against an in-process server"""
+    
+    def setUp(self):
+        self.banker = BankersAlgorithm({'CPU': 100, 'Memory': 200})
+        self.server = ServerThread(self.banker).start()
+    
+    def tearDown(self):
+        self.server.stop()
+    
+    def test_mirrors_banker_api(self):
+        """Test each method returns what BankersAlgorithm would"""
+        with BankerClient(port=self.server.port, batch_window=0) as client:
+            client.add_process(0, {'CPU': 5, 'Memory': 10})
+            with self.assertRaises(ValueError):
+                client.add_process(0, {'CPU': 5, 'Memory': 10})
+            
+            status, message = client.request_resources(0, {'CPU': 2, 'Memory': 3})
+            self.assertEqual(status, AllocationStatus.GRANTED)
+            status, _ = client.request_resources(0, {'CPU': 9, 'Memory': 0})
+            self.assertEqual(status, AllocationStatus.DENIED)
+            
+            self.assertTrue(client.explore_what_if(0, {'CPU': 1, 'Memory': 1})['feasible'])
+            state = client.get_system_state()
+            self.assertEqual(state['processes'][0]['allocated'], {'CPU': 2, 'Memory': 3})
+            
+            self.assertTrue(client.release_resources(0))
+            self.assertFalse(client.release_resources(42))
+            client.remove_process(0)
+            with self.assertRaises(ValueError):
+                client.remove_process(0)
+            
+            # Sequential calls keep reusing one pooled connection
+            self.assertEqual(client.round_trips, 10)
+            self.assertEqual(client._pool.qsize(), 1)
+    
+    def test_concurrent_calls_are_batched(self):
+        """Test calls from many threads share round-trips"""
+        for pid in range(20):
+            self.banker.add_process(pid, {'CPU': 5, 'Memory': 10})
+        
+        with BankerClient(port=self.server.port, batch_window=0.02) as client:
+            results = []
+            barrier = threading.Barrier(20)
+            
+            def worker(pid):
+                barrier.wait()
+                results.append(client.request_resources(pid, {'CPU': 1, 'Memory': 1}))
+            
+            threads = [threading.Thread(target=worker, args=(pid,)) for pid in range(20)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            
+            self.assertEqual(len(results), 20)
+            self.assertTrue(all(status == AllocationStatus.GRANTED for status, _ in results))
+            self.assertEqual(client.operations, 20)
+            self.assertLess(client.round_trips, 20)
+        
+        self.assertEqual(self.banker.available, {'CPU': 80, 'Memory': 180})
+    
+    def test_async_client(self):
+        """Test asyncio client batches concurrent coroutines"""
+        async def run():
+            async with AsyncBankerClient(port=self.server.port, batch_window=0.01) as client:
+                await asyncio.gather(*(
+                    client.add_process(pid, {'CPU': 5, 'Memory': 10}) for pid in range(10)
+                ))
+                results = await asyncio.gather(*(
+                    client.request_resources(pid, {'CPU': 2, 'Memory': 2}) for pid in range(10)
+                ))
+                state = await client.get_system_state()
+                return client, results, state
+        
+        client, results, state = asyncio.run(run())
+        self.assertTrue(all(status == AllocationStatus.GRANTED for status, _ in results))
+        self.assertEqual(state['available'], {'CPU': 80, 'Memory': 180})
+        self.assertEqual(client.operations, 21)
+        self.assertEqual(client.round_trips, 3)
+
+
 class TestComplexScenarios(unittest.TestCase):
     """Test complex scenarios"""
     
@@ -253,6 +1027,1050 @@ class TestEdgeCases(unittest.TestCase):
         self.assertEqual(status, AllocationStatus.DENIED)
 
 
+def _node_worker(pool, node_id, seed, results):
+    """Admit a random workload on one node in a child process"""
+    rng = random.Random(seed)
+    node = NodeBanker(node_id, pool)
+    granted = 0
+    for round_ in range(20):
+        pids = [round_ * 10 + i for i in range(3)]
+        admitted = [pid for pid in pids if node.add_process(pid, {'CPU': rng.randint(1, 4), 'Memory': rng.randint(1, 4)})]
+        for pid in admitted:
+            need = node.banker.processes[pid].needed
+            status, _ = node.request_resources(pid, {r: rng.randint(0, n) for r, n in need.items()})
+            granted += status == AllocationStatus.GRANTED
+            if not node.banker.is_safe():
+                results.put(('unsafe', node_id))
+                return
+        for pid in admitted:
+            node.remove_process(pid)
+    results.put((granted, node.local_grants, node.reserved))
+
+
+class TestFederation(unittest.TestCase):
+    """Test hierarchical node/global bankers"""
+    
+    def setUp(self):
+        self.pool = GlobalPool({'CPU': 12, 'Memory': 12})
+        self.pool.add_node(0, {'CPU': 8, 'Memory': 8})
+        self.pool.add_node(1, {'CPU': 8, 'Memory': 8})
+        self.a = NodeBanker(0, self.pool)
+        self.b = NodeBanker(1, self.pool)
+    
+    def test_local_and_escalated_requests(self):
+        """Test requests inside the reservation stay local and the rest escalate"""
+        self.assertTrue(self.a.add_process(1, {'CPU': 4, 'Memory': 2}))
+        self.assertEqual(self.a.reserved, {'CPU': 4, 'Memory': 2})
+        escalations = self.a.escalations
+        
+        self.assertEqual(self.a.request_resources(1, {'CPU': 3})[0], AllocationStatus.GRANTED)
+        self.assertEqual(self.a.escalations, escalations)
+        self.assertEqual(self.a.local_grants, 1)
+        
+        # A second process on the same node needs more reservation
+        self.assertTrue(self.a.add_process(2, {'CPU': 3, 'Memory': 1}))
+        self.assertEqual(self.a.reserved, {'CPU': 6, 'Memory': 2})
+        
+        # Node limit and global capacity both bound admissions
+        self.assertFalse(self.b.add_process(1, {'CPU': 9}))
+        # Reserving 6 CPU for node 1 would leave node 0 unable to reach its limit
+        self.assertFalse(self.b.add_process(1, {'CPU': 6, 'Memory': 6}))
+        self.assertTrue(self.b.add_process(1, {'CPU': 4, 'Memory': 4}))
+        available, safe = self.pool.state()
+        self.assertEqual(available, {'CPU': 2, 'Memory': 6})
+        self.assertTrue(safe)
+    
+    def test_reservation_returned(self):
+        """Test releases give capacity back to the global pool"""
+        log = CheckpointLog(self.a.banker, interval=100)
+        self.a.add_process(1, {'CPU': 4, 'Memory': 4})
+        self.a.request_resources(1, {'CPU': 4, 'Memory': 4})
+        # Reservations go through the banker's capacity calls, so they are in its history
+        self.assertEqual(log.state_at(len(log) - 1).get_system_state(), self.a.banker.get_system_state())
+        self.a.remove_process(1)
+        self.assertEqual(self.a.reserved, {'CPU': 0, 'Memory': 0})
+        self.assertEqual(self.pool.state(), ({'CPU': 12, 'Memory': 12}, True))
+        self.assertEqual(log.state_at(len(log) - 1).get_system_state(), self.a.banker.get_system_state())
+    
+    def test_nodes_in_other_processes(self):
+        """Test node workers in separate processes share one global pool"""
+        with PoolManager() as manager:
+            pool = manager.GlobalPool({'CPU': 16, 'Memory': 16})
+            for node_id in range(3):
+                pool.add_node(node_id, {'CPU': 8, 'Memory': 8})
+            
+            results = multiprocessing.Queue()
+            workers = [
+                multiprocessing.Process(target=_node_worker, args=(pool, node_id, node_id, results))
+                for node_id in range(3)
+            ]
+            for worker in workers:
+                worker.start()
+            outcomes = [results.get(timeout=30) for _ in workers]
+            for worker in workers:
+                worker.join(5)
+            
+            for granted, local_grants, reserved in outcomes:
+                self.assertGreater(granted, 0)
+                self.assertEqual(reserved, {'CPU': 0, 'Memory': 0})
+            self.assertEqual(pool.state(), ({'CPU': 16, 'Memory': 16}, True))
+
+
+class TestCheckpointLog(unittest.TestCase):
+    """Test checkpointed history"""
+    
+    def test_snapshot_roundtrip(self):
+        """Test snapshot restore reproduces the state"""
+        banker = BankersAlgorithm({'CPU': 10, 'Memory': 20})
+        banker.add_process(0, {'CPU': 5, 'Memory': 10})
+        banker.request_resources(0, {'CPU': 2, 'Memory': 3})
+        
+        restored = restore_snapshot(take_snapshot(banker))
+        self.assertEqual(restored.get_system_state(), banker.get_system_state())
+    
+    def test_state_at(self):
+        """Test any past state can be rebuilt"""
+        banker = BankersAlgorithm({'CPU': 10, 'Memory': 20})
+        log = CheckpointLog(banker, interval=3)
+        
+        states = [banker.get_system_state()]
+        banker.add_process(0, {'CPU': 5, 'Memory': 10})
+        states.append(banker.get_system_state())
+        banker.add_process(1, {'CPU': 3, 'Memory': 5})
+        states.append(banker.get_system_state())
+        for _ in range(3):
+            banker.request_resources(0, {'CPU': 1, 'Memory': 2})
+            states.append(banker.get_system_state())
+            banker.request_resources(1, {'CPU': 1, 'Memory': 1})
+            states.append(banker.get_system_state())
+        banker.release_resources(0)
+        states.append(banker.get_system_state())
+        banker.remove_process(1)
+        states.append(banker.get_system_state())
+        
+        self.assertEqual(len(log), len(states))
+        self.assertEqual(len(log.checkpoints), 1 + (len(states) - 1) // 3)
+        for index, expected in enumerate(states):
+            self.assertEqual(log.state_at(index).get_system_state(), expected)
+        
+        with self.assertRaises(IndexError):
+            log.state_at(len(states))
+    
+    def test_capacity_entries_replay(self):
+        """Test capacity and resource-type changes are replayed"""
+        banker = BankersAlgorithm({'CPU': 10, 'Memory': 20})
+        log = CheckpointLog(banker, interval=2)
+        banker.add_process(0, {'CPU': 5, 'Memory': 10})
+        banker.add_capacity('CPU', 2)
+        banker.add_resource_type('GPU', 4)
+        banker.request_resources(0, {'CPU': 3})
+        banker.remove_capacity('Memory', 5)
+        banker.remove_resource_type('GPU')
+        
+        self.assertEqual(log.state_at(len(log) - 1).get_system_state(), banker.get_system_state())
+        self.assertEqual(log.state_at(3).total_resources, {'CPU': 12, 'Memory': 20, 'GPU': 4})
+    
+    def test_bulk_load_replays(self):
+        """Test a bulk load is replayed as one entry"""
+        banker = BankersAlgorithm({'CPU': 10, 'Memory': 20})
+        log = CheckpointLog(banker, interval=4)
+        banker.add_processes(range(3), [[2, 2], [3, 3], [4, 4]], [[1, 0], [0, 3], [2, 2]])
+        banker.request_resources(0, {'Memory': 1})
+        self.assertEqual(log.state_at(1).available, {'CPU': 7, 'Memory': 15})
+        self.assertEqual(log.state_at(2).get_system_state(), banker.get_system_state())
+
+
+class TestBinarySnapshot(unittest.TestCase):
+    """Test memory-mapped binary snapshots"""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'state.bks')
+        self.banker = BankersAlgorithm({'CPU': 10, 'Memory': 8})
+        self.banker.add_process(3, {'CPU': 7, 'Memory': 5})
+        self.banker.add_process(1, {'CPU': 3, 'Memory': 2})
+        self.banker.add_process(2, {'CPU': 9, 'Memory': 8})
+        self.banker.request_resources(3, {'CPU': 2, 'Memory': 1})
+        self.banker.request_resources(1, {'CPU': 2, 'Memory': 1})
+        self.banker.request_resources(2, {'CPU': 3, 'Memory': 2})
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def test_round_trip(self):
+        """Test save and load reproduce the state and version"""
+        self.banker.save(self.path)
+        loaded = BankersAlgorithm.load(self.path)
+        self.assertEqual(loaded.get_system_state(), self.banker.get_system_state())
+        self.assertEqual(loaded.version, self.banker.version)
+        self.assertEqual(list(loaded.processes), [3, 1, 2])
+        self.assertEqual(loaded.history, [])
+    
+    def test_load_builds_on_use(self):
+        """Test a loaded banker builds processes as they are used and keeps add order"""
+        self.banker.save(self.path)
+        loaded = BankersAlgorithm.load(self.path)
+        self.assertIsInstance(loaded.processes, SnapshotProcesses)
+        self.assertEqual(len(loaded.processes), 3)
+        self.assertEqual(loaded.processes[2].needed, {'CPU': 6, 'Memory': 6})
+        self.assertNotIn(4, loaded.processes)
+        
+        for banker in (self.banker, loaded):
+            banker.release(2, {'CPU': 1})
+            banker.remove_process(3)
+            banker.add_process(3, {'CPU': 1})
+            banker.add_process(5, {'CPU': 1})
+        self.assertIsInstance(loaded.processes, SnapshotProcesses)
+        self.assertEqual(len(loaded.processes), 4)
+        
+        # Whole-state operations build the rest and swap in a plain dict
+        self.assertEqual(loaded.get_system_state(), self.banker.get_system_state())
+        self.assertEqual(list(loaded.processes), [1, 2, 3, 5])
+        self.assertIs(type(loaded.processes), dict)
+    
+    def test_mapped_analysis(self):
+        """Test the mapped columns answer queries without loading a banker"""
+        self.banker.save(self.path)
+        with open_snapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 3)
+            self.assertEqual(snapshot.available, {'CPU': 3, 'Memory': 4})
+            self.assertEqual(snapshot.process(2), self.banker.get_system_state()['processes'][2])
+            self.assertEqual(snapshot.needed('CPU'), [5, 1, 6])
+            
+            sequence = snapshot.safe_sequence()
+            self.assertEqual(sorted(sequence), [1, 2, 3])
+            work = dict(self.banker.available)
+            for pid in sequence:
+                process = self.banker.processes[pid]
+                self.assertTrue(process.can_finish(work))
+                for r, amount in process.allocated.items():
+                    work[r] += amount
+        
+        # Two more CPUs to process 2 leave it and process 3 stuck
+        self.banker.processes[2].allocated['CPU'] += 2
+        self.banker.processes[2].calculate_needed()
+        self.banker.available['CPU'] -= 2
+        self.banker.save(self.path)
+        with open_snapshot(self.path) as snapshot:
+            self.assertFalse(snapshot.is_safe())
+        self.assertFalse(load_snapshot(self.path).is_safe())
+    
+    def test_rejects_other_files(self):
+        """Test files without the snapshot header are refused"""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot at all')
+        with self.assertRaises(ValueError):
+            open_snapshot(self.path)
+
+
+class TestWhatIfEngine(unittest.TestCase):
+    """Test batched what-if grids"""
+    
+    def setUp(self):
+        self.banker = BankersAlgorithm({'CPU': 7, 'Memory': 9, 'Disk': 4})
+        self.banker.add_process(0, {'CPU': 5, 'Memory': 6, 'Disk': 2})
+        self.banker.add_process(1, {'CPU': 4, 'Memory': 5, 'Disk': 2})
+        self.banker.add_process(2, {'CPU': 3, 'Memory': 6, 'Disk': 3})
+        self.banker.request_resources(0, {'CPU': 1, 'Memory': 1, 'Disk': 0})
+        self.banker.request_resources(1, {'CPU': 2, 'Memory': 3, 'Disk': 1})
+        self.banker.request_resources(2, {'CPU': 1, 'Memory': 2, 'Disk': 1})
+        self.engine = WhatIfEngine()
+    
+    def tearDown(self):
+        self.engine.shutdown()
+    
+    def test_grid_matches_single_requests(self):
+        """Test every cell agrees with explore_what_if"""
+        for pid in self.banker.processes:
+            grid = self.engine.submit(self.banker, pid, 'CPU', 'Memory').result()
+            needed = self.banker.processes[pid].needed
+            self.assertEqual(grid.shape, (needed['CPU'] + 1, needed['Memory'] + 1))
+            
+            for a in range(grid.shape[0]):
+                for b in range(grid.shape[1]):
+                    result = self.banker.explore_what_if(pid, {'CPU': a, 'Memory': b})
+                    self.assertEqual(grid.granted(a, b), result['feasible'], (pid, a, b))
+        
+        # The fixture has both granted and denied cells
+        grid = self.engine.submit(self.banker, 0, 'CPU', 'Memory').result()
+        self.assertTrue(grid.granted(1, 1))
+        self.assertFalse(grid.granted(2, 0))
+    
+    def test_cached_per_version(self):
+        """Test grids are reused until the state changes"""
+        grid = self.engine.submit(self.banker, 0, 'CPU', 'Disk').result()
+        self.assertIs(self.engine.cached(self.banker, 0, 'CPU', 'Disk'), grid)
+        
+        self.banker.release_resources(1)
+        self.assertIsNone(self.engine.cached(self.banker, 0, 'CPU', 'Disk'))
+    
+    def test_refresh_reuses_previous_grid(self):
+        """Test a refreshed grid starts from the last one and still matches a full walk"""
+        def full(pid):
+            resources = list(self.banker.total_resources)
+            pids = list(self.banker.processes)
+            return compute_grid(
+                [self.banker.available[r] for r in resources],
+                [[self.banker.processes[p].allocated.get(r, 0) for r in resources] for p in pids],
+                [[self.banker.processes[p].needed.get(r, 0) for r in resources] for p in pids],
+                pids.index(pid), 0, 1
+            ).boundary
+        
+        grid = self.engine.submit(self.banker, 0, 'CPU', 'Memory').result()
+        self.banker.release_resources(1)
+        key = self.engine.key(self.banker, 0, 'CPU', 'Memory')
+        self.assertEqual(self.engine._bounds(self.banker, key), (grid.boundary, None))
+        grid = self.engine.submit(self.banker, 0, 'CPU', 'Memory').result()
+        self.assertEqual(grid.boundary, full(0))
+        
+        self.banker.request_resources(2, {'CPU': 2, 'Memory': 3})
+        self.banker.request_resources(1, {'Memory': 2})
+        key = self.engine.key(self.banker, 0, 'CPU', 'Memory')
+        self.assertEqual(self.engine._bounds(self.banker, key), (None, grid.boundary))
+        grid = self.engine.submit(self.banker, 0, 'CPU', 'Memory').result()
+        self.assertEqual(grid.boundary, full(0))
+        
+        # Changes to the process itself, or in both directions, walk from scratch
+        self.banker.request_resources(0, {'CPU': 1})
+        key = self.engine.key(self.banker, 0, 'CPU', 'Memory')
+        self.assertEqual(self.engine._bounds(self.banker, key), (None, None))
+        self.engine.submit(self.banker, 0, 'CPU', 'Memory').result()
+        self.banker.release_resources(2)
+        self.banker.request_resources(1, {'CPU': 1})
+        key = self.engine.key(self.banker, 0, 'CPU', 'Memory')
+        self.assertEqual(self.engine._bounds(self.banker, key), (None, None))
+    
+    def test_cache_ignores_dead_bankers(self):
+        """Test a new banker never gets a grid cached for a collected one"""
+        old = BankersAlgorithm({'CPU': 2, 'Disk': 2})
+        old.add_process(0, {'CPU': 2, 'Disk': 2})
+        self.engine.submit(old, 0, 'CPU', 'Disk').result()
+        version, address = old.version, id(old)
+        del old
+        
+        for _ in range(100):
+            new = BankersAlgorithm({'CPU': 2, 'Disk': 2})
+            new.add_process(0, {'CPU': 1, 'Disk': 1})
+            if id(new) == address:
+                break
+        self.assertEqual(new.version, version)
+        self.assertIsNone(self.engine.cached(new, 0, 'CPU', 'Disk'))
+    
+    def test_same_resource_rejected(self):
+        """Test both axes must differ"""
+        with self.assertRaises(ValueError):
+            self.engine.submit(self.banker, 0, 'CPU', 'CPU')
+
+
+class TestLiveFeed(unittest.TestCase):
+    """Test live event feed"""
+    
+    def test_parse_event(self):
+        """Test JSONL parsing skips blank and malformed lines"""
+        self.assertEqual(parse_event('{"op": "release", "pid": 1}'), {'op': 'release', 'pid': 1})
+        self.assertIsNone(parse_event(''))
+        self.assertIsNone(parse_event('not json'))
+        self.assertIsNone(parse_event('{"pid": 1}'))
+    
+    def test_apply_events(self):
+        """Test events drive the banker"""
+        banker, ok = apply_event(None, {'op': 'init', 'resources': {'CPU': 10}})
+        self.assertTrue(ok)
+        
+        banker, ok = apply_event(banker, {'op': 'add', 'pid': 0, 'max_claim': {'CPU': 5}})
+        self.assertTrue(ok)
+        banker, ok = apply_event(banker, {'op': 'request', 'pid': 0, 'request': {'CPU': 3}})
+        self.assertTrue(ok)
+        self.assertEqual(banker.available, {'CPU': 7})
+        
+        # Request beyond need is rejected, not raised
+        banker, ok = apply_event(banker, {'op': 'request', 'pid': 0, 'request': {'CPU': 9}})
+        self.assertFalse(ok)
+        banker, ok = apply_event(banker, {'op': 'add', 'pid': 0, 'max_claim': {'CPU': 1}})
+        self.assertFalse(ok)
+        
+        # Malformed events are rejected without raising
+        for event in ({'op': 'request', 'pid': 0, 'request': 5}, {'op': 'add', 'pid': 1, 'max_claim': ['CPU']},
+                      {'op': 'request', 'pid': 0, 'request': {'CPU': 'x'}}, {'op': 'init', 'resources': 3}):
+            self.assertEqual(apply_event(banker, event), (banker, False))
+        self.assertNotIn(1, banker.processes)
+        
+        banker, ok = apply_event(banker, {'op': 'release', 'pid': 0, 'amounts': {'CPU': 1}})
+        self.assertTrue(ok)
+        self.assertEqual(banker.available, {'CPU': 8})
+        
+        banker, ok = apply_event(banker, {'op': 'release', 'pid': 0})
+        self.assertTrue(ok)
+        self.assertEqual(banker.available, {'CPU': 10})
+    
+    def test_tail_file(self):
+        """Test feed applies events appended to a trace file"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.jsonl')
+            with open(path, 'w') as f:
+                f.write(json.dumps({'op': 'init', 'resources': {'CPU': 10}}) + '\n')
+            
+            feed = LiveFeed(None, 'file', path)
+            feed.start()
+            try:
+                with open(path, 'a') as f:
+                    for pid in range(100):
+                        f.write(json.dumps({'op': 'add', 'pid': pid, 'max_claim': {'CPU': 1}}) + '\n')
+                
+                deadline = time.time() + 5
+                while feed.applied < 101 and time.time() < deadline:
+                    time.sleep(0.01)
+            finally:
+                feed.stop()
+            
+            self.assertEqual(feed.applied, 101)
+            self.assertTrue(feed.consume_changes())
+            self.assertFalse(feed.consume_changes())
+            self.assertEqual(len(feed.banker.processes), 100)
+
+
+class TestPersistence(unittest.TestCase):
+    """Test SQLite persistence"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'banker.db')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_reload_matches_state(self):
+        """Test a reopened database rebuilds the same banker"""
+        banker, store = open_banker(self.path, {'CPU': 10, 'Memory': 8}, flush_interval=60)
+        with store:
+            for pid in range(5):
+                banker.add_process(pid, {'CPU': 2, 'Memory': 1})
+            banker.request_resources(0, {'CPU': 2})
+            banker.request_resources(3, {'CPU': 1, 'Memory': 1})
+            banker.remove_process(1)
+            banker.request_resources(4, {'Memory': 1})
+            banker.release_resources(4)
+        expected = banker.get_system_state()
+        
+        reloaded, store = open_banker(self.path, {'CPU': 99})
+        with store:
+            self.assertEqual(reloaded.get_system_state(), expected)
+            self.assertEqual(reloaded.version, banker.version)
+            self.assertTrue(reloaded.is_safe())
+    
+    def test_batched_commits(self):
+        """Test changes are committed every N operations"""
+        banker, store = open_banker(self.path, {'CPU': 100}, flush_every=50, flush_interval=60)
+        for pid in range(120):
+            banker.add_process(pid, {'CPU': 1})
+        self.assertEqual(store.commits, 1 + 2)
+        self.assertEqual(store.operations, 100)
+        
+        # Nothing past the last batch is visible until the next flush
+        self.assertEqual(len(SQLiteStore(self.path).load().processes), 100)
+        store.close()
+        self.assertEqual(len(SQLiteStore(self.path).load().processes), 120)
+    
+    def test_interval_flush_and_readd(self):
+        """Test the timer flushes pending changes and re-added processes replace old rows"""
+        banker, store = open_banker(self.path, {'CPU': 10, 'Memory': 10}, flush_interval=0.01)
+        with store:
+            banker.add_process(7, {'CPU': 5, 'Memory': 5})
+            banker.request_resources(7, {'CPU': 3})
+            banker.remove_process(7)
+            banker.add_process(7, {'CPU': 2})
+            
+            deadline = time.time() + 5
+            while store.operations < 4 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(store.operations, 4)
+            
+            reloaded = SQLiteStore(self.path).load()
+            self.assertEqual(reloaded.processes[7].max_claim['CPU'], 2)
+            self.assertEqual(reloaded.processes[7].max_claim.get('Memory', 0), 0)
+            self.assertEqual(reloaded.available, {'CPU': 10, 'Memory': 10})
+    
+    def test_resource_changes_persist(self):
+        """Test capacity and resource-type changes reach the database"""
+        banker, store = open_banker(self.path, {'CPU': 10, 'Memory': 8}, flush_interval=60)
+        with store:
+            banker.add_process(0, {'CPU': 2, 'Memory': 1})
+            banker.add_resource_type('GPU', 3)
+            banker.remove_capacity('CPU', 4)
+            banker.remove_resource_type('Memory')
+        
+        reloaded, store = open_banker(self.path, {'CPU': 99})
+        with store:
+            self.assertEqual(reloaded.total_resources, {'CPU': 6, 'GPU': 3})
+            self.assertEqual(reloaded.available, banker.available)
+            self.assertEqual(reloaded.processes[0].max_claim, {'CPU': 2, 'GPU': 0})
+    
+    def test_resource_removed_and_readded(self):
+        """Test a resource removed and re-added before a flush loses its old claims"""
+        banker, store = open_banker(self.path, {'CPU': 10, 'Memory': 8}, flush_interval=60)
+        with store:
+            banker.add_process(0, {'CPU': 2, 'Memory': 1})
+            banker.add_process(1, {'CPU': 2, 'Memory': 3})
+            store.flush()
+            banker.remove_resource_type('Memory')
+            banker.add_resource_type('Memory', 6)
+            banker.add_process(2, {'Memory': 2})
+        
+        reloaded, store = open_banker(self.path, {'CPU': 99})
+        with store:
+            self.assertEqual(reloaded.total_resources, {'CPU': 10, 'Memory': 6})
+            self.assertEqual(reloaded.available, banker.available)
+            self.assertEqual([reloaded.processes[pid].max_claim['Memory'] for pid in range(3)], [0, 0, 2])
+
+
+class TestTenantRegistry(unittest.TestCase):
+    """Test multi-tenant registry"""
+    
+    def setUp(self):
+        self.registry = TenantRegistry(['CPU', 'Memory'], max_active=5, idle_seconds=60)
+        for t in range(50):
+            self.registry.create_tenant(f"t{t}", {'CPU': 10 + t, 'Memory': 20})
+    
+    def test_routing_and_eviction(self):
+        """Test operations reach the right tenant and packed tenants come back intact"""
+        for t in range(50):
+            tenant = f"t{t}"
+            self.assertEqual(self.registry.execute(tenant, {'op': 'add', 'pid': 1, 'max_claim': {'CPU': 5}})[0], 201)
+            code, payload = self.registry.execute(tenant, {'op': 'request', 'pid': 1, 'request': {'CPU': t % 5}})
+            self.assertEqual(payload['status'], 'GRANTED')
+        
+        stats = self.registry.memory_stats()
+        self.assertEqual((stats['tenants'], stats['active'], stats['packed']), (50, 5, 45))
+        
+        banker = self.registry.get('t7')
+        self.assertEqual(banker.total_resources, {'CPU': 17, 'Memory': 20})
+        self.assertEqual(banker.available, {'CPU': 15, 'Memory': 20})
+        self.assertEqual(banker.processes[1].needed, {'CPU': 3, 'Memory': 0})
+        self.assertEqual(banker.version, 2)
+        self.assertGreater(self.registry.materializations, 0)
+        
+        self.assertEqual(self.registry.execute('missing', {'op': 'state'})[0], 404)
+        with self.assertRaises(ValueError):
+            self.registry.create_tenant('t1', {'CPU': 1})
+        with self.assertRaises(ValueError):
+            self.registry.create_tenant('new', {'GPU': 1})
+    
+    def test_idle_eviction(self):
+        """Test idle tenants are packed"""
+        self.registry.get('t0')
+        now = time.monotonic()
+        self.assertEqual(self.registry.evict_idle(now), 0)
+        self.assertEqual(self.registry.evict_idle(now + 120), 5)
+        self.assertEqual(len(self.registry.active), 0)
+        self.assertEqual(self.registry.get('t0').total_resources['CPU'], 10)
+    
+    def test_pack_keeps_waiters(self):
+        """Test waiting requests, queued removals and request outcomes survive packing"""
+        banker = self.registry.get('t0')
+        banker.add_process(1, {'CPU': 8})
+        banker.add_process(2, {'CPU': 8})
+        banker.request_resources(1, {'CPU': 6})
+        banker.request_resources(2, {'CPU': 2}, request_id='r1')
+        banker.submit_request(2, {'CPU': 3})
+        banker.remove_capacity('CPU', 2, queue=True)
+        self.assertEqual((banker.pending, banker.pending_capacity), ([(2, {'CPU': 3})], [('CPU', 2)]))
+        
+        self.registry.evict_idle(time.monotonic() + 120)
+        self.assertNotIn('t0', self.registry.active)
+        banker = self.registry.get('t0')
+        self.assertEqual(banker.pending, [(2, {'CPU': 3})])
+        self.assertEqual(banker.pending_capacity, [('CPU', 2)])
+        self.assertEqual(banker.request_resources(2, {'CPU': 2}, request_id='r1')[0], AllocationStatus.GRANTED)
+        self.assertEqual(banker.processes[2].allocated['CPU'], 2)
+        
+        banker.release_resources(1)
+        self.assertEqual(banker.pending, [])
+        self.assertEqual(banker.processes[2].allocated['CPU'], 5)
+
+
+class TestTraceGenerator(unittest.TestCase):
+    """Test synthetic trace generation"""
+    
+    def generator(self, **options):
+        return TraceGenerator({'CPU': 20, 'Memory': 40}, processes=10, seed=5, **options)
+    
+    def test_formats_round_trip(self):
+        """Test JSONL and binary traces decode to the same events"""
+        with tempfile.TemporaryDirectory() as tmp:
+            text, binary = os.path.join(tmp, 't.jsonl'), os.path.join(tmp, 't.bktr')
+            write_jsonl(text, self.generator(burstiness=3), 2000, timestamps=True)
+            write_binary(binary, self.generator(burstiness=3), 2000, timestamps=True)
+            
+            from_text, from_binary = list(read_trace(text)), list(read_trace(binary))
+            self.assertEqual(len(from_text), 2001)
+            self.assertEqual(from_text[0], {'op': 'init', 'resources': {'CPU': 20, 'Memory': 40}})
+            for a, b in zip(from_text, from_binary):
+                self.assertAlmostEqual(a.pop('ts', 0), b.pop('ts', 0), places=5)
+                self.assertEqual(a, b)
+            self.assertLess(os.path.getsize(binary), os.path.getsize(text))
+    
+    def test_trace_replays(self):
+        """Test generated events are well formed for a banker"""
+        events = list(self.generator(distribution='pareto', tightness=2).events(3000))
+        self.assertEqual(events, list(self.generator(distribution='pareto', tightness=2).events(3000)))
+        
+        banker = BankersAlgorithm({'CPU': 20, 'Memory': 40})
+        for op, pid, amounts, _ in events:
+            if op == 'add':
+                banker.add_process(pid, dict(zip(['CPU', 'Memory'], amounts)))
+            elif op == 'request':
+                # Never more than the remaining claim, even when earlier requests were denied
+                request = dict(zip(['CPU', 'Memory'], amounts))
+                need = banker.processes[pid].needed
+                self.assertTrue(all(request[r] <= need[r] for r in request))
+                banker.request_resources(pid, request)
+            elif op == 'release':
+                banker.release_resources(pid)
+            else:
+                banker.remove_process(pid)
+        self.assertLessEqual(len(banker.processes), 10)
+        self.assertTrue(banker.is_safe())
+    
+    def test_needs_a_process(self):
+        """Test a trace without processes is rejected up front"""
+        for processes in (0, -1):
+            with self.assertRaises(ValueError):
+                TraceGenerator({'CPU': 20, 'Memory': 40}, processes=processes)
+
+
+class TestSimulation(unittest.TestCase):
+    """Test Monte Carlo simulation"""
+    
+    def setUp(self):
+        self.config = SimulationConfig(resources={'CPU': 8, 'Memory': 16}, duration=200, arrival_rate=0.2)
+    
+    def test_replica_is_seeded(self):
+        """Test a replica is reproducible and its metrics are in range"""
+        result = simulate(self.config, 7)
+        self.assertEqual(result, simulate(self.config, 7))
+        self.assertGreater(result['completed'], 0)
+        self.assertTrue(0 <= result['deny_rate'] <= 1)
+        self.assertTrue(0 < result['utilization'] <= 1)
+        self.assertGreaterEqual(result['mean_wait'], 0)
+    
+    def test_pool_matches_in_process(self):
+        """Test replicas on a process pool aggregate like in-process runs"""
+        pooled = run_replicas(self.config, replicas=4, seed=3, workers=2)
+        local = run_replicas(self.config, replicas=4, seed=3, workers=1)
+        self.assertEqual(pooled, local)
+        self.assertLessEqual(pooled['throughput']['min'], pooled['throughput']['mean'])
+        
+        # More capacity for the same workload never hurts on average
+        self.config.max_claim = {'CPU': 6, 'Memory': 12}
+        small = run_replicas(self.config, replicas=4, workers=1)
+        self.config.resources = {'CPU': 32, 'Memory': 64}
+        large = run_replicas(self.config, replicas=4, workers=1)
+        self.assertLess(large['deny_rate']['mean'], small['deny_rate']['mean'])
+    
+    
+    def test_policies_on_same_workload(self):
+        """Test every scheduling policy runs and keeps the metrics in range"""
+        for policy in ('fifo', 'smallest-first', 'shortest-remaining-need', 'priority-aging'):
+            self.config.policy = policy
+            result = simulate(self.config, 5)
+            self.assertGreater(result['completed'], 0)
+            self.assertGreaterEqual(result['max_wait'], result['mean_wait'])
+
+
+class TestScheduler(unittest.TestCase):
+    """Test grant scheduling of waiting requests"""
+    
+    def setUp(self):
+        self.now = 0.0
+        self.banker = BankersAlgorithm({'CPU': 10})
+        self.banker.add_process(1, {'CPU': 10})
+        self.banker.add_process(2, {'CPU': 3})
+        self.banker.add_process(3, {'CPU': 5})
+    
+    def _scheduler(self, policy):
+        scheduler = GrantScheduler(self.banker, policy, clock=lambda: self.now)
+        scheduler.submit(1, {'CPU': 8})
+        status, message = scheduler.submit(2, {'CPU': 3})
+        self.assertIn("Insufficient", message)
+        self.now = 1.0
+        status, message = scheduler.submit(3, {'CPU': 2})
+        self.assertIn("unsafe", message)
+        self.assertEqual(len(scheduler.queue), 2)
+        return scheduler
+    
+    def test_policy_order(self):
+        """Test waiting requests are granted in policy order"""
+        scheduler = self._scheduler('fifo')
+        self.now = 5.0
+        self.assertEqual([item.pid for item in scheduler.release(1)], [2, 3])
+        self.assertEqual(self.banker.available['CPU'], 5)
+        
+        self.setUp()
+        scheduler = self._scheduler('smallest-first')
+        self.now = 5.0
+        self.assertEqual([item.pid for item in scheduler.release(1)], [3, 2])
+        stats = scheduler.stats()
+        self.assertEqual((stats['granted'], stats['queued'], stats['dispatches']), (3, 0, 1))
+        self.assertEqual(stats['max_wait'], 5.0)
+        self.assertEqual(stats['mean_wait'], 4.5)
+    
+    def test_partial_release(self):
+        """Test requests left short by earlier grants stay queued"""
+        scheduler = self._scheduler('shortest-remaining-need')
+        # 3 free: both fit, P2 has less left to claim and takes all of it
+        grants = scheduler.release(1, {'CPU': 1})
+        self.assertEqual([item.pid for item in grants], [2])
+        self.assertEqual([item.pid for item in scheduler.queue], [3])
+        self.assertTrue(self.banker.is_safe())
+        
+        # Removing a process drops its queued requests
+        scheduler.remove_process(3)
+        self.assertEqual(scheduler.queue, [])
+        self.assertEqual(self.banker.pending, [])
+    
+    def test_banker_queue_follows_policy(self):
+        """Test requests queued on the banker itself are retried in policy order"""
+        self.banker.request_resources(1, {'CPU': 8})
+        self.assertEqual(self.banker.submit_request(2, {'CPU': 3})[1], "Insufficient CPU available - queued")
+        self.banker.submit_request(3, {'CPU': 2})
+        self.assertTrue(self.banker.can_wait("Request denied - would lead to unsafe state"))
+        
+        scheduler = GrantScheduler(self.banker, 'smallest-first', clock=lambda: self.now)
+        self.assertEqual([item.pid for item in scheduler.queue], [2, 3])
+        self.now = 2.0
+        self.banker.remove_process(1)
+        self.assertEqual(self.banker.pending, [])
+        stats = scheduler.stats()
+        self.assertEqual((stats['granted'], stats['max_wait']), (2, 2.0))
+        self.assertEqual([entry['pid'] for entry in self.banker.history[-2:]], [3, 2])
+    
+    def test_priority_aging(self):
+        """Test waiting eventually outranks a higher priority"""
+        old = PendingRequest(1, {'CPU': 1}, submitted=0.0, priority=0, seq=0)
+        urgent = PendingRequest(2, {'CPU': 1}, submitted=10.0, priority=5, seq=1)
+        slow = PriorityAgingPolicy(aging_rate=0.1)
+        fast = PriorityAgingPolicy(aging_rate=1.0)
+        self.assertEqual(min([old, urgent], key=lambda item: slow.key(item, self.banker, 20.0)), urgent)
+        self.assertEqual(min([old, urgent], key=lambda item: fast.key(item, self.banker, 20.0)), old)
+        with self.assertRaises(ValueError):
+            GrantScheduler(self.banker, 'random')
+
+
+def _shared_reader_process(name, reads, results):
+    """Read shared state in a child process and check every snapshot is consistent"""
+    consistent = True
+    with SharedStateReader(name) as reader:
+        for _ in range(reads):
+            state = reader.snapshot()
+            used = sum(alloc['CPU'] for alloc in state['allocated'].values())
+            consistent = consistent and used + state['available']['CPU'] == 100
+    results.put((consistent, state['version']))
+
+
+class TestSharedState(unittest.TestCase):
+    """Test shared-memory state"""
+    
+    def setUp(self):
+        self.banker = BankersAlgorithm({'CPU': 100, 'Memory': 50})
+        self.writer = SharedStateWriter(self.banker, capacity=2)
+    
+    def tearDown(self):
+        self.writer.close()
+    
+    def test_mirror_and_grow(self):
+        """Test readers see the banker's matrices, also after the block grows"""
+        with SharedStateReader(self.writer.name) as reader:
+            for pid in range(6):
+                self.banker.add_process(pid, {'CPU': 10, 'Memory': 5})
+            self.banker.request_resources(2, {'CPU': 4, 'Memory': 1})
+            self.banker.remove_process(0)
+            
+            state = reader.snapshot()
+            expected = self.banker.get_system_state()
+            self.assertEqual(state['version'], self.banker.version)
+            self.assertEqual(state['available'], expected['available'])
+            self.assertEqual(state['allocated'], {pid: p['allocated'] for pid, p in expected['processes'].items()})
+            self.assertEqual(state['needed'], {pid: p['needed'] for pid, p in expected['processes'].items()})
+            self.assertEqual(reader.is_safe(), self.banker.is_safe())
+    
+    def test_readers_in_other_processes(self):
+        """Test child processes read consistent snapshots while the writer mutates"""
+        for pid in range(10):
+            self.banker.add_process(pid, {'CPU': 10, 'Memory': 5})
+        
+        results = multiprocessing.Queue()
+        children = [
+            multiprocessing.Process(target=_shared_reader_process, args=(self.writer.name, 2000, results))
+            for _ in range(2)
+        ]
+        for child in children:
+            child.start()
+        for i in range(3000):
+            pid = i % 10
+            if i % 3 == 2:
+                self.banker.release_resources(pid)
+            else:
+                self.banker.request_resources(pid, {'CPU': 1})
+        
+        for _ in children:
+            consistent, version = results.get(timeout=30)
+            self.assertTrue(consistent)
+            self.assertGreaterEqual(version, 10)
+        for child in children:
+            child.join(5)
+
+
+def _follower_process(address, seq, results):
+    """Run a follower in a child process and report what it replicated"""
+    with ReplicationFollower(address) as follower:
+        caught_up = follower.wait_for_seq(seq, timeout=10)
+        state = follower.get_system_state() if caught_up else None
+        results.put((caught_up, state and state['available'], state and follower.is_safe()))
+
+
+class TestReplication(unittest.TestCase):
+    """Test leader/follower replication"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.tmp.name, 'repl.sock')
+        self.banker = BankersAlgorithm({'CPU': 10, 'Memory': 8})
+        self.banker.add_process(0, {'CPU': 6, 'Memory': 4})
+        self.leader = ReplicationLeader(self.banker, self.address).start()
+    
+    def tearDown(self):
+        self.leader.stop()
+        self.tmp.cleanup()
+    
+    def test_bootstrap_and_stream(self):
+        """Test follower loads a snapshot then applies entries in order"""
+        with ReplicationFollower(self.address) as follower:
+            self.assertTrue(follower.wait_ready(5))
+            self.assertEqual(follower.snapshots_loaded, 1)
+            
+            with self.leader.lock:
+                self.banker.add_process(1, {'CPU': 4, 'Memory': 4})
+                self.banker.request_resources(0, {'CPU': 3, 'Memory': 2})
+                self.banker.request_resources(1, {'CPU': 2})
+                self.banker.release_resources(0)
+                self.banker.remove_process(0)
+            
+            self.assertTrue(follower.wait_for_seq(self.banker.version))
+            self.assertEqual(follower.entries_applied, 5)
+            self.assertEqual(follower.get_system_state(), self.banker.get_system_state())
+            self.assertTrue(follower.is_safe())
+            self.assertEqual(follower.lag()['entries'], 0)
+            
+            # Read-only queries leave the replica untouched
+            result = follower.explore_what_if(1, {'CPU': 1})
+            self.assertTrue(result['feasible'])
+            self.assertEqual(follower.get_system_state(), self.banker.get_system_state())
+    
+    def test_slow_follower_reports_lag(self):
+        """Test lag counts entries received but not yet applied"""
+        with ReplicationFollower(self.address) as follower:
+            self.assertTrue(follower.wait_for_seq(self.banker.version))
+            
+            # Holding the replica lock stalls applying, not receiving
+            with follower.lock:
+                with self.leader.lock:
+                    self.banker.request_resources(0, {'CPU': 1})
+                    self.banker.request_resources(0, {'CPU': 1})
+                    self.banker.request_resources(0, {'Memory': 1})
+                deadline = time.time() + 5
+                while follower.leader_seq < self.banker.version and time.time() < deadline:
+                    time.sleep(0.005)
+                time.sleep(0.05)
+                lag = follower.lag()
+                self.assertEqual(lag['entries'], 3)
+                self.assertGreaterEqual(lag['seconds'], 0.05)
+            
+            self.assertTrue(follower.wait_for_seq(self.banker.version))
+            lag = follower.lag()
+            self.assertEqual(lag['entries'], 0)
+            self.assertEqual(lag['seconds'], 0.0)
+            self.assertEqual(len(follower.unapplied), 0)
+    
+    def test_reconnect_catches_up_from_journal(self):
+        """Test a reconnecting follower resumes without a new snapshot"""
+        follower = ReplicationFollower(self.address).start()
+        self.assertTrue(follower.wait_for_seq(self.banker.version))
+        follower.stop()
+        
+        with self.leader.lock:
+            self.banker.request_resources(0, {'CPU': 2})
+        
+        follower._stop.clear()
+        follower.start()
+        try:
+            self.assertTrue(follower.wait_for_seq(self.banker.version))
+        finally:
+            follower.stop()
+        self.assertEqual(follower.snapshots_loaded, 1)
+        self.assertEqual(follower.get_system_state()['available'], {'CPU': 8, 'Memory': 8})
+    
+    def test_follower_in_other_processes(self):
+        """Test followers running in separate processes"""
+        results = multiprocessing.Queue()
+        children = [
+            multiprocessing.Process(target=_follower_process, args=(self.address, 41, results))
+            for _ in range(2)
+        ]
+        for child in children:
+            child.start()
+        
+        with self.leader.lock:
+            for _ in range(20):
+                self.banker.request_resources(0, {'CPU': 1})
+                self.banker.release_resources(0)
+        self.assertEqual(self.banker.version, 41)
+        
+        for _ in children:
+            caught_up, available, safe = results.get(timeout=15)
+            self.assertTrue(caught_up)
+            self.assertEqual(available, {'CPU': 10, 'Memory': 8})
+            self.assertTrue(safe)
+        for child in children:
+            child.join(5)
+
+
+class TestLeases(unittest.TestCase):
+    """Test lease-based allocations"""
+    
+    def setUp(self):
+        self.now = 0.0
+        self.banker = BankersAlgorithm({'CPU': 8, 'Memory': 8})
+        self.leases = LeaseManager(self.banker, tick=1.0, clock=lambda: self.now)
+    
+    def test_timer_wheel(self):
+        """Test timers fire on their tick across all levels"""
+        wheel = TimerWheel(slots=4, levels=3, start=5)
+        rng = random.Random(3)
+        due = {key: rng.randrange(6, 500) for key in range(2000)}
+        for key, tick in due.items():
+            wheel.schedule(key, tick)
+        
+        fired = {}
+        for tick in range(6, 501):
+            for key in wheel.advance(tick):
+                fired[key] = tick
+        self.assertEqual(fired, due)
+        self.assertEqual(len(wheel), 0)
+        
+        with self.assertRaises(ValueError):
+            TimerWheel(slots=4, levels=1)
+    
+    def test_expiry_is_batched(self):
+        """Test expired leases are released together and wake pending requests once"""
+        for pid in range(4):
+            self.banker.add_process(pid, {'CPU': 4, 'Memory': 2})
+        lease_ids = [self.leases.request_resources(pid, {'CPU': 2}, ttl=5)[2] for pid in range(3)]
+        status, message = self.banker.submit_request(3, {'CPU': 4})
+        self.assertTrue(message.endswith('queued'))
+        
+        self.now = 4.5
+        self.assertTrue(self.leases.renew(lease_ids[0]))
+        self.assertEqual(self.leases.expire(), [])
+        
+        self.now = 5.0
+        expired = self.leases.expire()
+        self.assertEqual([lease.pid for lease in expired], [1, 2])
+        self.assertEqual(self.leases.batches, 1)
+        self.assertEqual(self.banker.processes[3].allocated['CPU'], 4)
+        self.assertEqual(self.banker.pending, [])
+        
+        # The renewed lease lasts until 4.5 + 5
+        self.now = 9.0
+        self.assertEqual(self.leases.expire(), [])
+        self.now = 10.0
+        self.assertEqual([lease.pid for lease in self.leases.expire()], [0])
+        self.assertEqual(self.banker.available['CPU'], 4)
+    
+    def test_expiry_after_manual_release(self):
+        """Test an expiring lease only returns what the process still holds"""
+        self.banker.add_process(0, {'CPU': 4})
+        _, _, lease_id = self.leases.request_resources(0, {'CPU': 3}, ttl=2)
+        self.banker.release(0, {'CPU': 2})
+        
+        self.now = 3.0
+        self.assertEqual(len(self.leases.expire()), 1)
+        self.assertEqual(self.banker.available['CPU'], 8)
+        self.assertFalse(self.leases.renew(lease_id))
+        self.assertEqual(self.leases.request_resources(0, {'CPU': 5}, ttl=2)[2], None)
+
+
+class TestCli(unittest.TestCase):
+    """Test the command line entry point"""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.banker = BankersAlgorithm({'CPU': 10, 'Memory': 8})
+        self.banker.add_process(1, {'CPU': 3, 'Memory': 2})
+        self.banker.add_process(2, {'CPU': 9, 'Memory': 8})
+        self.banker.request_resources(1, {'CPU': 2})
+        self.banker.request_resources(2, {'CPU': 3, 'Memory': 2})
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def _path(self, name):
+        return os.path.join(self.directory.name, name)
+    
+    def _run(self, *argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            code = bankers_cli.main(list(argv))
+        return code, out.getvalue()
+    
+    def test_check(self):
+        """Test check reads snapshots and JSON states and exits 1 when unsafe"""
+        snapshot = self._path('state.bks')
+        self.banker.save(snapshot)
+        self.assertEqual(self._run('check', snapshot), (0, "SAFE P1 -> P2\n"))
+        
+        state = self._path('state.json')
+        with open(state, 'w') as f:
+            json.dump(self.banker.get_system_state(), f)
+        code, out = self._run('check', state, '--json')
+        self.assertEqual((code, json.loads(out)), (0, {'safe': True, 'safe_sequence': [1, 2]}))
+        self.assertEqual(bankers_cli.load_state(state).get_system_state(), self.banker.get_system_state())
+        
+        # All free CPUs to process 2 leave neither process able to finish
+        self.banker.processes[2].allocated['CPU'] += 5
+        self.banker.processes[2].calculate_needed()
+        self.banker.available['CPU'] = 0
+        self.banker.save(snapshot)
+        self.assertEqual(self._run('check', snapshot), (1, "UNSAFE\n"))
+    
+    def test_replay(self):
+        """Test a trace is replayed and saved as a snapshot"""
+        trace, snapshot = self._path('trace.jsonl'), self._path('final.bks')
+        with open(trace, 'w') as f:
+            for event in (
+                {'op': 'init', 'resources': {'CPU': 4}},
+                {'op': 'add', 'pid': 0, 'max_claim': {'CPU': 3}},
+                {'op': 'request', 'pid': 0, 'request': {'CPU': 2}},
+                {'op': 'request', 'pid': 0, 'request': {'CPU': 5}}
+            ):
+                f.write(json.dumps(event) + "\n")
+        code, out = self._run('replay', trace, '--save', snapshot)
+        self.assertEqual(code, 0)
+        self.assertIn("4 events, 1 rejected", out)
+        self.assertEqual(BankersAlgorithm.load(snapshot).available, {'CPU': 2})
+    
+    def test_imports_stay_light(self):
+        """Test headless commands load neither PyQt5, NumPy nor visualization"""
+        snapshot = self._path('state.bks')
+        self.banker.save(snapshot)
+        script = (
+            "import sys, bankers_cli; bankers_cli.main(['check', sys.argv[1]]); "
+            "print(sorted({'PyQt5', 'numpy', 'visualization'} & set(sys.modules)))"
+        )
+        result = subprocess.run([sys.executable, '-c', script, snapshot], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.stdout.splitlines()[-1], "[]")
+
+
 def run_tests():
     """Run all tests"""
     unittest.main(argv=[''], exit=False, verbosity=2)
@@ -0,0 +1,294 @@
+"""
+Synthetic trace generator for Banker's Algorithm
+Writes seeded streams of add/request/release/remove events, as JSONL (the
+live feed format) or a compact binary format, without building the whole
+trace in memory.
+
+Run: python trace_generator.py trace.jsonl --events 10000000 --processes 500
+     python trace_generator.py trace.bktr --format binary --tightness 1.5 --burstiness 4
+"""
+
+import argparse
+import json
+import mmap
+import random
+import struct
+from typing import Dict, Iterator, List, Optional
+
+
+MAGIC = b'BKTR'
+VERSION = 1
+FLAG_TIMESTAMPS = 1
+
+OP_CODES = {'add': 0, 'request': 1, 'release': 2, 'remove': 3}
+OP_NAMES = {code: op for op, code in OP_CODES.items()}
+AMOUNT_OPS = ('add', 'request')
+
+HEADER = struct.Struct('<4sHHH')
+RECORD = struct.Struct('<BI')
+TIMESTAMP = struct.Struct('<d')
+
+DISTRIBUTIONS = ('uniform', 'exponential', 'pareto')
+
+
+class TraceGenerator:
+    """Seeded source of trace events"""
+    
+    def __init__(self, resources: Dict[str, int], processes: int = 100, seed: int = 0,
+                 tightness: float = 1.0, distribution: str = 'uniform', burstiness: float = 1.0,
+                 requests_per_cycle: int = 3, remove_probability: float = 0.5,
+                 event_rate: float = 1000.0):
+        """
+        Args:
+            resources: Total resources (emitted in the init event)
+            processes: Processes kept alive at once
+            seed: Random seed; the same arguments always give the same trace
+            tightness: Sum of live processes' expected max claims relative to total_resources
+            distribution: Claim distribution - uniform, exponential or pareto (heavy tail)
+            burstiness: Mean number of consecutive operations from the same process (1 = none)
+            requests_per_cycle: Requests a process makes before releasing everything
+            remove_probability: Chance a process leaves after a release (otherwise it starts over)
+            event_rate: Mean events per second for timestamps
+        """
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution: {distribution}")
+        if processes < 1:
+            raise ValueError(f"Need at least one process, got {processes}")
+        self.resources = list(resources)
+        self.totals = [resources[r] for r in self.resources]
+        self.processes = processes
+        self.rng = random.Random(seed)
+        self.distribution = distribution
+        self.burstiness = max(1.0, burstiness)
+        self.requests_per_cycle = requests_per_cycle
+        self.remove_probability = remove_probability
+        self.event_rate = event_rate
+        self.mean_claim = [max(1.0, tightness * t / processes) for t in self.totals]
+    
+    def _claim_amount(self, r: int) -> int:
+        mean = self.mean_claim[r]
+        if self.distribution == 'uniform':
+            amount = self.rng.randint(1, max(1, int(2 * mean - 1)))
+        elif self.distribution == 'exponential':
+            amount = 1 + int(self.rng.expovariate(1 / max(mean - 1, 1e-9))) if mean > 1 else 1
+        else:
+            # Pareto with shape 2 has mean 2 * scale
+            amount = int(self.rng.paretovariate(2.0) * mean / 2) or 1
+        return min(amount, self.totals[r])
+    
+    def events(self, count: int, timestamps: bool = False) -> Iterator[tuple]:
+        """
+        Yield `count` events as (op, pid, amounts, time) tuples
+        
+        `amounts` is a list in resource order for add/request and None
+        otherwise; `time` is None unless timestamps are requested.
+        """
+        rng = self.rng
+        m = len(self.resources)
+        need: Dict[int, List[int]] = {}
+        claims: Dict[int, List[int]] = {}
+        left: Dict[int, int] = {}
+        live: List[int] = []
+        index: Dict[int, int] = {}
+        next_pid = 0
+        current = -1
+        stay = 1 - 1 / self.burstiness
+        gap_in_burst = 1 / (self.event_rate * self.burstiness)
+        gap_between = self.burstiness / self.event_rate
+        now = 0.0
+        
+        for _ in range(count):
+            if timestamps:
+                now += rng.expovariate(1 / (gap_in_burst if current in index else gap_between))
+            
+            if len(live) < self.processes and (not live or rng.random() < 0.5):
+                pid = next_pid
+                next_pid += 1
+                claim = [self._claim_amount(r) for r in range(m)]
+                claims[pid] = claim
+                need[pid] = list(claim)
+                left[pid] = self.requests_per_cycle
+                index[pid] = len(live)
+                live.append(pid)
+                current = pid
+                yield 'add', pid, claim, now if timestamps else None
+                continue
+            
+            if current not in index or rng.random() >= stay:
+                current = live[rng.randrange(len(live))]
+            pid = current
+            
+            if left[pid] > 0:
+                remaining = need[pid]
+                steps = left[pid]
+                if steps == 1:
+                    amounts = list(remaining)
+                else:
+                    amounts = [rng.randint(0, -(-n // steps)) if n else 0 for n in remaining]
+                for r in range(m):
+                    remaining[r] -= amounts[r]
+                left[pid] -= 1
+                yield 'request', pid, amounts, now if timestamps else None
+            elif left[pid] == 0:
+                need[pid] = list(claims[pid])
+                left[pid] = -1 if rng.random() < self.remove_probability else self.requests_per_cycle
+                yield 'release', pid, None, now if timestamps else None
+            else:
+                # Swap-remove keeps picking a live process O(1)
+                slot = index.pop(pid)
+                last = live.pop()
+                if last != pid:
+                    live[slot] = last
+                    index[last] = slot
+                del need[pid], claims[pid], left[pid]
+                yield 'remove', pid, None, now if timestamps else None
+
+
+def write_jsonl(path: str, generator: TraceGenerator, count: int, timestamps: bool = False,
+                chunk: int = 50000) -> int:
+    """Stream a trace as JSONL; returns the number of events written (plus init)"""
+    names = generator.resources
+    keys = [json.dumps(name) for name in names]
+    
+    def amounts_json(amounts: List[int]) -> str:
+        return '{' + ','.join(f'{keys[r]}:{a}' for r, a in enumerate(amounts) if a) + '}'
+    
+    with open(path, 'w', buffering=1 << 20) as f:
+        f.write(json.dumps({'op': 'init', 'resources': dict(zip(names, generator.totals))}) + '\n')
+        lines = []
+        for op, pid, amounts, time in generator.events(count, timestamps):
+            ts = f',"ts":{time:.6f}' if time is not None else ''
+            if op == 'add':
+                lines.append(f'{{"op":"add","pid":{pid},"max_claim":{amounts_json(amounts)}{ts}}}\n')
+            elif op == 'request':
+                lines.append(f'{{"op":"request","pid":{pid},"request":{amounts_json(amounts)}{ts}}}\n')
+            else:
+                lines.append(f'{{"op":"{op}","pid":{pid}{ts}}}\n')
+            if len(lines) >= chunk:
+                f.write(''.join(lines))
+                lines.clear()
+        f.write(''.join(lines))
+    return count + 1
+
+
+def write_binary(path: str, generator: TraceGenerator, count: int, timestamps: bool = False,
+                 chunk: int = 50000) -> int:
+    """
+    Stream a trace in the compact binary format
+    
+    Layout (little endian): header '4sHHH' (magic, version, flags, resource
+    count), per resource a u16 name length, UTF-8 name and i64 total, then
+    records of u8 op + u32 pid [+ f64 time] [+ i32 per resource for add/request].
+    """
+    m = len(generator.resources)
+    amounts_struct = struct.Struct(f'<{m}i')
+    flags = FLAG_TIMESTAMPS if timestamps else 0
+    
+    with open(path, 'wb', buffering=1 << 20) as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, m))
+        for name, total in zip(generator.resources, generator.totals):
+            encoded = name.encode()
+            f.write(struct.pack('<H', len(encoded)) + encoded + struct.pack('<q', total))
+        
+        parts = []
+        for op, pid, amounts, time in generator.events(count, timestamps):
+            parts.append(RECORD.pack(OP_CODES[op], pid))
+            if timestamps:
+                parts.append(TIMESTAMP.pack(time))
+            if amounts is not None:
+                parts.append(amounts_struct.pack(*amounts))
+            if len(parts) >= chunk:
+                f.write(b''.join(parts))
+                parts.clear()
+        f.write(b''.join(parts))
+    return count + 1
+
+
+def read_binary(path: str) -> Iterator[Dict]:
+    """Yield the events of a binary trace as live feed event dicts"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        yield from _decode_binary(path, data)
+
+
+def _decode_binary(path: str, data) -> Iterator[Dict]:
+    magic, version, flags, m = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} binary trace")
+    offset = HEADER.size
+    names = []
+    totals = {}
+    for _ in range(m):
+        (length,) = struct.unpack_from('<H', data, offset)
+        name = data[offset + 2:offset + 2 + length].decode()
+        (total,) = struct.unpack_from('<q', data, offset + 2 + length)
+        offset += 2 + length + 8
+        names.append(name)
+        totals[name] = total
+    yield {'op': 'init', 'resources': totals}
+    
+    amounts_struct = struct.Struct(f'<{m}i')
+    timestamps = flags & FLAG_TIMESTAMPS
+    end = len(data)
+    while offset < end:
+        code, pid = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        op = OP_NAMES[code]
+        event = {'op': op, 'pid': pid}
+        if timestamps:
+            (event['ts'],) = TIMESTAMP.unpack_from(data, offset)
+            offset += TIMESTAMP.size
+        if op in AMOUNT_OPS:
+            amounts = amounts_struct.unpack_from(data, offset)
+            offset += amounts_struct.size
+            event['max_claim' if op == 'add' else 'request'] = {
+                name: a for name, a in zip(names, amounts) if a
+            }
+        yield event
+
+
+def read_trace(path: str) -> Iterator[Dict]:
+    """Yield events from a JSONL or binary trace (detected from the file header)"""
+    from live_feed import parse_event
+    
+    with open(path, 'rb') as f:
+        binary = f.read(len(MAGIC)) == MAGIC
+    if binary:
+        yield from read_binary(path)
+        return
+    with open(path) as f:
+        for line in f:
+            event = parse_event(line)
+            if event is not None:
+                yield event
+
+
+def main(argv: Optional[List[str]] = None):
+    from server import parse_resources
+    
+    parser = argparse.ArgumentParser(description="Generate synthetic Banker's Algorithm traces")
+    parser.add_argument('output', help="Output file")
+    parser.add_argument('--format', choices=['jsonl', 'binary'], default='jsonl')
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--resources', default='CPU=64,Memory=256,Disk=128')
+    parser.add_argument('--processes', type=int, default=100, help="Processes alive at once")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tightness', type=float, default=1.0,
+                        help="Expected live max claims relative to total_resources")
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--burstiness', type=float, default=1.0,
+                        help="Mean consecutive operations from one process")
+    parser.add_argument('--requests-per-cycle', type=int, default=3)
+    parser.add_argument('--timestamps', action='store_true')
+    args = parser.parse_args(argv)
+    
+    generator = TraceGenerator(
+        parse_resources(args.resources), args.processes, args.seed, args.tightness,
+        args.distribution, args.burstiness, args.requests_per_cycle
+    )
+    write = write_binary if args.format == 'binary' else write_jsonl
+    written = write(args.output, generator, args.events, args.timestamps)
+    print(f"Wrote {written} events to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,9 @@ Advanced visualization utilities for Banker's Algorithm
 Includes resource allocation graphs and state diagrams
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from bankers_algorithm import BankersAlgorithm
+from deadlock_detection import DeadlockDetector, detect_deadlock
 
 
 class ResourceAllocationGraph:
@@ -188,8 +189,14 @@ class ResourceAllocationGraph:
 class StateTransitionAnalyzer:
     """Analyze state transitions and deadlock potential"""
     
-    def __init__(self, banker: BankersAlgorithm):
+    def __init__(self, banker: BankersAlgorithm, detector: Optional[DeadlockDetector] = None):
+        """
+        Args:
+            banker: Banker to analyze
+            detector: Detection engine of a pool running without avoidance
+        """
         self.banker = banker
+        self.detector = detector
     
     def analyze_request(self, pid: int, request: Dict[str, int]) -> Dict:
         """Analyze impact of a resource request"""
@@ -250,6 +257,23 @@ class StateTransitionAnalyzer:
         
         return risk
     
+    def get_deadlocked_processes(self) -> List[int]:
+        """
+        Processes that can never proceed
+        
+        Uses the detector if one was given, otherwise the banker's
+        allocation and the requests waiting in its pending queue.
+        """
+        if self.detector is not None:
+            return sorted(self.detector.detect())
+        
+        requests: Dict[int, Dict[str, int]] = {}
+        for pid, request in self.banker.pending:
+            # A process blocks on its oldest pending request
+            requests.setdefault(pid, request)
+        allocation = {pid: proc.allocated for pid, proc in self.banker.processes.items()}
+        return sorted(detect_deadlock(self.banker.available, allocation, requests))
+    
     def get_system_health(self) -> Dict:
         """Get overall system health metrics"""
         state = self.banker.get_system_state()
@@ -258,6 +282,7 @@ class StateTransitionAnalyzer:
             'is_safe': state['is_safe'],
             'deadlock_risk': self.get_deadlock_risk(),
             'num_processes': len(state['processes']),
+            'deadlocked': self.get_deadlocked_processes(),
             'resource_utilization': {}
         }
         
@@ -286,6 +311,8 @@ def print_health_check(banker: BankersAlgorithm):
     print(f"Safe: {'✓ Yes' if health['is_safe'] else '✗ No'}")
     print(f"Deadlock Risk: {health['deadlock_risk']*100:.1f}%")
     print(f"Active Processes: {health['num_processes']}")
+    if health['deadlocked']:
+        print(f"Deadlocked: {', '.join(f'P{pid}' for pid in health['deadlocked'])}")
     print("\nResource Utilization:")
     for resource, util in health['resource_utilization'].items():
         bar = "█" * int(util / 5) + "░" * (20 - int(util / 5))
@@ -0,0 +1,261 @@
+"""
+Batched what-if engine for Banker's Algorithm
+Evaluates whole grids of hypothetical requests for one process against a
+single copy of the state, instead of one save/request/restore per cell
+"""
+
+import threading
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from bankers_algorithm import BankersAlgorithm
+
+
+def is_safe_vectors(work: List[int], allocated: List[List[int]], needed: List[List[int]]) -> bool:
+    """
+    Safety check over plain integer vectors
+    
+    Args:
+        work: Available vector (copied, not modified)
+        allocated: Allocation matrix, one row per process
+        needed: Need matrix, one row per process
+    """
+    work = list(work)
+    remaining = list(range(len(allocated)))
+    m = len(work)
+    
+    while remaining:
+        blocked = []
+        for i in remaining:
+            need = needed[i]
+            if all(need[r] <= work[r] for r in range(m)):
+                alloc = allocated[i]
+                for r in range(m):
+                    work[r] += alloc[r]
+            else:
+                blocked.append(i)
+        if len(blocked) == len(remaining):
+            return False
+        remaining = blocked
+    
+    return True
+
+
+class WhatIfGrid:
+    """Grant/deny verdicts for every (a, b) request amount of two resources"""
+    
+    def __init__(self, pid: int, resource_a: str, resource_b: str, boundary: List[int], shape: Tuple[int, int]):
+        """
+        Args:
+            pid: Process the requests are made for
+            resource_a: Resource on the row axis
+            resource_b: Resource on the column axis
+            boundary: Largest granted column per row (-1 if the whole row is denied)
+            shape: (rows, columns) - need of each resource plus one
+        """
+        self.pid = pid
+        self.resource_a = resource_a
+        self.resource_b = resource_b
+        self.boundary = boundary
+        self.shape = shape
+    
+    def granted(self, a: int, b: int) -> bool:
+        """Would requesting `a` of resource_a and `b` of resource_b be granted?"""
+        return 0 <= a < self.shape[0] and 0 <= b <= self.boundary[a]
+    
+    def to_matrix(self) -> List[List[bool]]:
+        rows, cols = self.shape
+        return [[b <= self.boundary[a] for b in range(cols)] for a in range(rows)]
+
+
+def compute_grid(available: List[int], allocated: List[List[int]], needed: List[List[int]],
+                 row: int, a: int, b: int, pid: int = -1, names: Tuple[str, str] = ('', ''),
+                 lower: Optional[List[int]] = None, upper: Optional[List[int]] = None) -> WhatIfGrid:
+    """
+    Compute the grant/deny grid for one process and two resource indices
+    
+    Granting less never makes a safe state unsafe, so the granted region is
+    a staircase. Walking its boundary needs at most rows + columns safety
+    checks rather than one per cell.
+    
+    Args:
+        available, allocated, needed: State vectors in a fixed resource order
+        row: Index of the process in the matrices
+        a, b: Resource indices for the two axes
+        lower: Boundary of an earlier grid known to lie inside this one;
+            cells under it are granted without a safety check
+        upper: Boundary of an earlier grid known to contain this one;
+            the walk starts from it instead of the top of each row
+    """
+    need = needed[row]
+    shape = (need[a] + 1, need[b] + 1)
+    boundary = [-1] * shape[0]
+    
+    alloc_rows = list(allocated)
+    need_rows = list(needed)
+    
+    j = min(need[b], available[b])
+    for i in range(min(need[a], available[a]) + 1):
+        if upper is not None:
+            j = min(j, upper[i])
+        while j >= 0:
+            if lower is not None and j <= lower[i]:
+                break
+            work = list(available)
+            work[a] -= i
+            work[b] -= j
+            alloc = list(allocated[row])
+            alloc[a] += i
+            alloc[b] += j
+            still = list(need)
+            still[a] -= i
+            still[b] -= j
+            alloc_rows[row] = alloc
+            need_rows[row] = still
+            if is_safe_vectors(work, alloc_rows, need_rows):
+                break
+            j -= 1
+        if j < 0:
+            break
+        boundary[i] = j
+    
+    return WhatIfGrid(pid, names[0], names[1], boundary, shape)
+
+
+def _direction(entry: Dict, pid: int) -> int:
+    """
+    How a history entry can move another process's granted region
+    
+    A state that is safe after a grant was safe before it, so grants and
+    new processes can only shrink the region (-1), and releases, removals
+    and added capacity can only grow it (1). Anything touching `pid`
+    itself, or the resource types, is unknown (0).
+    """
+    action = entry['action']
+    if entry.get('pid') == pid:
+        return 0
+    if action in ('allocate', 'add', 'add_many'):
+        return -1
+    if action in ('release', 'remove'):
+        return 1
+    if action == 'capacity':
+        return 1 if entry['delta'] >= 0 else -1
+    return 0
+
+
+class WhatIfEngine:
+    """
+    Compute what-if grids on a worker thread, cached per state version
+    
+    When the state moves on, the newest grid for the same process and axes
+    bounds the new one if every change since moved the region the same way
+    (see _direction), so only the cells the change can affect are checked.
+    """
+    
+    def __init__(self, cache_size: int = 64, journal_size: int = 1024):
+        self.cache_size = cache_size
+        self.journal_size = journal_size
+        self.cache: "OrderedDict[Tuple, WhatIfGrid]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="what-if")
+        self._pending: Dict[Tuple, Future] = {}
+        # Newest grid per (banker, pid, axes), with its version
+        self._latest: "OrderedDict[Tuple, Tuple[int, WhatIfGrid]]" = OrderedDict()
+        # (version, entry) of recent changes per banker
+        self._journals: "weakref.WeakKeyDictionary[BankersAlgorithm, deque]" = weakref.WeakKeyDictionary()
+    
+    def key(self, banker: BankersAlgorithm, pid: int, resource_a: str, resource_b: str) -> Tuple:
+        # A weak reference stops matching once its banker is gone, unlike id(),
+        # which a new banker allocated at the same address would reuse
+        return (weakref.ref(banker), banker.version, pid, resource_a, resource_b)
+    
+    def cached(self, banker: BankersAlgorithm, pid: int, resource_a: str, resource_b: str) -> Optional[WhatIfGrid]:
+        """Return the grid for the banker's current version if already computed"""
+        key = self.key(banker, pid, resource_a, resource_b)
+        with self.lock:
+            grid = self.cache.get(key)
+            if grid is not None:
+                self.cache.move_to_end(key)
+        return grid
+    
+    def submit(self, banker: BankersAlgorithm, pid: int, resource_a: str, resource_b: str) -> Future:
+        """
+        Schedule a grid computation
+        
+        The state is copied into vectors on the calling thread (hold the
+        banker's lock while calling); the grid itself is computed on the
+        worker thread without touching the banker again.
+        """
+        key = self.key(banker, pid, resource_a, resource_b)
+        grid = self.cached(banker, pid, resource_a, resource_b)
+        if grid is not None:
+            future = Future()
+            future.set_result(grid)
+            return future
+        if key in self._pending:
+            return self._pending[key]
+        if pid not in banker.processes:
+            raise ValueError(f"Process {pid} not found")
+        if resource_a == resource_b:
+            raise ValueError("Choose two different resources")
+        
+        resources = list(banker.total_resources)
+        pids = list(banker.processes)
+        available = [banker.available.get(r, 0) for r in resources]
+        allocated = [[banker.processes[p].allocated.get(r, 0) for r in resources] for p in pids]
+        needed = [[banker.processes[p].needed.get(r, 0) for r in resources] for p in pids]
+        a, b = resources.index(resource_a), resources.index(resource_b)
+        lower, upper = self._bounds(banker, key)
+        
+        future = self.executor.submit(
+            compute_grid, available, allocated, needed,
+            pids.index(pid), a, b, pid, (resource_a, resource_b), lower, upper
+        )
+        self._pending[key] = future
+        future.add_done_callback(lambda f: self._store(key, f))
+        return future
+    
+    def _bounds(self, banker: BankersAlgorithm, key: Tuple) -> Tuple[Optional[List[int]], Optional[List[int]]]:
+        """(lower, upper) boundary for compute_grid from the newest earlier grid"""
+        journal = self._journals.get(banker)
+        if journal is None:
+            # Changes are only seen from the first grid of a banker on
+            self._journals[banker] = journal = deque(maxlen=self.journal_size)
+            owner = weakref.ref(banker)
+            banker.subscribe(lambda entry: journal.append((owner().version, entry)))
+        ref, version, pid = key[0], key[1], key[2]
+        with self.lock:
+            latest = self._latest.get((ref,) + key[2:])
+        if latest is None:
+            return None, None
+        since, grid = latest
+        changes = [entry for seen, entry in list(journal) if since < seen <= version]
+        if not changes or len(changes) != version - since:
+            return None, None
+        directions = {_direction(entry, pid) for entry in changes}
+        if directions == {1}:
+            return grid.boundary, None
+        if directions == {-1}:
+            return None, grid.boundary
+        return None, None
+    
+    def _store(self, key: Tuple, future: Future):
+        self._pending.pop(key, None)
+        if future.exception() is not None:
+            return
+        with self.lock:
+            grid = future.result()
+            self.cache[key] = grid
+            self.cache.move_to_end(key)
+            latest = (key[0],) + key[2:]
+            if self._latest.get(latest, (-1,))[0] < key[1]:
+                self._latest[latest] = (key[1], grid)
+                self._latest.move_to_end(latest)
+                while len(self._latest) > self.cache_size:
+                    self._latest.popitem(last=False)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+    
+    def shutdown(self):
+        self.executor.shutdown(wait=False)